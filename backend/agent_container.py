@@ -0,0 +1,123 @@
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+
+from backend.instrumentation.metrics import registry
+
+registry.describe("agent_startup_phase_seconds", "gauge", "Wall time of each agent startup phase in the last start")
+registry.describe("agent_startup_seconds", "gauge", "Total wall time of the last agent start")
+
+
+class AgentContainer:
+    """Builds the app's single IntentClassifierAgent at startup and owns its lifecycle.
+
+    ``start`` runs once under a lock, so concurrent callers share one agent, one pool and
+    one migration run, and records how long each phase took. A failed start leaves the
+    container not ready; the next ``get`` tries again.
+    """
+
+    def __init__(self, agent_factory=None):
+        self._agent_factory = agent_factory
+        self._agent = None
+        self._lock = asyncio.Lock()
+        self.phases: dict[str, float] = {}
+        self.error: str | None = None
+
+    @property
+    def started(self) -> bool:
+        return self._agent is not None
+
+    async def get(self):
+        if self._agent is None:
+            await self.start()
+            if self._agent is None:
+                raise RuntimeError(f"Agent failed to start: {self.error}")
+        return self._agent
+
+    async def start(self, phases: dict[str, float] | None = None) -> None:
+        async with self._lock:
+            if self._agent is not None:
+                return
+            self.phases = dict(phases or {})
+            try:
+                self._agent = await self._build()
+                self.error = None
+            except Exception as e:
+                self.error = f"{type(e).__name__}: {e}"
+                print("ACTUAL ERROR:", type(e), str(e))
+            total = sum(self.phases.values())
+            self.phases["total"] = total
+            self._report(total)
+
+    async def ready(self) -> dict:
+        """Raises unless the agent is built and its checkpointer answers; returns its stats."""
+        agent = self._agent
+        if agent is None:
+            raise RuntimeError(self.error or "Agent not started")
+        return await agent.checkpointer_manager.acheck()
+
+    async def stop(self) -> None:
+        async with self._lock:
+            if self._agent is not None:
+                await self._agent.aclose()
+                self._agent = None
+
+    async def _build(self):
+        with self._phase("imports"):
+            from backend.app_workflow import IntentClassifierAgent
+            from backend.checkpoint_manager import create_checkpointer_manager
+            from backend.llm.client import create_llm_client
+            from backend.util.prompt_registry import get_prompt_registry
+        if self._agent_factory is not None:
+            with self._phase("agent"):
+                agent = self._agent_factory()
+        else:
+            with self._phase("llm_client"):
+                llm_client = create_llm_client()
+            with self._phase("prompts"):
+                get_prompt_registry()
+            with self._phase("agent"):
+                agent = IntentClassifierAgent(llm_client=llm_client, checkpointer_manager=create_checkpointer_manager())
+        try:
+            with self._phase("checkpointer"):
+                # Opens the pool and runs the saver's migrations
+                checkpointer = await agent.checkpointer_manager.asetup()
+            with self._phase("compile"):
+                agent.compile_async_workflow(checkpointer)
+            with self._phase("ready_check"):
+                await agent.checkpointer_manager.acheck()
+        except Exception:
+            await agent.aclose()
+            raise
+        return agent
+
+    @contextmanager
+    def _phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - started
+
+    def _report(self, total: float) -> None:
+        for name, seconds in self.phases.items():
+            if name != "total":
+                registry.set("agent_startup_phase_seconds", seconds, phase=name)
+        registry.set("agent_startup_seconds", total)
+        breakdown = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases.items() if name != "total")
+        status = "ready" if self._agent is not None else "failed"
+        print(f"Agent startup {status} in {total * 1000:.0f}ms ({breakdown})")
+
+
+_agent_container: AgentContainer | None = None
+_agent_container_lock = threading.Lock()
+
+
+def get_agent_container() -> AgentContainer:
+    global _agent_container
+    if _agent_container is None:
+        with _agent_container_lock:
+            if _agent_container is None:
+                _agent_container = AgentContainer()
+    return _agent_container
@@ -0,0 +1,169 @@
+"""Admission control for /chat: a cap on in-flight turns and a bounded, deadline-aware queue.
+
+When the LLM slows down, turns would otherwise pile up, each holding a worker and
+sooner or later a checkpoint connection, until they all fail together on pool
+timeouts. Instead at most ``max_in_flight`` turns run; up to ``max_queue`` more wait
+in FIFO order for at most ``queue_timeout_seconds``. Anything beyond that is shed
+at once with ``AdmissionRejected`` (503 + ``Retry-After``), as is a request whose
+expected wait, from the recent turn duration and its place in the queue, already
+exceeds the queue timeout. Waiters whose deadline passes are dropped from the queue
+rather than admitted late.
+"""
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+from backend.instrumentation.metrics import registry
+from backend.util.config_reader import get_admission_config
+
+registry.describe("agent_admission_in_flight", "gauge", "Chat turns currently admitted and running")
+registry.describe("agent_admission_queue_depth", "gauge", "Chat turns waiting for admission")
+registry.describe("agent_admission_rejected_total", "counter", "Chat turns shed by reason: queue_full, deadline (expected wait too long) or timeout")
+registry.describe("agent_admission_queue_wait_seconds", "summary", "Time admitted chat turns waited in the queue")
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, retry_after_seconds: int):
+        super().__init__(f"Server is busy ({reason}); retry in {retry_after_seconds}s")
+        self.reason = reason
+        self.retry_after_seconds = retry_after_seconds
+
+
+class AdmissionController:
+    """Admits turns on the event loop that serves them; not thread-safe by design."""
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        max_queue: int = 50,
+        queue_timeout_seconds: float = 10.0,
+        retry_after_seconds: int = 1,
+        enabled: bool = True,
+    ):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.retry_after_seconds = retry_after_seconds
+        self.enabled = enabled
+        self.in_flight = 0
+        self._waiters: deque[tuple[float, asyncio.Future]] = deque()
+        # Moving average of admitted turn durations, for the expected wait of a new request
+        self._turn_seconds = 0.0
+
+    @classmethod
+    def from_config(cls, config: dict | None = None) -> "AdmissionController":
+        config = config or get_admission_config()
+        return cls(
+            config["max_in_flight"],
+            config["max_queue"],
+            config["queue_timeout_seconds"],
+            config["retry_after_seconds"],
+            config["enabled"],
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def admit(self):
+        await self.acquire()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - started)
+
+    async def acquire(self) -> None:
+        """Returns once the turn may run; pair every successful call with ``release``."""
+        if not self.enabled:
+            return
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self._start()
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise self._reject("queue_full")
+        expected_wait = self._expected_wait(len(self._waiters) + 1)
+        if expected_wait > self.queue_timeout_seconds:
+            raise self._reject("deadline", expected_wait)
+        loop = asyncio.get_running_loop()
+        enqueued = loop.time()
+        waiter = (enqueued + self.queue_timeout_seconds, loop.create_future())
+        self._waiters.append(waiter)
+        self._record_depth()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter[1]), self.queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            if waiter[1].done() and waiter[1].exception() is not None:
+                raise waiter[1].exception() from None
+            if not self._admitted(waiter):
+                raise self._reject("timeout") from None
+        except asyncio.CancelledError:
+            # The client went away; hand back a slot granted in the meantime
+            if self._admitted(waiter):
+                self.release(None)
+            raise
+        registry.observe("agent_admission_queue_wait_seconds", loop.time() - enqueued)
+
+    def release(self, turn_seconds: float | None = None) -> None:
+        if not self.enabled:
+            return
+        if turn_seconds is not None:
+            self._turn_seconds = turn_seconds if not self._turn_seconds else 0.8 * self._turn_seconds + 0.2 * turn_seconds
+        self.in_flight -= 1
+        now = asyncio.get_running_loop().time()
+        while self._waiters and self.in_flight < self.max_in_flight:
+            deadline, future = self._waiters.popleft()
+            if future.done():
+                continue
+            if deadline <= now:
+                # Its caller is about to time out; admitting it now would only waste the slot
+                future.set_exception(self._reject("timeout"))
+                continue
+            self._start()
+            future.set_result(None)
+        registry.set("agent_admission_in_flight", self.in_flight)
+        self._record_depth()
+
+    def _start(self) -> None:
+        self.in_flight += 1
+        registry.set("agent_admission_in_flight", self.in_flight)
+
+    def _expected_wait(self, position: int) -> float:
+        return math.ceil(position / self.max_in_flight) * self._turn_seconds
+
+    def _admitted(self, waiter: tuple[float, asyncio.Future]) -> bool:
+        """Settles a waiter whose wait ended: True if it was granted a slot, else drops it from the queue."""
+        future = waiter[1]
+        if future.done():
+            return future.exception() is None
+        future.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        self._record_depth()
+        return False
+
+    def _record_depth(self) -> None:
+        registry.set("agent_admission_queue_depth", len(self._waiters))
+
+    def _reject(self, reason: str, expected_wait: float = 0.0) -> AdmissionRejected:
+        registry.inc("agent_admission_rejected_total", reason=reason)
+        return AdmissionRejected(reason, max(self.retry_after_seconds, math.ceil(expected_wait)))
+
+
+_admission_controller: AdmissionController | None = None
+_admission_controller_lock = threading.Lock()
+
+
+def get_admission_controller() -> AdmissionController:
+    global _admission_controller
+    if _admission_controller is None:
+        with _admission_controller_lock:
+            if _admission_controller is None:
+                _admission_controller = AdmissionController.from_config()
+    return _admission_controller
@@ -0,0 +1,144 @@
+"""Seat sales and idempotent booking results behind the mock flight API.
+
+The fare inventory says how many seats a fare was generated with; the ledger counts
+what has been sold since. Checking the remaining seats, selling them and recording
+the result under the request's idempotency key happen under one lock, so concurrent
+bookers of the last seats cannot oversell and a retried request gets the stored
+result instead of a second booking. Results are kept for ``ttl_seconds`` and at most
+``max_entries`` of them, oldest first out.
+"""
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable
+
+from backend.instrumentation.metrics import registry
+from backend.util.config_reader import get_flight_booking_config
+
+registry.describe("agent_flight_api_bookings_total", "counter", "Mock flight API booking attempts by result: booked, sold_out or replayed")
+
+SEAT_UNAVAILABLE = {"error_code": "ERR_SEAT_UNAVAILABLE", "error_message": "Requested seats are no longer available."}
+
+
+class IdempotencyKeyReused(ValueError):
+    """The idempotency key was already used for a different booking request."""
+
+
+def request_fingerprint(fare_id: str, passengers: int) -> str:
+    return json.dumps({"fare_id": fare_id, "passengers": passengers}, sort_keys=True)
+
+
+class BookingLedger:
+    def __init__(
+        self,
+        ttl_seconds: float = 86400,
+        max_entries: int = 100_000,
+        failure_rate: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # Share of attempts the mock upstream rejects with a random error before
+        # reaching the ledger; those are never stored, so a retry runs again
+        self.failure_rate = failure_rate
+        self._clock = clock
+        self._sold: dict[str, int] = {}
+        # Seats sold per ordinal, by fare id prefix (fare_inventory.bucket_key), for searches
+        self._sold_by_bucket: dict[str, dict[int, int]] = {}
+        self._results: OrderedDict[str, tuple[float, str, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict | None = None) -> "BookingLedger":
+        config = config or get_flight_booking_config()
+        return cls(config["idempotency_ttl_seconds"], config["idempotency_max_entries"], config["failure_rate"])
+
+    def replay(self, idempotency_key: str | None, fare_id: str, passengers: int) -> dict | None:
+        """The stored result for this key, or None if the key has not been used yet."""
+        if idempotency_key is None:
+            return None
+        with self._lock:
+            return self._replay(idempotency_key, request_fingerprint(fare_id, passengers))
+
+    def book(self, fare_id: str, passengers: int, capacity: int, idempotency_key: str | None = None) -> dict:
+        """Sells ``passengers`` seats of a fare with ``capacity`` seats if enough remain."""
+        fingerprint = request_fingerprint(fare_id, passengers)
+        with self._lock:
+            if idempotency_key is not None:
+                stored = self._replay(idempotency_key, fingerprint)
+                if stored is not None:
+                    return stored
+            remaining = capacity - self._sold.get(fare_id, 0)
+            if remaining < passengers:
+                result = {"booking_status": False, **SEAT_UNAVAILABLE}
+                registry.inc("agent_flight_api_bookings_total", result="sold_out")
+            else:
+                self._sold[fare_id] = self._sold.get(fare_id, 0) + passengers
+                bucket, _, ordinal = fare_id.rpartition("-")
+                on_day = self._sold_by_bucket.setdefault(bucket, {})
+                on_day[int(ordinal)] = on_day.get(int(ordinal), 0) + passengers
+                result = {
+                    "booking_status": True,
+                    "confirmation_number": f"BK-{uuid.uuid4().hex[:8].upper()}",
+                    "flight_id": fare_id,
+                    "passengers": passengers,
+                    "seats_remaining": remaining - passengers,
+                    "booked_at": datetime.now().isoformat(),
+                }
+                registry.inc("agent_flight_api_bookings_total", result="booked")
+            if idempotency_key is not None:
+                self._store(idempotency_key, fingerprint, result)
+            return result
+
+    def seats_sold(self, fare_id: str) -> int:
+        with self._lock:
+            return self._sold.get(fare_id, 0)
+
+    def sold_on(self, bucket_key: str) -> dict[int, int]:
+        """Seats sold per fare ordinal on one route and departure day."""
+        with self._lock:
+            return dict(self._sold_by_bucket.get(bucket_key, {}))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire()
+            return len(self._results)
+
+    def _replay(self, key: str, fingerprint: str) -> dict | None:
+        # Called with self._lock held
+        self._expire()
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        if entry[1] != fingerprint:
+            raise IdempotencyKeyReused("Idempotency-Key was already used for a different booking")
+        registry.inc("agent_flight_api_bookings_total", result="replayed")
+        return entry[2]
+
+    def _store(self, key: str, fingerprint: str, result: dict) -> None:
+        # Every entry lives equally long, so insertion order is expiry order
+        self._results[key] = (self._clock() + self.ttl_seconds, fingerprint, result)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    def _expire(self) -> None:
+        now = self._clock()
+        while self._results and next(iter(self._results.values()))[0] <= now:
+            self._results.popitem(last=False)
+
+
+_booking_ledger: BookingLedger | None = None
+_booking_ledger_lock = threading.Lock()
+
+
+def get_booking_ledger() -> BookingLedger:
+    """Process-wide ledger, so every request sees the same seat counts and stored results."""
+    global _booking_ledger
+    if _booking_ledger is None:
+        with _booking_ledger_lock:
+            if _booking_ledger is None:
+                _booking_ledger = BookingLedger.from_config()
+    return _booking_ledger
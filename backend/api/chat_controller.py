@@ -1,39 +1,142 @@
+import json
+import time
+from typing import AsyncIterator, Awaitable, Callable
+
 from dotenv import load_dotenv
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from starlette.types import Receive, Scope, Send
+
+from backend.agent_container import get_agent_container
+from backend.api.admission import AdmissionRejected, get_admission_controller
+from backend.instrumentation.timings import TurnTimings
+from backend.util.turn_lock import TurnInProgress
 
 load_dotenv()
 router = APIRouter()
 
-_agent = None
-
-
-def _get_agent():
-    global _agent
-    if _agent is None:
-        from backend.app_workflow import IntentClassifierAgent
-        from backend.llm.client import create_llm_client
-        _agent = IntentClassifierAgent(llm_client=create_llm_client())
-        _agent.build_workflow()
-    return _agent
-
 
 class ChatPayload(BaseModel):
     user_query: str
     session_id: str | None = None
+    # Per-node timings are returned only when asked for
+    include_timings: bool = False
 
 
 class ChatResponse(BaseModel):
     response: str
     thinking: str
     trajectory: list[str]
+    timings: TurnTimings | None = None
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class _TurnStream(StreamingResponse):
+    """Runs ``finish`` once the response is over, even if the client left before the body was read.
+
+    The turn lock and admission slot are taken before the response starts, and a body
+    iterator that never starts never reaches its ``finally``.
+    """
+
+    def __init__(self, content: AsyncIterator[str], finish: Callable[[], Awaitable[None]], **kwargs):
+        super().__init__(content, **kwargs)
+        self._finish = finish
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self._finish()
 
-@router.post("/chat", response_model=ChatResponse)
-def chat(request: ChatPayload) -> ChatResponse:
-    result = _get_agent().invoke(request.user_query, request.session_id or "")
+
+def _busy(error: AdmissionRejected) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(error), headers={"Retry-After": str(error.retry_after_seconds)})
+
+
+@router.post("/chat", response_model=ChatResponse, response_model_exclude_none=True)
+async def chat(request: ChatPayload) -> ChatResponse:
+    agent = await get_agent_container().get()
+    try:
+        async with get_admission_controller().admit():
+            result = await agent.ainvoke(request.user_query, request.session_id or "")
+    except AdmissionRejected as e:
+        raise _busy(e)
+    except TurnInProgress as e:
+        raise HTTPException(status_code=409, detail=str(e), headers={"Retry-After": "1"})
     return ChatResponse(
         response=result["response"],
         thinking=result["thinking"],
         trajectory=result["trajectory"],
+        timings=result["timings"] if request.include_timings else None,
+    )
+
+
+@router.post("/chat/stream")
+async def chat_stream(request: ChatPayload) -> StreamingResponse:
+    """Server-Sent Events: node_start/node_end, token/message, then a final ``response`` event (ChatResponse)."""
+    agent = await get_agent_container().get()
+    admission = get_admission_controller()
+    try:
+        await admission.acquire()
+    except AdmissionRejected as e:
+        raise _busy(e)
+    started = time.perf_counter()
+    turn = agent.astream_turn(request.user_query, request.session_id or "")
+    # Wait for the first event so a busy session is answered with 409 before the stream starts
+    try:
+        first = await anext(turn)
+    except TurnInProgress as e:
+        admission.release()
+        raise HTTPException(status_code=409, detail=str(e), headers={"Retry-After": "1"})
+    except Exception as e:
+        first = e
+    except BaseException:
+        admission.release()
+        raise
+
+    finished = False
+
+    async def finish() -> None:
+        # Runs once, from whichever of the body and the response ends first
+        nonlocal finished
+        if finished:
+            return
+        finished = True
+        try:
+            await turn.aclose()
+        finally:
+            admission.release(time.perf_counter() - started)
+
+    async def events():
+        try:
+            if isinstance(first, Exception):
+                raise first
+            event, data = first
+            while True:
+                if event == "response":
+                    data = ChatResponse(
+                        response=data["response"],
+                        thinking=data["thinking"],
+                        trajectory=data["trajectory"],
+                        timings=data["timings"] if request.include_timings else None,
+                    ).model_dump(exclude_none=True)
+                yield _sse(event, data)
+                event, data = await anext(turn)
+        except StopAsyncIteration:
+            pass
+        except Exception as e:
+            print("ACTUAL ERROR:", type(e), str(e))
+            yield _sse("error", {"error": str(e)})
+        finally:
+            await finish()
+
+    return _TurnStream(
+        events(),
+        finish,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
@@ -0,0 +1,345 @@
+"""Seeded synthetic fare inventory behind the mock flight API.
+
+Fares live in NumPy column arrays. Every (route, departure day) bucket is generated
+from its own seed, ``(seed, route, day)``, so a fare is a pure function of the
+config and its id stays valid across restarts and processes. The core network
+(every pair of ``airports`` for ``days`` days from the start date) is generated
+up front, route-major and day-minor, so the fares of one route over a date window
+are a single contiguous slice found through ``_offsets``. Other routes and days
+are generated on demand and kept in a small LRU. An off-network route's id encodes
+its airport codes, so it needs no lookup table and searches on arbitrary routes
+cannot grow memory.
+"""
+import datetime as dt
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+import numpy as np
+
+from backend.util.config_reader import get_flight_api_config
+
+AIRLINES = [("Delta Airlines", "DL"), ("Lufthansa", "LH"), ("Emirates", "EK"), ("Qatar Airways", "QR"), ("Air India", "AI")]
+CABIN_CLASSES = ["Economy", "Premium Economy", "Business", "First"]
+_CABIN_SHARE = [0.6, 0.2, 0.15, 0.05]
+_CABIN_PRICE_FACTOR = np.array([1.0, 1.6, 3.5, 6.0])
+_STOPS_SHARE = [0.5, 0.35, 0.15]
+_EPOCH = dt.date(1970, 1, 1)
+
+
+def _epoch_day(day: dt.date) -> int:
+    return (day - _EPOCH).days
+
+
+def _route_seed(origin: str, destination: str) -> int:
+    return int.from_bytes(hashlib.blake2b(f"{origin}{destination}".encode(), digest_size=4).digest(), "big")
+
+
+def bucket_key(origin: str, destination: str, day: int) -> str:
+    """Prefix shared by the ids of every fare on a route and departure day."""
+    return f"{origin}{destination}-{(_EPOCH + dt.timedelta(days=day)):%Y%m%d}"
+
+
+def fare_id(origin: str, destination: str, day: int, ordinal: int) -> str:
+    return f"{bucket_key(origin, destination, day)}-{ordinal:04d}"
+
+
+def _encode_route(origin: str, destination: str) -> int:
+    if not (len(origin) == len(destination) == 3 and f"{origin}{destination}".isascii() and f"{origin}{destination}".isalpha()):
+        raise ValueError("Airport codes must be three letters")
+    code = 0
+    for letter in f"{origin}{destination}".upper():
+        code = code * 26 + ord(letter) - ord("A")
+    return code
+
+
+def _decode_route(code: int) -> tuple[str, str]:
+    letters = []
+    for _ in range(6):
+        code, letter = divmod(code, 26)
+        letters.append(chr(ord("A") + letter))
+    pair = "".join(reversed(letters))
+    return pair[:3], pair[3:]
+
+
+class FareInventory:
+    def __init__(
+        self,
+        seed: int = 42,
+        airports: list[str] | None = None,
+        days: int = 180,
+        fares_per_day: int = 100,
+        start_date: dt.date | None = None,
+        max_window_days: int = 31,
+        cached_buckets: int = 4096,
+    ):
+        self.seed = seed
+        self.days = days
+        self.fares_per_day = fares_per_day
+        self.max_window_days = max_window_days
+        self.start_day = _epoch_day(start_date or dt.date.today())
+        airports = airports or []
+        self.routes: list[tuple[str, str]] = [(o, d) for o in airports for d in airports if o != d]
+        self._route_index = {route: index for index, route in enumerate(self.routes)}
+        self._core_routes = len(self.routes)
+        self._cached_buckets = cached_buckets
+        self._buckets: OrderedDict[tuple[int, int], dict[str, np.ndarray]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        buckets = [self._generate(route, self.start_day + day) for route in range(self._core_routes) for day in range(days)]
+        counts = np.fromiter((len(bucket["day"]) for bucket in buckets), dtype=np.int64, count=len(buckets))
+        self._offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.columns = {name: np.concatenate([bucket[name] for bucket in buckets]) for name in self._empty()} if buckets else self._empty()
+
+    @classmethod
+    def from_config(cls, config: dict | None = None) -> "FareInventory":
+        config = config or get_flight_api_config()
+        return cls(
+            seed=config["seed"],
+            airports=config["airports"],
+            days=config["days"],
+            fares_per_day=config["fares_per_day"],
+            max_window_days=config["max_window_days"],
+            cached_buckets=config["cached_buckets"],
+        )
+
+    @property
+    def core_routes(self) -> list[tuple[str, str]]:
+        """Routes generated up front; searches on any other route generate fares on demand."""
+        return self.routes[: self._core_routes]
+
+    def __len__(self) -> int:
+        return len(self.columns["day"])
+
+    def search(
+        self,
+        origin: str,
+        destination: str,
+        date_from: dt.date,
+        date_to: dt.date,
+        cabin: str | None = None,
+        max_stops: int | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        offset: int = 0,
+        limit: int = 20,
+        passengers: int = 1,
+        sold: Callable[[str], dict[int, int]] | None = None,
+    ) -> tuple[dict[str, np.ndarray], int]:
+        """One page of matching fares in departure order, and the number of matches.
+
+        Only fares with at least ``passengers`` seats left are matched; ``sold`` gives the
+        seats already sold per ordinal for a ``bucket_key`` (see ``BookingLedger.sold_on``).
+        """
+        first_day, last_day = _epoch_day(date_from), _epoch_day(date_to)
+        if last_day < first_day:
+            raise ValueError("date_to must not be before date_from")
+        if last_day - first_day + 1 > self.max_window_days:
+            raise ValueError(f"Date window is limited to {self.max_window_days} days")
+        origin, destination = origin.upper(), destination.upper()
+        fares = self._window(self._route(origin, destination), first_day, last_day)
+        mask = self._seats_left(fares, origin, destination, sold) >= passengers
+        if cabin is not None:
+            cabin_index = self._cabin_index(cabin)
+            if cabin_index is None:
+                raise ValueError(f"cabin must be one of {', '.join(CABIN_CLASSES)}")
+            mask &= fares["cabin"] == cabin_index
+        if max_stops is not None:
+            mask &= fares["stops"] <= max_stops
+        if min_price is not None:
+            mask &= fares["price_usd"] >= min_price
+        if max_price is not None:
+            mask &= fares["price_usd"] <= max_price
+        matched = np.flatnonzero(mask)
+        page = matched[offset: offset + limit]
+        return {name: column[page] for name, column in fares.items()}, len(matched)
+
+    def fare(self, fare_id: str) -> dict | None:
+        """The fare with this id, or None if no such fare exists."""
+        fare = self._fare_columns(fare_id)
+        return None if fare is None else self.to_flights(fare)[0]
+
+    def seats(self, fare_id: str) -> int | None:
+        """Seats the fare was generated with, before any booking, or None if no such fare exists."""
+        fare = self._fare_columns(fare_id)
+        return None if fare is None else int(fare["seats"][0])
+
+    def _fare_columns(self, fare_id: str) -> dict[str, np.ndarray] | None:
+        try:
+            route_part, date_part, ordinal_part = fare_id.split("-")
+            day = _epoch_day(dt.datetime.strptime(date_part, "%Y%m%d").date())
+            ordinal = int(ordinal_part)
+        except ValueError:
+            return None
+        if len(route_part) != 6:
+            return None
+        try:
+            route = self._route(route_part[:3].upper(), route_part[3:].upper())
+        except ValueError:
+            return None
+        fares = self._window(route, day, day)
+        if not 0 <= ordinal < len(fares["day"]):
+            return None
+        return {name: column[ordinal: ordinal + 1] for name, column in fares.items()}
+
+    def to_flights(self, fares: dict[str, np.ndarray]) -> list[dict]:
+        """Flight API result dicts for the given fare columns."""
+        departure = fares["day"].astype("datetime64[D]") + fares["departure_minute"].astype("timedelta64[m]")
+        arrival = departure + fares["duration_hours"].astype("timedelta64[h]")
+        routes = {route: self._route_pair(route) for route in np.unique(fares["route"]).tolist()}
+        return [
+            {
+                "id": f"{routes[route][0]}{routes[route][1]}-{day.replace('-', '')}-{ordinal:04d}",
+                "airline": AIRLINES[airline][0],
+                "flight_number": f"{AIRLINES[airline][1]}{number}",
+                "origin": routes[route][0],
+                "destination": routes[route][1],
+                "departure_time": departure_time,
+                "arrival_time": arrival_time,
+                "duration_hours": duration,
+                "cabin_class": CABIN_CLASSES[cabin],
+                "price_usd": price,
+                "stops": stops,
+            }
+            for route, day, ordinal, airline, number, departure_time, arrival_time, duration, cabin, price, stops in zip(
+                fares["route"].tolist(),
+                np.datetime_as_string(fares["day"].astype("datetime64[D]")).tolist(),
+                fares["ordinal"].tolist(),
+                fares["airline"].tolist(),
+                fares["flight_number"].tolist(),
+                np.datetime_as_string(departure, unit="s").tolist(),
+                np.datetime_as_string(arrival, unit="s").tolist(),
+                fares["duration_hours"].tolist(),
+                fares["cabin"].tolist(),
+                fares["price_usd"].tolist(),
+                fares["stops"].tolist(),
+            )
+        ]
+
+    def _route(self, origin: str, destination: str) -> int:
+        route = self._route_index.get((origin, destination))
+        # Off-network ids follow the core ones and are derived from the codes alone
+        return route if route is not None else self._core_routes + _encode_route(origin, destination)
+
+    def _route_pair(self, route: int) -> tuple[str, str]:
+        return self.routes[route] if route < self._core_routes else _decode_route(route - self._core_routes)
+
+    @staticmethod
+    def _seats_left(
+        fares: dict[str, np.ndarray], origin: str, destination: str, sold: Callable[[str], dict[int, int]] | None
+    ) -> np.ndarray:
+        seats = fares["seats"]
+        if sold is None or not len(seats):
+            return seats
+        days = fares["day"]
+        for day in range(int(days[0]), int(days[-1]) + 1):
+            booked = sold(bucket_key(origin, destination, day))
+            if not booked:
+                continue
+            if seats is fares["seats"]:
+                seats = seats.astype(np.int32)
+            # Fares come day by day, each day in ordinal order, so a fare sits at its day's start plus its ordinal
+            start = int(np.searchsorted(days, day))
+            for ordinal, count in booked.items():
+                seats[start + ordinal] -= count
+        return seats
+        # Fares come day by day, each day in ordinal order, so a fare sits at its day's start plus its ordinal
+        days, starts = np.unique(fares["day"], return_index=True)
+        for day, start in zip(days.tolist(), starts.tolist()):
+            for ordinal, count in sold(bucket_key(origin, destination, day)).items():
+                seats[start + ordinal] -= count
+        return seats
+
+    def _window(self, route: int, first_day: int, last_day: int) -> dict[str, np.ndarray]:
+        core_first, core_last = self.start_day, self.start_day + self.days - 1
+        parts = []
+        day = first_day
+        while day <= last_day:
+            if route < self._core_routes and core_first <= day <= core_last:
+                end = min(last_day, core_last)
+                base = route * self.days - core_first
+                low, high = self._offsets[base + day], self._offsets[base + end + 1]
+                parts.append({name: column[low:high] for name, column in self.columns.items()})
+                day = end + 1
+            else:
+                parts.append(self._cached_bucket(route, day))
+                day += 1
+        if len(parts) == 1:
+            return parts[0]
+        return {name: np.concatenate([part[name] for part in parts]) for name in self._empty()}
+
+    def _cached_bucket(self, route: int, day: int) -> dict[str, np.ndarray]:
+        key = (route, day)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                self._buckets.move_to_end(key)
+                return bucket
+        bucket = self._generate(route, day)
+        with self._lock:
+            self._buckets[key] = bucket
+            while len(self._buckets) > self._cached_buckets:
+                self._buckets.popitem(last=False)
+        return bucket
+
+    def _generate(self, route: int, day: int) -> dict[str, np.ndarray]:
+        rng = np.random.default_rng([self.seed, _route_seed(*self._route_pair(route)), day])
+        count = int(rng.poisson(self.fares_per_day))
+        duration = rng.integers(2, 16, count)
+        stops = rng.choice(3, count, p=_STOPS_SHARE)
+        cabin = rng.choice(len(CABIN_CLASSES), count, p=_CABIN_SHARE)
+        price = (60 + 45 * duration) * _CABIN_PRICE_FACTOR[cabin] * (1 - 0.08 * stops) * rng.lognormal(0, 0.25, count)
+        departure_minute = np.sort(rng.integers(0, 24 * 60, count))
+        airline = rng.integers(0, len(AIRLINES), count)
+        flight_number = rng.integers(100, 1000, count)
+        # Drawn last so adding it left every other column of existing fares unchanged
+        seats = rng.integers(0, 200, count)
+        return {
+            "route": np.full(count, route, dtype=np.uint32),
+            "day": np.full(count, day, dtype=np.int32),
+            "ordinal": np.arange(count, dtype=np.uint16),
+            "departure_minute": departure_minute.astype(np.uint16),
+            "duration_hours": duration.astype(np.uint8),
+            "stops": stops.astype(np.uint8),
+            "cabin": cabin.astype(np.uint8),
+            "airline": airline.astype(np.uint8),
+            "flight_number": flight_number.astype(np.uint16),
+            "price_usd": np.round(price, 2),
+            "seats": seats.astype(np.uint8),
+        }
+
+    @staticmethod
+    def _empty() -> dict[str, np.ndarray]:
+        return {
+            "route": np.empty(0, dtype=np.uint32),
+            "day": np.empty(0, dtype=np.int32),
+            "ordinal": np.empty(0, dtype=np.uint16),
+            "departure_minute": np.empty(0, dtype=np.uint16),
+            "duration_hours": np.empty(0, dtype=np.uint8),
+            "stops": np.empty(0, dtype=np.uint8),
+            "cabin": np.empty(0, dtype=np.uint8),
+            "airline": np.empty(0, dtype=np.uint8),
+            "flight_number": np.empty(0, dtype=np.uint16),
+            "price_usd": np.empty(0, dtype=np.float64),
+            "seats": np.empty(0, dtype=np.uint8),
+        }
+
+    @staticmethod
+    def _cabin_index(cabin: str) -> int | None:
+        lowered = [name.lower() for name in CABIN_CLASSES]
+        return lowered.index(cabin.lower()) if cabin.lower() in lowered else None
+
+
+_fare_inventory: FareInventory | None = None
+_fare_inventory_lock = threading.Lock()
+
+
+def get_fare_inventory() -> FareInventory:
+    """Process-wide inventory, generated on first use."""
+    global _fare_inventory
+    if _fare_inventory is None:
+        with _fare_inventory_lock:
+            if _fare_inventory is None:
+                _fare_inventory = FareInventory.from_config()
+    return _fare_inventory
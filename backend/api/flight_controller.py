@@ -1,25 +1,23 @@
 import random
 import uuid
-from datetime import datetime, timedelta
-from typing import List
+from datetime import date, timedelta
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
 router = APIRouter()
 
-AIRLINES = ["Delta Airlines", "Lufthansa", "Emirates", "Qatar Airways", "Air India"]
-AIRPORTS = ["JFK", "LHR", "DXB", "CDG", "SIN", "FRA", "DEL", "SFO"]
-CABIN_CLASSES = ["Economy", "Premium Economy", "Business", "First"]
-
+# Simulated upstream failures; ERR_SEAT_UNAVAILABLE comes from the booking ledger's real seat counts
 BOOKING_ERRORS = [
-    {"error_code": "ERR_SEAT_UNAVAILABLE", "error_message": "Requested seats are no longer available."},
     {"error_code": "ERR_PAYMENT_DECLINED", "error_message": "Payment was declined. Please try another card."},
     {"error_code": "ERR_FLIGHT_CLOSED", "error_message": "Booking window for this flight has closed."},
     {"error_code": "ERR_INVENTORY", "error_message": "Inventory sync in progress. Please retry in a few minutes."},
     {"error_code": "ERR_RATE_EXPIRED", "error_message": "The fare has expired. Please search again for current prices."},
 ]
 
+FARE_NOT_FOUND = {"error_code": "ERR_FARE_NOT_FOUND", "error_message": "No such fare. Please search again."}
+
 
 class BookFlightRequest(BaseModel):
     """Payload aligned with a flight from flight_search response.results, plus booking fields."""
@@ -33,61 +31,83 @@ class BookFlightRequest(BaseModel):
     passengers: int = Field(1, ge=1, le=9, description="Number of passengers to book")
 
 
-def generate_random_flight(origin: str, destination: str) -> dict:
-    departure_time = datetime.now() + timedelta(hours=random.randint(1, 72))
-    duration_hours = random.randint(2, 15)
-    arrival_time = departure_time + timedelta(hours=duration_hours)
+def _fare_inventory():
+    # Imported on first search: NumPy and the generated fares are not needed to start the app
+    from backend.api.fare_inventory import get_fare_inventory
+
+    return get_fare_inventory()
+
+
+def _booking_ledger():
+    from backend.api.booking_ledger import get_booking_ledger
 
-    return {
-        "id": str(uuid.uuid4()),
-        "airline": random.choice(AIRLINES),
-        "flight_number": f"{random.choice(['DL', 'LH', 'EK', 'QR', 'AI'])}{random.randint(100, 999)}",
-        "origin": origin,
-        "destination": destination,
-        "departure_time": departure_time.isoformat(),
-        "arrival_time": arrival_time.isoformat(),
-        "duration_hours": duration_hours,
-        "cabin_class": random.choice(CABIN_CLASSES),
-        "price_usd": round(random.uniform(150, 1500), 2),
-        "stops": random.choice([0, 1, 2]),
-    }
+    return get_booking_ledger()
 
 
 @router.get("/flight-search")
 def flight_search(
-    origin: str = Query(..., example="JFK"),
-    destination: str = Query(..., example="LHR"),
+    origin: str = Query(..., min_length=3, max_length=3, examples=["JFK"]),
+    destination: str = Query(..., min_length=3, max_length=3, examples=["LHR"]),
     passengers: int = Query(1, ge=1, le=10),
-) -> dict:
-    results_count = random.randint(3, 8)
-    flights: List[dict] = [
-        generate_random_flight(origin, destination)
-        for _ in range(results_count)
-    ]
-    return {
+    date_from: date | None = Query(None, description="First departure day; defaults to today"),
+    date_to: date | None = Query(None, description="Last departure day; defaults to date_from + 2 days"),
+    cabin: str | None = Query(None, examples=["Economy"]),
+    max_stops: int | None = Query(None, ge=0),
+    min_price: float | None = Query(None, ge=0),
+    max_price: float | None = Query(None, ge=0),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=1000),
+) -> JSONResponse:
+    """Fares in departure order from the seeded inventory, filtered and paginated."""
+    date_from = date_from or date.today()
+    date_to = date_to or date_from + timedelta(days=2)
+    inventory = _fare_inventory()
+    try:
+        fares, total = inventory.search(
+            origin, destination, date_from, date_to, cabin, max_stops, min_price, max_price, offset, limit,
+            passengers, _booking_ledger().sold_on,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    # Results are already JSON types, so skip FastAPI's per-field jsonable_encoder pass
+    return JSONResponse({
         "search_id": str(uuid.uuid4()),
-        "origin": origin,
-        "destination": destination,
+        "origin": origin.upper(),
+        "destination": destination.upper(),
         "passengers": passengers,
         "currency": "USD",
-        "results": flights,
-    }
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "results": inventory.to_flights(fares),
+    })
 
 
 @router.post("/book-flight")
-def book_flight(request: BookFlightRequest) -> dict:
-    """Book a flight. Randomly returns success or failure with an error code and message."""
-    if random.random() < 0.5:
-        error = random.choice(BOOKING_ERRORS)
+def book_flight(request: BookFlightRequest, idempotency_key: str | None = Header(None, max_length=255)) -> dict:
+    """Book seats on a fare. Randomly fails with a simulated upstream error, otherwise sells
+    the seats if enough remain. Results are stored under ``Idempotency-Key``, so repeating
+    a request returns the original result instead of booking again."""
+    inventory = _fare_inventory()
+    fare = inventory.fare(request.id)
+    if fare is None or any(fare[key] != getattr(request, key) for key in ("airline", "flight_number", "origin", "destination")):
         return {
             "booking_status": False,
-            "error_code": error["error_code"],
-            "error_message": error["error_message"],
+            "error_code": FARE_NOT_FOUND["error_code"],
+            "error_message": FARE_NOT_FOUND["error_message"],
         }
-    return {
-        "booking_status": True,
-        "confirmation_number": f"BK-{uuid.uuid4().hex[:8].upper()}",
-        "flight_id": request.id,
-        "passengers": request.passengers,
-        "booked_at": datetime.now().isoformat(),
-    }
+    ledger = _booking_ledger()
+    try:
+        stored = ledger.replay(idempotency_key, request.id, request.passengers)
+        if stored is not None:
+            return stored
+        if random.random() < ledger.failure_rate:
+            error = random.choice(BOOKING_ERRORS)
+            return {
+                "booking_status": False,
+                "error_code": error["error_code"],
+                "error_message": error["error_message"],
+            }
+        return ledger.book(request.id, request.passengers, inventory.seats(request.id), idempotency_key)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
@@ -0,0 +1,27 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from backend.agent_container import get_agent_container
+
+router = APIRouter()
+
+
+@router.get("/healthz")
+def healthz() -> dict:
+    """Liveness: the process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+async def readyz() -> JSONResponse:
+    """Readiness: the agent is built and its checkpointer answers a query."""
+    container = get_agent_container()
+    startup_ms = {name: round(seconds * 1000, 1) for name, seconds in container.phases.items()}
+    try:
+        checkpointer = await container.ready()
+    except Exception as e:
+        return JSONResponse(
+            {"status": "not_ready", "error": str(e), "startup_ms": startup_ms},
+            status_code=503,
+        )
+    return JSONResponse({"status": "ready", "checkpointer": checkpointer, "startup_ms": startup_ms})
@@ -1,35 +1,98 @@
-import os
 import uuid
 
 from dotenv import load_dotenv
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import AIMessage
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.runnables import RunnableLambda
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.constants import END, START
 from langgraph.graph import StateGraph
 
-from backend.checkpoint_manager import CheckpointerManager
+from backend.checkpoint_manager import CheckpointerManager, create_checkpointer_manager
+from backend.classifier.model import load_intent_fast_path
+from backend.instrumentation.checkpointer import TimedCheckpointSaver
+from backend.instrumentation.timings import atimed_node, timed_node, token_usage_handler, track_turn
+from backend.nodes.classify_and_extract import ClassifyAndExtract
+from backend.nodes.context_window import ContextWindow
 from backend.nodes.flight.flight_already_booked import FlightAlreadyBooked
 from backend.llm.client import create_llm_client
 from backend.nodes.flight.book_flight import BookFlight
 from backend.nodes.flight.extract_flight_booking_confirmation import ExtractFlightBookingConfirmation
 from backend.nodes.flight.extract_flight_preferences import ExtractFlightPreferences
 from backend.nodes.flight.search_flight import SearchFlight
+from backend.nodes.flight.show_more_flights import ShowMoreFlights
 from backend.nodes.itinerary.extract_itinerary_preferences import ExtractItineraryPreferences
 from backend.nodes.user_intent_classifier import UserIntentClassifier
 from backend.schema.models import State, IntentType
+from backend.util.config_reader import get_graph_config
+
+
+class _TurnCollector:
+    """Folds ``updates``/``values`` stream chunks of one turn into the chat response payload."""
+
+    def __init__(self):
+        self.thinking_parts: set[str] = set()
+        self.ai_message_content = ""
+        self.printed_message_ids: set = set()
+        self.trajectory: list[str] = []
+
+    def add(self, mode: str, chunk) -> None:
+        if mode == "updates":
+            self.trajectory.extend(chunk.keys())
+        if mode == "values":
+            if chunk.get("reasoning"):
+                self.thinking_parts.add(chunk["reasoning"].strip())
+            if chunk.get("thinking"):
+                self.thinking_parts.add(chunk["thinking"].strip())
+            messages = chunk.get("messages", [])
+            if messages:
+                last_message = messages[-1]
+                if isinstance(last_message, AIMessage):
+                    message_id = getattr(last_message, "id", None)
+                    if message_id not in self.printed_message_ids:
+                        self.printed_message_ids.add(message_id)
+                        content = getattr(last_message, "content", None)
+                        if isinstance(content, str):
+                            self.ai_message_content = content
+
+    def result(self) -> dict:
+        thinking = "\n".join(self.thinking_parts).strip() if self.thinking_parts else ""
+        return {
+            "response": self.ai_message_content or "",
+            "thinking": thinking,
+            "trajectory": self.trajectory,
+        }
 
 
 class IntentClassifierAgent:
-    def __init__(self, llm_client:BaseChatModel):
+    def __init__(
+        self,
+        llm_client:BaseChatModel,
+        checkpointer_manager: CheckpointerManager | None = None,
+        context_window: ContextWindow | None = None,
+    ):
         self.workflow = None
-        self._checkpointer = CheckpointerManager(os.getenv("POSTGRES_URI")).setup()
-        self.user_intent_classifier = UserIntentClassifier(llm_client)
-        self.extract_itinerary_preferences = ExtractItineraryPreferences(llm_client)
-        self.extract_flight_preferences = ExtractFlightPreferences(llm_client)
+        self.async_workflow = None
+        self._checkpointer_manager = checkpointer_manager or create_checkpointer_manager()
+        self._context_window = context_window or ContextWindow.from_config()
+        self.user_intent_classifier = UserIntentClassifier(
+            llm_client, fast_path=load_intent_fast_path(), context_window=self._context_window
+        )
+        self.extract_itinerary_preferences = ExtractItineraryPreferences(llm_client, self._context_window)
+        self.extract_flight_preferences = ExtractFlightPreferences(llm_client, self._context_window)
         self.search_flight = SearchFlight(llm_client)
-        self.extract_flight_booking_confirmation = ExtractFlightBookingConfirmation(llm_client)
+        self.show_more_flights = ShowMoreFlights(self.search_flight)
+        self.extract_flight_booking_confirmation = ExtractFlightBookingConfirmation(llm_client, self._context_window)
         self.book_flight = BookFlight(llm_client)
         self.flight_already_booked = FlightAlreadyBooked()
+        self.combined_intent_extraction = get_graph_config()["combined_intent_extraction"]
+        self.classify_and_extract = ClassifyAndExtract(
+            llm_client,
+            self.user_intent_classifier,
+            self.extract_flight_preferences,
+            self.extract_itinerary_preferences,
+            self._context_window,
+        )
 
     def route_intent(self, state: State):
         if state.intent != IntentType.UNKNOWN and state.confidence > 0.6:
@@ -48,6 +111,16 @@ class IntentClassifierAgent:
 
 
 
+    def route_after_classify_and_extract(self, state: State) -> str:
+        # Preferences were already extracted, so skip straight to the action for the intent
+        if state.intent != IntentType.UNKNOWN and state.confidence > 0.6:
+            match (state.intent):
+                case IntentType.FLIGHT_BOOKING:
+                    return "search_flight"
+                case IntentType.TRAVEL_PLANNING:
+                    return "route_to_plan"
+        return "graceful_exit"
+
     def route_to_plan(self, state: State):
         print("im in routing further")
         print("Received prefs: ", *state)
@@ -58,11 +131,14 @@ class IntentClassifierAgent:
     def returning_user_middleware(self, state: State) -> dict:
         messages = state.messages or []
         is_returning = len(messages) > 1
-        return {"is_returning_user": is_returning}
+        # Fold turns that left the prompt window into the rolling summary before any LLM node runs
+        return {"is_returning_user": is_returning, **self._context_window.summarise(state)}
 
     def _route_after_confirmation(self, state: State) -> str:
         if state.confirmation_action == "confirm":
             return "book_flight"
+        if state.confirmation_action == "more":
+            return "show_more_flights"
         return "cancel"
 
     def route_after_middleware(self, state: State) -> str:
@@ -77,26 +153,42 @@ class IntentClassifierAgent:
                 return "extract_itinerary_preferences"
         return "user_intent_classifier"
 
-    def build_workflow(self):
+    @staticmethod
+    def _node(name: str, node) -> RunnableLambda:
+        # One timed runnable per node so the same graph serves both invoke (sync) and ainvoke (async)
+        afunc = getattr(node, "acall", None)
+        return RunnableLambda(
+            timed_node(name, node),
+            afunc=atimed_node(name, afunc) if afunc else None,
+            name=name,
+        )
+
+    def _build_graph(self) -> StateGraph:
         graph = StateGraph(State)
 
-        graph.add_node("returning_user_middleware", self.returning_user_middleware)
-        graph.add_node("user_intent_classifier", self.user_intent_classifier)
-        graph.add_node("extract_itinerary_preferences", self.extract_itinerary_preferences)
-        graph.add_node("extract_flight_preferences", self.extract_flight_preferences)
-        graph.add_node("graceful_exit", self.gracefully_exit)
-        graph.add_node("route_to_plan", self.route_to_plan)
-        graph.add_node("search_flight", self.search_flight)
-        graph.add_node("extract_flight_booking_confirmation", self.extract_flight_booking_confirmation)
-        graph.add_node("book_flight", self.book_flight)
-        graph.add_node("flight_already_booked", self.flight_already_booked)
+        graph.add_node("returning_user_middleware", self._node("returning_user_middleware", self.returning_user_middleware))
+        if self.combined_intent_extraction:
+            graph.add_node("classify_and_extract", self._node("classify_and_extract", self.classify_and_extract))
+        else:
+            graph.add_node("user_intent_classifier", self._node("user_intent_classifier", self.user_intent_classifier))
+        graph.add_node("extract_itinerary_preferences", self._node("extract_itinerary_preferences", self.extract_itinerary_preferences))
+        graph.add_node("extract_flight_preferences", self._node("extract_flight_preferences", self.extract_flight_preferences))
+        graph.add_node("graceful_exit", self._node("graceful_exit", self.gracefully_exit))
+        graph.add_node("route_to_plan", self._node("route_to_plan", self.route_to_plan))
+        graph.add_node("search_flight", self._node("search_flight", self.search_flight))
+        graph.add_node("extract_flight_booking_confirmation", self._node("extract_flight_booking_confirmation", self.extract_flight_booking_confirmation))
+        graph.add_node("show_more_flights", self._node("show_more_flights", self.show_more_flights))
+        graph.add_node("book_flight", self._node("book_flight", self.book_flight))
+        graph.add_node("flight_already_booked", self._node("flight_already_booked", self.flight_already_booked))
 
         graph.add_edge(START, "returning_user_middleware")
         graph.add_conditional_edges(
             "returning_user_middleware",
             self.route_after_middleware,
             {
-                "user_intent_classifier": "user_intent_classifier",
+                "user_intent_classifier": (
+                    "classify_and_extract" if self.combined_intent_extraction else "user_intent_classifier"
+                ),
                 "extract_flight_preferences": "extract_flight_preferences",
                 "extract_itinerary_preferences": "extract_itinerary_preferences",
                 "extract_flight_booking_confirmation": "extract_flight_booking_confirmation",
@@ -104,15 +196,26 @@ class IntentClassifierAgent:
             },
         )
 
-        graph.add_conditional_edges(
-            "user_intent_classifier",
-            self.route_intent,
-            {
-                "extract_flight_preferences": "extract_flight_preferences",
-                "extract_itinerary_preferences": "extract_itinerary_preferences",
-                "graceful_exit": "graceful_exit",
-            }
-        )
+        if self.combined_intent_extraction:
+            graph.add_conditional_edges(
+                "classify_and_extract",
+                self.route_after_classify_and_extract,
+                {
+                    "search_flight": "search_flight",
+                    "route_to_plan": "route_to_plan",
+                    "graceful_exit": "graceful_exit",
+                }
+            )
+        else:
+            graph.add_conditional_edges(
+                "user_intent_classifier",
+                self.route_intent,
+                {
+                    "extract_flight_preferences": "extract_flight_preferences",
+                    "extract_itinerary_preferences": "extract_itinerary_preferences",
+                    "graceful_exit": "graceful_exit",
+                }
+            )
 
         graph.add_edge("extract_itinerary_preferences", "route_to_plan")
         graph.add_edge("extract_flight_preferences", "search_flight")
@@ -121,56 +224,102 @@ class IntentClassifierAgent:
         graph.add_conditional_edges(
             "extract_flight_booking_confirmation",
             self._route_after_confirmation,
-            {"book_flight": "book_flight", "cancel": END},
+            {"book_flight": "book_flight", "show_more_flights": "show_more_flights", "cancel": END},
         )
+        graph.add_edge("show_more_flights", END)
         graph.add_edge("book_flight", END)
         graph.add_edge("flight_already_booked", END)
         graph.add_edge("route_to_plan", END)
 
         graph.add_edge("graceful_exit", END)
+        return graph
 
-        self.workflow = graph.compile(checkpointer=self._checkpointer)
+    def build_workflow(self):
+        checkpointer = TimedCheckpointSaver(self._checkpointer_manager.setup())
+        self.workflow = self._build_graph().compile(checkpointer=checkpointer)
 
-    def invoke(self, user_input: str, session_id: str) -> dict:
-        thinking_parts: set[str] = set()
-        ai_message_content = ""
-        printed_message_ids: set = set()
-        trajectory: list[str] = []
-        last_values: dict = {}
+    async def abuild_workflow(self):
+        self.compile_async_workflow(await self._checkpointer_manager.asetup())
+
+    def compile_async_workflow(self, checkpointer: BaseCheckpointSaver) -> None:
+        self.async_workflow = self._build_graph().compile(checkpointer=TimedCheckpointSaver(checkpointer))
 
+    @property
+    def checkpointer_manager(self) -> CheckpointerManager:
+        return self._checkpointer_manager
+
+    @staticmethod
+    def _turn_input(user_input: str, session_id: str) -> tuple[dict, dict]:
         thread_id = session_id or str(uuid.uuid4())
-        config = {"configurable": {"thread_id": thread_id}}
-        stream = self.workflow.stream(
-            {"messages": [("user", user_input)], "session_id": thread_id},
-            config=config,
-            stream_mode=["updates", "values"],
-        )
-        for mode, chunk in stream:
-            if mode == "updates":
-                trajectory.extend(chunk.keys())
-            if mode == "values":
-                last_values = chunk
-                if chunk.get("reasoning"):
-                    thinking_parts.add(chunk["reasoning"].strip())
-                if chunk.get("thinking"):
-                    thinking_parts.add(chunk["thinking"].strip())
-                messages = chunk.get("messages", [])
-                if messages:
-                    last_message = messages[-1]
-                    if isinstance(last_message, AIMessage):
-                        message_id = getattr(last_message, "id", None)
-                        if message_id not in printed_message_ids:
-                            printed_message_ids.add(message_id)
-                            content = getattr(last_message, "content", None)
-                            if isinstance(content, str):
-                                ai_message_content = content
-
-        thinking = "\n".join(thinking_parts).strip() if thinking_parts else ""
-        return {
-            "response": ai_message_content or "",
-            "thinking": thinking,
-            "trajectory": trajectory,
-        }
+        config = {"configurable": {"thread_id": thread_id}, "callbacks": [token_usage_handler]}
+        return {"messages": [("user", user_input)], "session_id": thread_id}, config
+
+    def invoke(self, user_input: str, session_id: str) -> dict:
+        collector = _TurnCollector()
+        graph_input, config = self._turn_input(user_input, session_id)
+        with self._checkpointer_manager.turn_lock.hold(graph_input["session_id"]), track_turn() as timings:
+            stream = self.workflow.stream(
+                graph_input,
+                config=config,
+                durability=self._checkpointer_manager.graph_durability,
+                stream_mode=["updates", "values"],
+            )
+            for mode, chunk in stream:
+                collector.add(mode, chunk)
+        return {**collector.result(), "timings": timings}
+
+    async def ainvoke(self, user_input: str, session_id: str) -> dict:
+        collector = _TurnCollector()
+        graph_input, config = self._turn_input(user_input, session_id)
+        async with self._checkpointer_manager.turn_lock.ahold(graph_input["session_id"]):
+            with track_turn() as timings:
+                stream = self.async_workflow.astream(
+                    graph_input,
+                    config=config,
+                    durability=self._checkpointer_manager.graph_durability,
+                    stream_mode=["updates", "values"],
+                )
+                async for mode, chunk in stream:
+                    collector.add(mode, chunk)
+        return {**collector.result(), "timings": timings}
+
+    async def astream_turn(self, user_input: str, session_id: str):
+        """Yield ``(event, data)`` pairs for one turn as the graph runs, ending with the ``response`` payload."""
+        collector = _TurnCollector()
+        graph_input, config = self._turn_input(user_input, session_id)
+        async with self._checkpointer_manager.turn_lock.ahold(graph_input["session_id"]):
+            with track_turn() as timings:
+                stream = self.async_workflow.astream(
+                    graph_input,
+                    config=config,
+                    durability=self._checkpointer_manager.graph_durability,
+                    stream_mode=["tasks", "messages", "updates", "values"],
+                )
+                async for mode, chunk in stream:
+                    collector.add(mode, chunk)
+                    if mode == "tasks":
+                        if "result" in chunk or "error" in chunk:
+                            error = chunk.get("error")
+                            yield "node_end", {"node": chunk["name"], "error": str(error) if error else None}
+                        else:
+                            yield "node_start", {"node": chunk["name"]}
+                    elif mode == "messages":
+                        message, metadata = chunk
+                        content = message.content
+                        if not isinstance(content, str) or not content:
+                            continue
+                        node = metadata.get("langgraph_node")
+                        if isinstance(message, AIMessageChunk):
+                            yield "token", {"node": node, "content": content}
+                        elif isinstance(message, AIMessage):
+                            yield "message", {"node": node, "content": content}
+        yield "response", {**collector.result(), "timings": timings}
+
+    def close(self) -> None:
+        self._checkpointer_manager.close()
+
+    async def aclose(self) -> None:
+        await self._checkpointer_manager.aclose()
 
     def visualize_workflow(self, output_path: str = "workflow_graph.png"):
         try:
@@ -1,17 +1,203 @@
-from langgraph.checkpoint.postgres import PostgresSaver
-from psycopg_pool import ConnectionPool
+import os
+import sqlite3
+from pathlib import Path
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+
+from backend.schema.models import State
+from backend.util.checkpoint_serde import create_checkpoint_serde
+from backend.util.config_reader import get_checkpoint_config
+from backend.util.deferred_checkpointer import DeferredCheckpointSaver
+from backend.util.message_delta_checkpointer import MessageDeltaCheckpointSaver, compact_model_channels
+from backend.util.turn_lock import InProcessTurnLock, PostgresTurnLock
 
 
 class CheckpointerManager:
-    def __init__(self, conn_info: str | None, max_size: int = 10):
+    """Owns the checkpoint savers of one backend, and how durably each turn is checkpointed.
+
+    Subclasses open and release their backend in ``_open``/``_aopen`` and
+    ``_release``/``_arelease``; the lifecycle (``setup``/``asetup``, ``close``/``aclose``)
+    is the same for every backend.
+
+    ``durability`` trades fault tolerance for checkpoint writes per turn:
+
+    - ``sync``: every step is written before the next one starts
+    - ``async``: every step is written in the background while the next one runs
+    - ``exit``: one write per turn, before the response is returned
+    - ``deferred``: one write per turn, persisted after the response is returned;
+      a crash in between loses the turn
+
+    With ``message_deltas`` each checkpoint stores only the messages added since its parent
+    (see ``MessageDeltaCheckpointSaver``); ``compression`` zstd-compresses large blobs.
+
+    ``turn_lock`` serialises turns per thread (see ``backend.util.turn_lock``); it is
+    in-process unless the backend can coordinate workers.
+    """
+
+    def __init__(self, durability: str | None = None, config: dict | None = None):
+        self.config = config or get_checkpoint_config()
+        self.durability = durability or self.config["durability"]
+        self.serde = create_checkpoint_serde(self.config["compression"])
+        self._checkpointer: BaseCheckpointSaver | None = None
+        self._async_checkpointer: BaseCheckpointSaver | None = None
+        self.turn_lock = self._create_turn_lock(self.config["turn_lock"])
+
+    @property
+    def graph_durability(self) -> str:
+        """Value for LangGraph's ``durability`` stream argument."""
+        return "exit" if self.durability == "deferred" else self.durability
+
+    def _wrap(self, saver: BaseCheckpointSaver) -> BaseCheckpointSaver:
+        if self.config["message_deltas"]:
+            saver = MessageDeltaCheckpointSaver(saver, compact_model_channels(State), self.config["snapshot_every"])
+        return DeferredCheckpointSaver(saver) if self.durability == "deferred" else saver
+
+    def setup(self) -> BaseCheckpointSaver:
+        self._checkpointer = self._wrap(self._open())
+        return self._checkpointer
+
+    async def asetup(self) -> BaseCheckpointSaver:
+        self._async_checkpointer = self._wrap(await self._aopen())
+        await self.turn_lock.aopen()
+        return self._async_checkpointer
+
+    def get_checkpointer(self) -> BaseCheckpointSaver:
+        if self._checkpointer is None:
+            raise RuntimeError("Checkpointer not initialized. Call setup() first.")
+        return self._checkpointer
+
+    def get_async_checkpointer(self) -> BaseCheckpointSaver:
+        if self._async_checkpointer is None:
+            raise RuntimeError("Async checkpointer not initialized. Call asetup() first.")
+        return self._async_checkpointer
+
+    async def acheck(self) -> dict:
+        """Raises unless the async backend answers a query; returns backend stats for /readyz."""
+        self.get_async_checkpointer()
+        return await self._acheck()
+
+    def close(self) -> None:
+        if isinstance(self._checkpointer, DeferredCheckpointSaver):
+            self._checkpointer.flush()
+        self._release()
+        self._checkpointer = None
+
+    async def aclose(self) -> None:
+        if isinstance(self._async_checkpointer, DeferredCheckpointSaver):
+            await self._async_checkpointer.aflush()
+        await self.turn_lock.aclose()
+        await self._arelease()
+        self._async_checkpointer = None
+        self.close()
+
+    def _create_turn_lock(self, config: dict) -> InProcessTurnLock:
+        return InProcessTurnLock(config["policy"], config["wait_timeout_seconds"])
+
+    def _open(self) -> BaseCheckpointSaver:
+        raise NotImplementedError
+
+    async def _aopen(self) -> BaseCheckpointSaver:
+        raise NotImplementedError
+
+    def _release(self) -> None:
+        pass
+
+    async def _arelease(self) -> None:
+        pass
+
+    async def _acheck(self) -> dict:
+        return {}
+
+
+class InMemoryCheckpointerManager(CheckpointerManager):
+    """Process-local checkpoints for tests, benchmarks and batch evals; lost on exit."""
+
+    def __init__(self, durability: str | None = None, saver_factory=None, config: dict | None = None):
+        super().__init__(durability, config)
+        self._saver_factory = saver_factory or (lambda: InMemorySaver(serde=self.serde))
+
+    def _open(self) -> BaseCheckpointSaver:
+        return self._saver_factory()
+
+    async def _aopen(self) -> BaseCheckpointSaver:
+        return self._saver_factory()
+
+
+class SqliteCheckpointerManager(CheckpointerManager):
+    """Checkpoints in a local SQLite file in WAL mode, for single-process deployments."""
+
+    def __init__(self, path: str, durability: str | None = None, config: dict | None = None):
+        super().__init__(durability, config)
+        self.path = path
+        self._conn = None
+        self._async_conn = None
+
+    def _open(self) -> BaseCheckpointSaver:
+        from langgraph.checkpoint.sqlite import SqliteSaver
+
+        self._conn = sqlite3.connect(self._prepare_path(), check_same_thread=False)
+        for pragma in self._pragmas():
+            self._conn.execute(pragma)
+        saver = SqliteSaver(self._conn, serde=self.serde)
+        saver.setup()
+        return saver
+
+    async def _aopen(self) -> BaseCheckpointSaver:
+        import aiosqlite
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        self._async_conn = await aiosqlite.connect(self._prepare_path())
+        for pragma in self._pragmas():
+            await self._async_conn.execute(pragma)
+        saver = AsyncSqliteSaver(self._async_conn, serde=self.serde)
+        await saver.setup()
+        return saver
+
+    def _release(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def _arelease(self) -> None:
+        if self._async_conn is not None:
+            await self._async_conn.close()
+            self._async_conn = None
+
+    async def _acheck(self) -> dict:
+        await self._async_conn.execute("SELECT 1")
+        return {"path": self.path}
+
+    def _prepare_path(self) -> str:
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        return self.path
+
+    @staticmethod
+    def _pragmas() -> list[str]:
+        # WAL lets readers run alongside the writer; NORMAL only fsyncs at checkpoints of the WAL
+        return ["PRAGMA journal_mode=WAL", "PRAGMA synchronous=NORMAL", "PRAGMA busy_timeout=5000"]
+
+
+class PostgresCheckpointerManager(CheckpointerManager):
+    """Checkpoints in Postgres through pooled connections."""
+
+    def __init__(self, conn_info: str | None, max_size: int = 10, durability: str | None = None, config: dict | None = None):
         if not conn_info:
             raise ValueError("POSTGRES_URI (conninfo) is required for Postgres checkpointer")
         self.conn_info = conn_info
+        super().__init__(durability, config)
         self.max_size = max_size
-        self._pool: ConnectionPool | None = None
-        self._checkpointer: PostgresSaver | None = None
+        self._pool = None
+        self._async_pool = None
+
+    def _create_turn_lock(self, config: dict) -> InProcessTurnLock:
+        return PostgresTurnLock(self.conn_info, config["postgres_pool_size"], config["policy"], config["wait_timeout_seconds"])
+
+    def _open(self) -> BaseCheckpointSaver:
+        from langgraph.checkpoint.postgres import PostgresSaver
+        from psycopg_pool import ConnectionPool
 
-    def setup(self) -> PostgresSaver:
         self._pool = ConnectionPool(
             conninfo=self.conn_info,
             max_size=self.max_size,
@@ -19,17 +205,55 @@ class CheckpointerManager:
             timeout=5,
             kwargs={"autocommit": True},
         )
-        self._checkpointer = PostgresSaver(conn=self._pool)
-        self._checkpointer.setup()
-        return self._checkpointer
+        saver = PostgresSaver(conn=self._pool, serde=self.serde)
+        saver.setup()
+        return saver
 
-    def get_checkpointer(self) -> PostgresSaver:
-        if self._checkpointer is None:
-            raise RuntimeError("Checkpointer not initialized. Call setup() first.")
-        return self._checkpointer
+    async def _aopen(self) -> BaseCheckpointSaver:
+        from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+        from psycopg_pool import AsyncConnectionPool
 
-    def close(self) -> None:
+        # AsyncConnectionPool must be opened from inside the running event loop
+        self._async_pool = AsyncConnectionPool(
+            conninfo=self.conn_info,
+            max_size=self.max_size,
+            open=False,
+            timeout=5,
+            kwargs={"autocommit": True},
+        )
+        await self._async_pool.open()
+        saver = AsyncPostgresSaver(conn=self._async_pool, serde=self.serde)
+        await saver.setup()
+        return saver
+
+    def _release(self) -> None:
         if self._pool is not None:
             self._pool.close()
             self._pool = None
-        self._checkpointer = None
+
+    async def _arelease(self) -> None:
+        if self._async_pool is not None:
+            await self._async_pool.close()
+            self._async_pool = None
+
+    async def _acheck(self) -> dict:
+        async with self._async_pool.connection(timeout=2) as conn:
+            await conn.execute("SELECT 1")
+        stats = self._async_pool.get_stats()
+        return {
+            "pool_size": stats.get("pool_size", 0),
+            "pool_available": stats.get("pool_available", 0),
+            "requests_waiting": stats.get("requests_waiting", 0),
+        }
+
+
+def create_checkpointer_manager(config: dict | None = None) -> CheckpointerManager:
+    """Manager for the backend selected by ``checkpoint.backend`` (``CHECKPOINT_BACKEND`` overrides)."""
+    config = config or get_checkpoint_config()
+    backend = config["backend"]
+    durability = config["durability"]
+    if backend == "memory":
+        return InMemoryCheckpointerManager(durability, config=config)
+    if backend == "sqlite":
+        return SqliteCheckpointerManager(config["sqlite_path"], durability, config)
+    return PostgresCheckpointerManager(os.getenv("POSTGRES_URI"), config["postgres_pool_size"], durability, config)
@@ -0,0 +1,431 @@
+"""Retention for checkpoint threads: compact idle threads to their latest checkpoint, delete expired ones.
+
+    python -m backend.checkpoint_retention [--dry-run]
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from dotenv import load_dotenv
+
+from backend.instrumentation.metrics import registry
+from backend.util.checkpoint_serde import create_checkpoint_serde
+from backend.util.config_reader import get_checkpoint_config, get_checkpoint_retention_config
+from backend.util.message_delta_checkpointer import MessageDeltaCheckpointSaver, compact_model_channels, is_message_delta
+
+registry.describe("agent_checkpoint_retention_rows_deleted_total", "counter", "Checkpoint rows deleted by retention, by table")
+registry.describe("agent_checkpoint_retention_threads_total", "counter", "Threads handled by retention, by action: compacted or deleted")
+registry.describe("agent_checkpoint_retention_run_seconds", "summary", "Wall time of one retention run")
+
+# 100-ns intervals between the UUID epoch (1582-10-15) and the Unix epoch
+_UUID_EPOCH_OFFSET = 0x01B21DD213814000
+
+
+def checkpoint_id_before(timestamp: float) -> str:
+    """Smallest uuid6 checkpoint id created at ``timestamp``; ids compare in creation order."""
+    ticks = int(timestamp * 10_000_000) + _UUID_EPOCH_OFFSET
+    value = ((ticks >> 12) & 0xFFFFFFFFFFFF) << 80 | (0x6000 | ticks & 0x0FFF) << 64 | 0x8000 << 48
+    return str(uuid.UUID(int=value))
+
+
+@dataclass
+class RetentionStats:
+    threads_compacted: int = 0
+    threads_deleted: int = 0
+    rows_deleted: dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    def add_rows(self, rows: dict[str, int]) -> None:
+        for table, count in rows.items():
+            self.rows_deleted[table] = self.rows_deleted.get(table, 0) + count
+
+
+class CheckpointRetention:
+    """Keeps only the latest checkpoint of threads idle for ``idle_seconds`` and deletes
+    threads idle for ``ttl_seconds`` (0 keeps them forever).
+
+    Threads are walked in ``batch_size`` pages with a short transaction per page and a
+    ``pause_seconds`` gap, so hot tables are never locked for long; recently active
+    threads are skipped. When messages are stored as deltas, the latest checkpoint of a
+    thread is rewritten with its full message list before its ancestors are deleted.
+    Subclasses hold the backend SQL.
+    """
+
+    def __init__(self, retention: dict | None = None, checkpoint: dict | None = None, clock=time.time):
+        retention = retention or get_checkpoint_retention_config()
+        self.checkpoint_config = checkpoint or get_checkpoint_config()
+        self.idle_seconds = retention["idle_seconds"]
+        self.ttl_seconds = retention["ttl_seconds"]
+        self.batch_size = retention["batch_size"]
+        self.pause_seconds = retention["pause_seconds"]
+        self.lock_timeout_ms = retention["lock_timeout_ms"]
+        self.serde = create_checkpoint_serde(self.checkpoint_config["compression"])
+        self._clock = clock
+
+    def run(self, dry_run: bool = False) -> RetentionStats:
+        started = time.perf_counter()
+        now = self._clock()
+        idle_cutoff = checkpoint_id_before(now - self.idle_seconds)
+        # "" sorts before every id, so nothing expires
+        ttl_cutoff = checkpoint_id_before(now - self.ttl_seconds) if self.ttl_seconds else ""
+        stats = RetentionStats()
+        self._connect()
+        try:
+            after = ""
+            while True:
+                batch = self._candidates(after, idle_cutoff, ttl_cutoff, self.batch_size)
+                if not batch:
+                    break
+                after = batch[-1][0]
+                expired = [thread_id for thread_id, latest, _ in batch if latest < ttl_cutoff]
+                idle = [thread_id for thread_id, latest, count in batch if latest >= ttl_cutoff and count > 1]
+                if not dry_run:
+                    if expired:
+                        stats.add_rows(self._delete_threads(expired, ttl_cutoff))
+                    if idle:
+                        if self.checkpoint_config["message_deltas"]:
+                            self._materialize_messages(idle)
+                        stats.add_rows(self._compact_threads(idle, idle_cutoff))
+                stats.threads_deleted += len(expired)
+                stats.threads_compacted += len(idle)
+                if len(batch) < self.batch_size:
+                    break
+                time.sleep(self.pause_seconds)
+        finally:
+            self._disconnect()
+        stats.seconds = time.perf_counter() - started
+        if not dry_run:
+            self._record(stats)
+        return stats
+
+    def _materialize_messages(self, thread_ids: list[str]) -> None:
+        # Deferred: the graph schema pulls in langgraph, which backend.main does not otherwise need
+        from backend.schema.models import State
+
+        reader = MessageDeltaCheckpointSaver(self._saver(), compact_model_channels(State), self.checkpoint_config["snapshot_every"])
+        for thread_id in thread_ids:
+            for checkpoint_ns in self._namespaces(thread_id):
+                config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns}}
+                stored = reader.saver.get_tuple(config)
+                if stored is None or not is_message_delta(stored.checkpoint["channel_values"].get("messages")):
+                    continue
+                messages = reader.get_tuple(config).checkpoint["channel_values"]["messages"]
+                self._write_messages(stored, messages)
+
+    @staticmethod
+    def _record(stats: RetentionStats) -> None:
+        for table, count in stats.rows_deleted.items():
+            registry.inc("agent_checkpoint_retention_rows_deleted_total", count, table=table)
+        registry.inc("agent_checkpoint_retention_threads_total", stats.threads_compacted, action="compacted")
+        registry.inc("agent_checkpoint_retention_threads_total", stats.threads_deleted, action="deleted")
+        registry.observe("agent_checkpoint_retention_run_seconds", stats.seconds)
+
+    def _connect(self) -> None:
+        raise NotImplementedError
+
+    def _disconnect(self) -> None:
+        raise NotImplementedError
+
+    def _saver(self):
+        raise NotImplementedError
+
+    def _candidates(self, after: str, idle_cutoff: str, ttl_cutoff: str, limit: int) -> list[tuple[str, str, int]]:
+        """``(thread_id, latest checkpoint id, checkpoint count)`` of threads after ``after`` needing work."""
+        raise NotImplementedError
+
+    def _namespaces(self, thread_id: str) -> list[str]:
+        raise NotImplementedError
+
+    def _write_messages(self, checkpoint_tuple, messages) -> None:
+        raise NotImplementedError
+
+    def _delete_threads(self, thread_ids: list[str], ttl_cutoff: str) -> dict[str, int]:
+        raise NotImplementedError
+
+    def _compact_threads(self, thread_ids: list[str], idle_cutoff: str) -> dict[str, int]:
+        raise NotImplementedError
+
+
+class PostgresCheckpointRetention(CheckpointRetention):
+
+    def __init__(self, conn_info: str | None, retention: dict | None = None, checkpoint: dict | None = None, clock=time.time):
+        if not conn_info:
+            raise ValueError("POSTGRES_URI (conninfo) is required for Postgres checkpoint retention")
+        super().__init__(retention, checkpoint, clock)
+        self.conn_info = conn_info
+        self._conn = None
+
+    def _connect(self) -> None:
+        import psycopg
+        from psycopg.rows import dict_row
+
+        # Opened like PostgresSaver.from_conn_string; the queries below read dict rows
+        self._conn = psycopg.connect(self.conn_info, autocommit=True, prepare_threshold=0, row_factory=dict_row)
+        self._conn.execute(f"SET lock_timeout = {int(self.lock_timeout_ms)}")
+
+    def _disconnect(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _saver(self):
+        from langgraph.checkpoint.postgres import PostgresSaver
+
+        return PostgresSaver(conn=self._conn, serde=self.serde)
+
+    def _candidates(self, after, idle_cutoff, ttl_cutoff, limit):
+        rows = self._conn.execute(
+            """
+            SELECT thread_id, MAX(checkpoint_id) AS latest, COUNT(*) AS checkpoints
+            FROM checkpoints
+            WHERE thread_id > %s
+            GROUP BY thread_id
+            HAVING MAX(checkpoint_id) < %s AND (COUNT(*) > 1 OR MAX(checkpoint_id) < %s)
+            ORDER BY thread_id
+            LIMIT %s
+            """,
+            (after, idle_cutoff, ttl_cutoff, limit),
+        ).fetchall()
+        return [(row["thread_id"], row["latest"], row["checkpoints"]) for row in rows]
+
+    def _namespaces(self, thread_id):
+        rows = self._conn.execute("SELECT DISTINCT checkpoint_ns FROM checkpoints WHERE thread_id = %s", (thread_id,))
+        return [row["checkpoint_ns"] for row in rows.fetchall()]
+
+    def _write_messages(self, checkpoint_tuple, messages):
+        configurable = checkpoint_tuple.config["configurable"]
+        type_, blob = self._saver().serde.dumps_typed(messages)
+        self._conn.execute(
+            """
+            UPDATE checkpoint_blobs SET type = %s, blob = %s
+            WHERE thread_id = %s AND checkpoint_ns = %s AND channel = 'messages' AND version = %s
+            """,
+            (
+                type_,
+                blob,
+                configurable["thread_id"],
+                configurable["checkpoint_ns"],
+                str(checkpoint_tuple.checkpoint["channel_versions"]["messages"]),
+            ),
+        )
+
+    def _delete_threads(self, thread_ids, ttl_cutoff):
+        # Re-checked inside the transaction so a thread that resumed since the scan is kept
+        expired = """
+            WITH expired AS (
+                SELECT thread_id FROM checkpoints WHERE thread_id = ANY(%(threads)s)
+                GROUP BY thread_id HAVING MAX(checkpoint_id) < %(cutoff)s
+            )
+        """
+        params = {"threads": thread_ids, "cutoff": ttl_cutoff}
+        rows = {}
+        with self._conn.transaction():
+            for table in ("checkpoint_writes", "checkpoint_blobs", "checkpoints"):
+                cursor = self._conn.execute(
+                    f"{expired} DELETE FROM {table} t USING expired e WHERE t.thread_id = e.thread_id", params
+                )
+                rows[table] = cursor.rowcount
+        return rows
+
+    def _compact_threads(self, thread_ids, idle_cutoff):
+        latest = """
+            WITH latest AS (
+                SELECT thread_id, checkpoint_ns, MAX(checkpoint_id) AS checkpoint_id FROM checkpoints
+                WHERE thread_id = ANY(%(threads)s)
+                GROUP BY thread_id, checkpoint_ns HAVING MAX(checkpoint_id) < %(cutoff)s
+            )
+        """
+        params = {"threads": thread_ids, "cutoff": idle_cutoff}
+        rows = {}
+        with self._conn.transaction():
+            for table in ("checkpoint_writes", "checkpoints"):
+                cursor = self._conn.execute(
+                    f"""{latest} DELETE FROM {table} t USING latest l
+                    WHERE t.thread_id = l.thread_id AND t.checkpoint_ns = l.checkpoint_ns
+                    AND t.checkpoint_id < l.checkpoint_id""",
+                    params,
+                )
+                rows[table] = cursor.rowcount
+            # Blobs are keyed by channel version; keep only those the remaining checkpoint points at
+            cursor = self._conn.execute(
+                f"""{latest} DELETE FROM checkpoint_blobs b USING latest l
+                WHERE b.thread_id = l.thread_id AND b.checkpoint_ns = l.checkpoint_ns
+                AND NOT EXISTS (
+                    SELECT 1 FROM checkpoints c
+                    WHERE c.thread_id = b.thread_id AND c.checkpoint_ns = b.checkpoint_ns
+                    AND c.checkpoint -> 'channel_versions' ->> b.channel = b.version
+                )""",
+                params,
+            )
+            rows["checkpoint_blobs"] = cursor.rowcount
+        return rows
+
+
+class SqliteCheckpointRetention(CheckpointRetention):
+
+    def __init__(self, path: str, retention: dict | None = None, checkpoint: dict | None = None, clock=time.time):
+        super().__init__(retention, checkpoint, clock)
+        self.path = path
+        self._conn = None
+
+    def _connect(self) -> None:
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute(f"PRAGMA busy_timeout={int(self.lock_timeout_ms)}")
+
+    def _disconnect(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _saver(self):
+        from langgraph.checkpoint.sqlite import SqliteSaver
+
+        return SqliteSaver(self._conn, serde=self.serde)
+
+    def _candidates(self, after, idle_cutoff, ttl_cutoff, limit):
+        return self._conn.execute(
+            """
+            SELECT thread_id, MAX(checkpoint_id), COUNT(*)
+            FROM checkpoints
+            WHERE thread_id > ?
+            GROUP BY thread_id
+            HAVING MAX(checkpoint_id) < ? AND (COUNT(*) > 1 OR MAX(checkpoint_id) < ?)
+            ORDER BY thread_id
+            LIMIT ?
+            """,
+            (after, idle_cutoff, ttl_cutoff, limit),
+        ).fetchall()
+
+    def _namespaces(self, thread_id):
+        rows = self._conn.execute("SELECT DISTINCT checkpoint_ns FROM checkpoints WHERE thread_id = ?", (thread_id,))
+        return [row[0] for row in rows.fetchall()]
+
+    def _write_messages(self, checkpoint_tuple, messages):
+        configurable = checkpoint_tuple.config["configurable"]
+        saver = self._saver()
+        checkpoint = {
+            **checkpoint_tuple.checkpoint,
+            "channel_values": {**checkpoint_tuple.checkpoint["channel_values"], "messages": messages},
+        }
+        type_, data = saver.serde.dumps_typed(checkpoint)
+        self._conn.execute(
+            "UPDATE checkpoints SET type = ?, checkpoint = ? WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+            (type_, data, configurable["thread_id"], configurable["checkpoint_ns"], configurable["checkpoint_id"]),
+        )
+
+    def _delete_threads(self, thread_ids, ttl_cutoff):
+        placeholders = ",".join("?" * len(thread_ids))
+        rows = {"writes": 0, "checkpoints": 0}
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            expired = [
+                row[0]
+                for row in self._conn.execute(
+                    f"SELECT thread_id FROM checkpoints WHERE thread_id IN ({placeholders}) "
+                    "GROUP BY thread_id HAVING MAX(checkpoint_id) < ?",
+                    (*thread_ids, ttl_cutoff),
+                )
+            ]
+            for table in rows:
+                rows[table] = self._conn.executemany(
+                    f"DELETE FROM {table} WHERE thread_id = ?", [(thread_id,) for thread_id in expired]
+                ).rowcount
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return rows
+
+    def _compact_threads(self, thread_ids, idle_cutoff):
+        placeholders = ",".join("?" * len(thread_ids))
+        rows = {"writes": 0, "checkpoints": 0}
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            latest = self._conn.execute(
+                f"SELECT thread_id, checkpoint_ns, MAX(checkpoint_id) FROM checkpoints WHERE thread_id IN ({placeholders}) "
+                "GROUP BY thread_id, checkpoint_ns HAVING MAX(checkpoint_id) < ?",
+                (*thread_ids, idle_cutoff),
+            ).fetchall()
+            for table in rows:
+                rows[table] = self._conn.executemany(
+                    f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?", latest
+                ).rowcount
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return rows
+
+
+def create_checkpoint_retention(checkpoint: dict | None = None, retention: dict | None = None) -> CheckpointRetention | None:
+    """Retention for the configured checkpoint backend; None for the in-memory backend."""
+    checkpoint = checkpoint or get_checkpoint_config()
+    if checkpoint["backend"] == "memory":
+        return None
+    if checkpoint["backend"] == "sqlite":
+        return SqliteCheckpointRetention(checkpoint["sqlite_path"], retention, checkpoint)
+    return PostgresCheckpointRetention(os.getenv("POSTGRES_URI"), retention, checkpoint)
+
+
+_retention_task: asyncio.Task | None = None
+
+
+async def _run_periodically(retention: CheckpointRetention, interval_seconds: float) -> None:
+    while True:
+        try:
+            stats = await asyncio.to_thread(retention.run)
+            print(
+                f"Checkpoint retention: compacted {stats.threads_compacted}, deleted {stats.threads_deleted} threads "
+                f"in {stats.seconds:.1f}s"
+            )
+        except Exception as e:
+            print("ACTUAL ERROR:", type(e), str(e))
+        await asyncio.sleep(interval_seconds)
+
+
+def start_checkpoint_retention() -> None:
+    """Run retention every ``interval_seconds`` in the background when ``checkpoint.retention.background`` is set."""
+    global _retention_task
+    config = get_checkpoint_retention_config()
+    if not config["background"] or _retention_task is not None:
+        return
+    retention = create_checkpoint_retention(retention=config)
+    if retention is not None:
+        _retention_task = asyncio.create_task(_run_periodically(retention, config["interval_seconds"]))
+
+
+async def stop_checkpoint_retention() -> None:
+    global _retention_task
+    if _retention_task is None:
+        return
+    _retention_task.cancel()
+    try:
+        await _retention_task
+    except asyncio.CancelledError:
+        pass
+    _retention_task = None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="count the threads that would be compacted or deleted")
+    args = parser.parse_args()
+
+    load_dotenv()
+    retention = create_checkpoint_retention()
+    if retention is None:
+        print("checkpoint.backend is memory; nothing to retain")
+        return
+    stats = retention.run(dry_run=args.dry_run)
+    verb = "would be" if args.dry_run else "were"
+    print(f"{stats.threads_compacted} threads {verb} compacted and {stats.threads_deleted} {verb} deleted ({stats.seconds:.2f}s)")
+    for table, count in sorted(stats.rows_deleted.items()):
+        print(f"  {table}: {count} rows deleted")
+
+
+if __name__ == "__main__":
+    main()
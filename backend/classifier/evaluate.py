@@ -0,0 +1,81 @@
+"""Report fast-path coverage and accuracy on the labelled corpus.
+
+Coverage is the fraction of messages the fast path answers without the LLM at the
+given threshold; accuracy is measured on those messages only. With ``--llm`` the
+fast path is also compared against the configured LLM classifier (needs an API key).
+
+    python -m backend.classifier.evaluate [--threshold 0.9] [--split test] [--llm]
+"""
+import argparse
+from pathlib import Path
+
+from langchain_core.messages import HumanMessage
+
+from backend.classifier.model import DEFAULT_WEIGHTS_PATH, IntentFastPath, LinearIntentModel
+from backend.classifier.train import DEFAULT_CORPUS_PATH, load_corpus
+from backend.schema.models import IntentOutput
+from backend.util.prompt_registry import get_prompt_registry
+
+
+def evaluate(fast_path: IntentFastPath, texts: list[str], labels: list[str]) -> dict:
+    handled = correct = 0
+    for text, label in zip(texts, labels):
+        result = fast_path.classify(text)
+        if result is None:
+            continue
+        handled += 1
+        correct += result.intent.value == label
+    return {
+        "examples": len(texts),
+        "handled": handled,
+        "coverage": handled / len(texts) if texts else 0.0,
+        "accuracy": correct / handled if handled else 0.0,
+    }
+
+
+def agreement_with_llm(fast_path: IntentFastPath, texts: list[str]) -> dict:
+    from backend.llm.client import create_llm_client
+
+    structured_llm = create_llm_client().with_structured_output(IntentOutput)
+    prompt = get_prompt_registry().get("understand_intent_system")
+    handled = agreed = 0
+    for text in texts:
+        result = fast_path.classify(text)
+        if result is None:
+            continue
+        handled += 1
+        llm_result: IntentOutput = structured_llm.invoke([prompt.system_message, HumanMessage(content=text)])
+        agreed += llm_result.intent == result.intent
+    return {
+        "handled": handled,
+        "agreement": agreed / handled if handled else 0.0,
+        "prompt_version": prompt.version,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Evaluate the intent fast path")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS_PATH)
+    parser.add_argument("--weights", type=Path, default=DEFAULT_WEIGHTS_PATH)
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--split", default="test", help="Corpus split to evaluate, or 'all'")
+    parser.add_argument("--llm", action="store_true", help="Also compare fast-path answers with the LLM")
+    args = parser.parse_args()
+
+    texts, labels = load_corpus(args.corpus, split=None if args.split == "all" else args.split)
+    fast_path = IntentFastPath(LinearIntentModel.load(args.weights), args.threshold)
+    report = evaluate(fast_path, texts, labels)
+    print(
+        f"threshold={args.threshold} examples={report['examples']} handled={report['handled']} "
+        f"coverage={report['coverage']:.1%} accuracy={report['accuracy']:.1%}"
+    )
+    if args.llm:
+        llm_report = agreement_with_llm(fast_path, texts)
+        print(
+            f"agreement with LLM on {llm_report['handled']} handled examples: {llm_report['agreement']:.1%} "
+            f"(prompt {llm_report['prompt_version']})"
+        )
+
+
+if __name__ == "__main__":
+    main()
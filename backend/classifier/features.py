@@ -0,0 +1,76 @@
+import re
+
+import numpy as np
+
+KEYWORDS = {
+    "flight": ("flight", "flights", "fly", "flying", "plane", "airline", "ticket", "tickets", "one-way",
+               "one way", "round trip", "return flight", "nonstop", "non-stop", "layover", "seat", "depart"),
+    "book": ("book", "booking", "reserve", "get me", "find me", "need a", "purchase"),
+    "planning": ("plan", "planning", "itinerary", "trip", "vacation", "holiday", "getaway", "honeymoon",
+                 "explore", "sightseeing", "things to do", "places to visit", "visit", "tour", "weekend in"),
+    "hotel": ("hotel", "hotels", "room", "rooms", "stay", "accommodation", "resort", "hostel", "airbnb",
+              "check-in", "check in", "nights", "suite", "bed and breakfast"),
+    "refund": ("refund", "money back", "reimburse", "cancel my", "cancellation", "charged", "compensation",
+               "cancelled", "canceled", "chargeback"),
+    "greeting": ("hello", "hi", "hey", "thanks", "thank you", "good morning", "what can you do", "help"),
+}
+
+# Common words that look like IATA codes when written in capitals
+_NOT_IATA = {"THE", "AND", "FOR", "YOU", "ARE", "CAN", "BUT", "NOT", "ALL", "ANY", "HOW", "WHO", "WHY",
+             "USD", "EUR", "GBP", "INR", "ASAP", "NYC", "USA"}
+_IATA = re.compile(r"\b[A-Z]{3}\b")
+_ROUTE = re.compile(r"\bfrom\s+[\w .'-]{2,30}?\s+to\s+[\w .'-]{2,30}", re.IGNORECASE)
+_DATE = re.compile(
+    r"\b(\d{1,2}(st|nd|rd|th)?\s+(of\s+)?(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*"
+    r"|(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+\d{1,2}(st|nd|rd|th)?"
+    r"|\d{1,2}[/-]\d{1,2}([/-]\d{2,4})?|\d{4}-\d{2}-\d{2}"
+    r"|tomorrow|tonight|next (monday|tuesday|wednesday|thursday|friday|saturday|sunday|week|month))\b",
+    re.IGNORECASE,
+)
+_PASSENGERS = re.compile(
+    r"\b(for\s+\d+(?![- ]?(day|night|week))|\d+\s+(passengers?|people|persons|adults|travell?ers|pax|seats?))\b",
+    re.IGNORECASE,
+)
+_DURATION = re.compile(r"\b(\d+|a|one|two|three|four|five|six|seven)[- ](day|days|night|nights|week|weeks)\b",
+                       re.IGNORECASE)
+_BOOKING_REF = re.compile(r"\b([A-Z0-9]{6}|BK-[A-Z0-9]{8})\b")
+
+FEATURE_NAMES = (
+    "bias",
+    *(f"kw_{group}" for group in KEYWORDS),
+    "iata_codes",
+    "route",
+    "date",
+    "passengers",
+    "duration",
+    "booking_reference",
+    "question",
+    "short_text",
+)
+
+
+def _contains(text: str, phrase: str) -> bool:
+    return re.search(rf"(?<![a-z]){re.escape(phrase)}(?![a-z])", text) is not None
+
+
+def extract_features(text: str) -> np.ndarray:
+    lowered = text.lower()
+    iata = [code for code in _IATA.findall(text) if code not in _NOT_IATA]
+    values = [1.0]
+    for phrases in KEYWORDS.values():
+        values.append(float(min(3, sum(_contains(lowered, phrase) for phrase in phrases))))
+    values.extend([
+        float(min(2, len(iata))),
+        float(bool(_ROUTE.search(text))),
+        float(bool(_DATE.search(text))),
+        float(bool(_PASSENGERS.search(text))),
+        float(bool(_DURATION.search(text))),
+        float(bool(_BOOKING_REF.search(text))),
+        float("?" in text),
+        float(len(lowered.split()) <= 3),
+    ])
+    return np.asarray(values, dtype=np.float32)
+
+
+def extract_feature_matrix(texts: list[str]) -> np.ndarray:
+    return np.stack([extract_features(text) for text in texts]) if texts else np.zeros((0, len(FEATURE_NAMES)))
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import numpy as np
+
+from backend.classifier.features import FEATURE_NAMES, extract_features
+from backend.instrumentation.metrics import registry
+from backend.schema.models import IntentOutput, IntentType
+from backend.util.config_reader import _default_config_path, get_intent_fast_path_config
+
+registry.describe("agent_intent_fast_path_total", "counter", "First-turn intents answered locally (hit) or sent to the LLM (fallback)")
+
+DEFAULT_WEIGHTS_PATH = Path(__file__).resolve().parent / "intent_weights.npz"
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class LinearIntentModel:
+    """Multinomial logistic regression over the hand-built features in ``features.py``."""
+
+    def __init__(self, weights: np.ndarray, classes: list[str]):
+        if weights.shape != (len(classes), len(FEATURE_NAMES)):
+            raise ValueError(
+                f"Intent weights have shape {weights.shape}, expected {(len(classes), len(FEATURE_NAMES))}"
+            )
+        self.weights = weights.astype(np.float32)
+        self.classes = classes
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_WEIGHTS_PATH) -> "LinearIntentModel":
+        if not path.is_file():
+            raise FileNotFoundError(f"Intent weights not found: {path}")
+        with np.load(path) as data:
+            return cls(data["weights"], [str(c) for c in data["classes"]])
+
+    def save(self, path: Path) -> None:
+        np.savez(path, weights=self.weights, classes=np.asarray(self.classes))
+
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        return softmax(features @ self.weights.T)
+
+
+class IntentFastPath:
+    """Classifies obvious first messages locally; returns None when the LLM should decide."""
+
+    def __init__(self, model: LinearIntentModel, threshold: float):
+        self.model = model
+        self.threshold = threshold
+
+    def classify(self, text: str) -> IntentOutput | None:
+        probabilities = self.model.predict_proba(extract_features(text))
+        best = int(probabilities.argmax())
+        intent = self.model.classes[best]
+        confidence = float(probabilities[best])
+        if intent == IntentType.UNKNOWN.value or confidence < self.threshold:
+            registry.inc("agent_intent_fast_path_total", result="fallback")
+            return None
+        registry.inc("agent_intent_fast_path_total", result="hit")
+        return IntentOutput(
+            intent=IntentType(intent),
+            confidence=round(confidence, 4),
+            reasoning=f"Classified locally from keyword and route features ({intent}, p={confidence:.2f}).",
+        )
+
+
+def load_intent_fast_path(config_path: Path | None = None) -> IntentFastPath | None:
+    fast_path_config = get_intent_fast_path_config(config_path)
+    if not fast_path_config["enabled"]:
+        return None
+    weights_path = DEFAULT_WEIGHTS_PATH
+    if fast_path_config["weights_path"]:
+        weights_path = Path(fast_path_config["weights_path"])
+        if not weights_path.is_absolute():
+            weights_path = (config_path or _default_config_path()).resolve().parent / weights_path
+    return IntentFastPath(LinearIntentModel.load(weights_path), fast_path_config["threshold"])
@@ -0,0 +1,68 @@
+"""Train the intent fast-path weights from a labelled JSONL corpus.
+
+    python -m backend.classifier.train [--corpus PATH] [--output PATH]
+"""
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+
+from backend.classifier.features import extract_feature_matrix
+from backend.classifier.model import DEFAULT_WEIGHTS_PATH, LinearIntentModel, softmax
+from backend.schema.models import IntentType
+
+DEFAULT_CORPUS_PATH = Path(__file__).resolve().parent / "data" / "intent_corpus.jsonl"
+CLASSES = [intent.value for intent in IntentType]
+
+
+def load_corpus(path: Path, split: str | None = None) -> tuple[list[str], list[str]]:
+    texts, labels = [], []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            if split and row.get("split", "train") != split:
+                continue
+            texts.append(row["text"])
+            labels.append(row["intent"])
+    return texts, labels
+
+
+def train(
+    texts: list[str],
+    labels: list[str],
+    epochs: int = 3000,
+    learning_rate: float = 0.1,
+    l2: float = 1e-3,
+) -> LinearIntentModel:
+    features = extract_feature_matrix(texts)
+    targets = np.zeros((len(labels), len(CLASSES)), dtype=np.float32)
+    targets[np.arange(len(labels)), [CLASSES.index(label) for label in labels]] = 1.0
+    # Balance classes so the rare intents are not drowned out by flight bookings
+    class_weights = targets.sum(axis=0)
+    sample_weights = (targets / np.maximum(class_weights, 1.0)).sum(axis=1, keepdims=True) * len(labels) / len(CLASSES)
+
+    weights = np.zeros((len(CLASSES), features.shape[1]), dtype=np.float32)
+    for _ in range(epochs):
+        probabilities = softmax(features @ weights.T)
+        gradient = ((probabilities - targets) * sample_weights).T @ features / len(labels) + l2 * weights
+        weights -= learning_rate * gradient
+    return LinearIntentModel(weights, CLASSES)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Train intent fast-path weights")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS_PATH)
+    parser.add_argument("--output", type=Path, default=DEFAULT_WEIGHTS_PATH)
+    args = parser.parse_args()
+
+    texts, labels = load_corpus(args.corpus, split="train")
+    model = train(texts, labels)
+    model.save(args.output)
+    print(f"Trained on {len(texts)} examples, weights written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import time
+from contextlib import contextmanager
+
+from backend.instrumentation.timings import record_checkpoint
+from backend.util.delegating_checkpointer import DelegatingCheckpointSaver
+
+
+@contextmanager
+def _timed(operation: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_checkpoint(operation, time.perf_counter() - started)
+
+
+class TimedCheckpointSaver(DelegatingCheckpointSaver):
+    """Records checkpoint read/write latency into the current turn and the metrics registry."""
+
+    def get_tuple(self, config):
+        with _timed("read"):
+            return super().get_tuple(config)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        with _timed("write"):
+            return super().put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        with _timed("write"):
+            return super().put_writes(config, writes, task_id, task_path)
+
+    async def aget_tuple(self, config):
+        with _timed("read"):
+            return await super().aget_tuple(config)
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        with _timed("write"):
+            return await super().aput(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        with _timed("write"):
+            return await super().aput_writes(config, writes, task_id, task_path)
@@ -0,0 +1,114 @@
+import math
+import threading
+from collections import deque
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class MetricsRegistry:
+    """In-process counters, gauges and quantile summaries rendered in the Prometheus text format.
+
+    Summaries keep a bounded window of the most recent observations per label set, so
+    quantiles describe recent traffic rather than the whole process lifetime.
+    """
+
+    def __init__(self, window: int = 2048):
+        self._window = window
+        self._lock = threading.Lock()
+        self._families: dict[str, tuple[str, str]] = {}
+        self._counters: dict[str, dict[tuple, float]] = {}
+        self._gauges: dict[str, dict[tuple, float]] = {}
+        self._summaries: dict[str, dict[tuple, list]] = {}
+
+    def describe(self, name: str, metric_type: str, help_text: str) -> None:
+        self._families.setdefault(name, (metric_type, help_text))
+
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._families.setdefault(name, ("counter", ""))
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._families.setdefault(name, ("gauge", ""))
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._families.setdefault(name, ("summary", ""))
+            series = self._summaries.setdefault(name, {})
+            # [recent window, count, sum]
+            entry = series.setdefault(key, [deque(maxlen=self._window), 0, 0.0])
+            entry[0].append(value)
+            entry[1] += 1
+            entry[2] += value
+
+    def value(self, name: str, **labels) -> float:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            for store in (self._counters, self._gauges):
+                if key in store.get(name, {}):
+                    return store[name][key]
+        return 0.0
+
+    def quantiles(self, name: str, **labels) -> dict[float, float]:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            entry = self._summaries.get(name, {}).get(key)
+            samples = sorted(entry[0]) if entry else []
+        return {q: _quantile(samples, q) for q in QUANTILES}
+
+    def render(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            for name, (metric_type, help_text) in sorted(self._families.items()):
+                if help_text:
+                    lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for key, value in sorted(self._counters.get(name, {}).items()):
+                    lines.append(f"{name}{_labels(key)} {_number(value)}")
+                for key, value in sorted(self._gauges.get(name, {}).items()):
+                    lines.append(f"{name}{_labels(key)} {_number(value)}")
+                for key, (window, count, total) in sorted(self._summaries.get(name, {}).items()):
+                    samples = sorted(window)
+                    for q in QUANTILES:
+                        q_key = key + (("quantile", str(q)),)
+                        lines.append(f"{name}{_labels(q_key)} {_number(_quantile(samples, q))}")
+                    lines.append(f"{name}_sum{_labels(key)} {_number(total)}")
+                    lines.append(f"{name}_count{_labels(key)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._summaries.clear()
+
+
+def _quantile(samples: list[float], q: float) -> float:
+    if not samples:
+        return math.nan
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def _labels(key: tuple) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in key) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,149 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from pydantic import BaseModel, Field
+
+from backend.instrumentation.metrics import registry
+
+registry.describe("agent_turn_duration_seconds", "summary", "Wall time of one /chat turn")
+registry.describe("agent_node_duration_seconds", "summary", "Wall time per graph node")
+registry.describe("agent_llm_tokens_total", "counter", "LLM tokens reported in AIMessage usage metadata")
+registry.describe("agent_checkpoint_duration_seconds", "summary", "Checkpointer read/write time")
+registry.describe("agent_tool_http_duration_seconds", "summary", "HTTP time of tool calls")
+
+
+class NodeTiming(BaseModel):
+    node: str
+    wall_ms: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+class TurnTimings(BaseModel):
+    total_ms: float = 0.0
+    nodes: list[NodeTiming] = Field(default_factory=list)
+    checkpoint_reads: int = 0
+    checkpoint_read_ms: float = 0.0
+    checkpoint_writes: int = 0
+    checkpoint_write_ms: float = 0.0
+    tool_calls: int = 0
+    tool_http_ms: float = 0.0
+
+
+_current_turn: ContextVar[TurnTimings | None] = ContextVar("current_turn", default=None)
+_current_node: ContextVar[NodeTiming | None] = ContextVar("current_node", default=None)
+
+
+@contextmanager
+def track_turn():
+    """Collect timings for everything run inside the block (nodes, LLM calls, checkpoints, tools)."""
+    timings = TurnTimings()
+    token = _current_turn.set(timings)
+    started = time.perf_counter()
+    try:
+        yield timings
+    finally:
+        elapsed = time.perf_counter() - started
+        timings.total_ms = elapsed * 1000
+        registry.observe("agent_turn_duration_seconds", elapsed)
+        try:
+            _current_turn.reset(token)
+        except ValueError:
+            # An abandoned streaming response is closed from a different context
+            pass
+
+
+def current_turn() -> TurnTimings | None:
+    return _current_turn.get()
+
+
+def _finish_node(record: NodeTiming, started: float) -> None:
+    elapsed = time.perf_counter() - started
+    record.wall_ms = elapsed * 1000
+    registry.observe("agent_node_duration_seconds", elapsed, node=record.node)
+    turn = _current_turn.get()
+    if turn is not None:
+        turn.nodes.append(record)
+
+
+def timed_node(name: str, func):
+    def run(state):
+        record = NodeTiming(node=name)
+        token = _current_node.set(record)
+        started = time.perf_counter()
+        try:
+            return func(state)
+        finally:
+            _finish_node(record, started)
+            _current_node.reset(token)
+
+    return run
+
+
+def atimed_node(name: str, afunc):
+    async def run(state):
+        record = NodeTiming(node=name)
+        token = _current_node.set(record)
+        started = time.perf_counter()
+        try:
+            return await afunc(state)
+        finally:
+            _finish_node(record, started)
+            _current_node.reset(token)
+
+    return run
+
+
+def record_checkpoint(operation: str, seconds: float) -> None:
+    registry.observe("agent_checkpoint_duration_seconds", seconds, operation=operation)
+    turn = _current_turn.get()
+    if turn is None:
+        return
+    if operation == "read":
+        turn.checkpoint_reads += 1
+        turn.checkpoint_read_ms += seconds * 1000
+    else:
+        turn.checkpoint_writes += 1
+        turn.checkpoint_write_ms += seconds * 1000
+
+
+@contextmanager
+def track_tool_call(tool: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        registry.observe("agent_tool_http_duration_seconds", elapsed, tool=tool)
+        turn = _current_turn.get()
+        if turn is not None:
+            turn.tool_calls += 1
+            turn.tool_http_ms += elapsed * 1000
+
+
+class TokenUsageCallbackHandler(BaseCallbackHandler):
+    """Attributes ``usage_metadata`` of every chat model response to the node that made the call."""
+
+    run_inline = True
+
+    def on_llm_end(self, response: LLMResult, **kwargs) -> None:
+        record = _current_node.get()
+        node = record.node if record else "unknown"
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if not usage:
+                    continue
+                input_tokens = usage.get("input_tokens", 0)
+                output_tokens = usage.get("output_tokens", 0)
+                registry.inc("agent_llm_tokens_total", input_tokens, node=node, type="input")
+                registry.inc("agent_llm_tokens_total", output_tokens, node=node, type="output")
+                if record is not None:
+                    record.input_tokens += input_tokens
+                    record.output_tokens += output_tokens
+
+
+token_usage_handler = TokenUsageCallbackHandler()
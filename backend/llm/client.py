@@ -1,24 +1,194 @@
+import os
 from pathlib import Path
-from typing import Sequence
+from typing import Any, AsyncIterator, Iterator, Sequence
 
-from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, BaseCallbackHandler, CallbackManagerForLLMRun
+from langchain_core.caches import BaseCache
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
 from langchain_openai import ChatOpenAI
-from langfuse.langchain.CallbackHandler import LangchainCallbackHandler
+from pydantic import Field
 
-from backend.util.config_reader import get_llm_config
+from backend.llm.governor import LLMGovernor, RateLimited, get_llm_governor
+from backend.llm.response_cache import create_response_cache
+from backend.util.config_reader import _default_config_path, get_llm_cache_config, get_llm_config, get_llm_governor_config
 
 OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 
 
+def create_tracing_callbacks() -> list[BaseCallbackHandler]:
+    """Langfuse handler when LANGFUSE_PUBLIC_KEY and LANGFUSE_SECRET_KEY are set, else nothing.
+
+    langfuse is imported here rather than at module level: it adds a few hundred ms to
+    startup and most deployments do not use it.
+    """
+    if not (os.getenv("LANGFUSE_PUBLIC_KEY") and os.getenv("LANGFUSE_SECRET_KEY")):
+        return []
+    from langfuse.langchain.CallbackHandler import LangchainCallbackHandler
+
+    return [LangchainCallbackHandler()]
+
+
+def _rate_limited(error: Exception) -> RateLimited | None:
+    """RateLimited for a provider 429, with its Retry-After in seconds when sent."""
+    import openai
+
+    if not isinstance(error, openai.RateLimitError):
+        return None
+    headers = error.response.headers
+    retry_after = None
+    try:
+        if headers.get("retry-after-ms"):
+            retry_after = float(headers["retry-after-ms"]) / 1000
+        elif headers.get("retry-after"):
+            retry_after = float(headers["retry-after"])
+    except ValueError:
+        pass
+    return RateLimited(error, retry_after)
+
+
+class GovernedChatOpenAI(ChatOpenAI):
+    """ChatOpenAI whose calls take a slot from an ``LLMGovernor`` first.
+
+    The priority lane is looked up from the ``langgraph_node`` of the calling run.
+    Build it with ``max_retries=0`` so 429s reach the governor, which retries them,
+    instead of the SDK's own backoff.
+    """
+
+    governor: Any = Field(default=None, exclude=True)
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        def call() -> ChatResult:
+            try:
+                return super(GovernedChatOpenAI, self)._generate(messages, stop, run_manager, **kwargs)
+            except Exception as e:
+                raise _rate_limited(e) or e
+
+        return self.governor.call(*self._slot(messages, run_manager), call)
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        async def call() -> ChatResult:
+            try:
+                return await super(GovernedChatOpenAI, self)._agenerate(messages, stop, run_manager, **kwargs)
+            except Exception as e:
+                raise _rate_limited(e) or e
+
+        return await self.governor.acall(*self._slot(messages, run_manager), call)
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        governor: LLMGovernor = self.governor
+        priority, tokens = self._slot(messages, run_manager)
+        for attempt in range(governor.max_retries + 1):
+            waiter = governor.acquire_sync(priority, tokens)
+            used, started = None, False
+            try:
+                for chunk in super()._stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    started = True
+                    used = (chunk.message.usage_metadata or {}).get("total_tokens", used)
+                    yield chunk
+            except Exception as e:
+                # Only a 429 before the first chunk can be retried without repeating output
+                rate_limited = None if started else _rate_limited(e)
+                governor.release(waiter, rate_limited=rate_limited is not None, retry_after=getattr(rate_limited, "retry_after", None))
+                if rate_limited is None or attempt == governor.max_retries:
+                    raise
+                continue
+            except BaseException:
+                governor.release(waiter)
+                raise
+            governor.release(waiter, used_tokens=used, succeeded=True)
+            return
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        governor: LLMGovernor = self.governor
+        priority, tokens = self._slot(messages, run_manager)
+        for attempt in range(governor.max_retries + 1):
+            waiter = await governor.acquire(priority, tokens)
+            used, started = None, False
+            try:
+                async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    started = True
+                    used = (chunk.message.usage_metadata or {}).get("total_tokens", used)
+                    yield chunk
+            except Exception as e:
+                # Only a 429 before the first chunk can be retried without repeating output
+                rate_limited = None if started else _rate_limited(e)
+                governor.release(waiter, rate_limited=rate_limited is not None, retry_after=getattr(rate_limited, "retry_after", None))
+                if rate_limited is None or attempt == governor.max_retries:
+                    raise
+                continue
+            except BaseException:
+                governor.release(waiter)
+                raise
+            governor.release(waiter, used_tokens=used, succeeded=True)
+            return
+
+    def _slot(self, messages: list[BaseMessage], run_manager) -> tuple[int, int]:
+        node = (run_manager.metadata or {}).get("langgraph_node") if run_manager else None
+        return self.governor.priority(node), self.governor.estimate_tokens(messages)
+
+
+def create_scripted_llm(scripted_config: dict, base_dir: Path) -> BaseChatModel:
+    """Local stand-in for OpenRouter: scripted rules and recorded fixtures with injected latency."""
+    from backend.llm.scripted import ScriptedChatModel, load_fixtures
+
+    fixtures_path = scripted_config["fixtures_path"]
+    return ScriptedChatModel(
+        latency_seconds=scripted_config["latency_seconds"],
+        seconds_per_1k_input_tokens=scripted_config["seconds_per_1k_input_tokens"],
+        fixtures=load_fixtures(base_dir / fixtures_path) if fixtures_path else {},
+    )
+
+
 def create_llm_client(
     config_path: Path | None = None,
-    callbacks: Sequence[LangchainCallbackHandler] | None = None,
-) -> ChatOpenAI:
+    callbacks: Sequence[BaseCallbackHandler] | None = None,
+    cache: BaseCache | None = None,
+) -> BaseChatModel:
     llm_config = get_llm_config(config_path)
-    return ChatOpenAI(
+    # Relative cache and fixture paths resolve next to config.json
+    base_dir = (config_path or _default_config_path()).resolve().parent
+    if llm_config["provider"] == "scripted":
+        # No response cache, so the injected latency is paid on every call
+        return create_scripted_llm(llm_config["scripted"], base_dir)
+    if callbacks is None:
+        callbacks = create_tracing_callbacks()
+    if cache is None:
+        cache = create_response_cache(get_llm_cache_config(config_path), base_dir)
+    options = dict(
         base_url=OPENROUTER_BASE_URL,
         model=llm_config["model_name"],
         temperature=0.2,
         max_tokens=5000,
         callbacks=list(callbacks) if callbacks else None,
+        cache=cache,
     )
+    if not get_llm_governor_config(config_path)["enabled"]:
+        return ChatOpenAI(**options)
+    # Cache hits are answered before _generate, so they never take a governor slot
+    return GovernedChatOpenAI(governor=get_llm_governor(), max_retries=0, **options)
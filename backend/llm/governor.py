@@ -0,0 +1,306 @@
+"""Client-side rate limiting and concurrency control for calls to the LLM provider.
+
+Every call first takes a slot from the process-wide ``LLMGovernor``:
+
+- token buckets for requests and tokens per minute, each allowed to burst
+  ``burst_seconds`` worth of its rate;
+- at most ``max_concurrency`` calls in flight;
+- waiting calls are served by priority lane, then FIFO. The lane comes from the
+  LangGraph node making the call (``llm.governor.priorities``), so a confirmation
+  turn is not stuck behind a burst of new-session classifications.
+
+A 429 from the provider pauses all dispatch for its ``Retry-After`` (or an
+exponential, jittered backoff) and halves the refill rate of both buckets; every
+successful call wins back 5% of it. The call is then retried through the governor,
+up to ``max_retries`` times, so bursts are absorbed rather than surfacing as node
+errors. Token use is estimated up front from the prompt and corrected from the
+reported usage when the call returns.
+"""
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Awaitable, Callable, TypeVar
+
+from langchain_core.messages import BaseMessage
+
+from backend.instrumentation.metrics import registry
+from backend.util.config_reader import get_llm_governor_config
+
+registry.describe("agent_llm_governor_wait_seconds", "summary", "Time LLM calls waited for a governor slot, by priority lane")
+registry.describe("agent_llm_governor_in_flight", "gauge", "LLM calls holding a governor slot")
+registry.describe("agent_llm_governor_queue_depth", "gauge", "LLM calls waiting for a governor slot")
+registry.describe("agent_llm_rate_limited_total", "counter", "LLM calls answered with 429 by the provider")
+registry.describe("agent_llm_governor_rate_factor", "gauge", "Share of the configured rate limits currently used after 429 backoff")
+
+T = TypeVar("T")
+
+
+class RateLimited(Exception):
+    """Raised by a governed call's body to report a provider 429; ``retry_after`` in seconds if known."""
+
+    def __init__(self, error: Exception, retry_after: float | None = None):
+        super().__init__(str(error))
+        self.error = error
+        self.retry_after = retry_after
+
+
+class _TokenBucket:
+    def __init__(self, per_second: float, capacity: float, now: float):
+        self.per_second = per_second
+        self.capacity = capacity
+        self.level = capacity
+        self._updated = now
+
+    def refill(self, now: float, factor: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.per_second * factor)
+        self._updated = now
+
+    def delay(self, amount: float, factor: float) -> float:
+        return max(0.0, (amount - self.level) / (self.per_second * factor))
+
+
+class _Waiter:
+    __slots__ = ("priority", "tokens", "wake", "granted", "cancelled", "enqueued")
+
+    def __init__(self, priority: int, tokens: int, wake: Callable[[], None], enqueued: float):
+        self.priority = priority
+        self.tokens = tokens
+        self.wake = wake
+        self.granted = False
+        self.cancelled = False
+        self.enqueued = enqueued
+
+
+class LLMGovernor:
+    """Shared by every LLM client in the process; safe to use from threads and event loops."""
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        max_concurrency: int,
+        burst_seconds: float = 6.0,
+        max_retries: int = 5,
+        backoff_initial_seconds: float = 1.0,
+        backoff_max_seconds: float = 60.0,
+        expected_output_tokens: int = 300,
+        priorities: dict[str, int] | None = None,
+        default_priority: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_initial_seconds = backoff_initial_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.expected_output_tokens = expected_output_tokens
+        self.priorities = priorities or {}
+        self.default_priority = default_priority
+        self._clock = clock
+        now = clock()
+        self._requests = _TokenBucket(requests_per_minute / 60, max(1.0, requests_per_minute / 60 * burst_seconds), now)
+        self._tokens = _TokenBucket(tokens_per_minute / 60, max(1.0, tokens_per_minute / 60 * burst_seconds), now)
+        self._rate_factor = 1.0
+        self._paused_until = 0.0
+        self._consecutive_rate_limits = 0
+        self._in_flight = 0
+        self._queue: list[tuple[int, int, _Waiter]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict | None = None) -> "LLMGovernor":
+        config = config or get_llm_governor_config()
+        return cls(
+            config["requests_per_minute"],
+            config["tokens_per_minute"],
+            config["max_concurrency"],
+            config["burst_seconds"],
+            config["max_retries"],
+            config["backoff_initial_seconds"],
+            config["backoff_max_seconds"],
+            config["expected_output_tokens"],
+            config["priorities"],
+            config["default_priority"],
+        )
+
+    def priority(self, node: str | None) -> int:
+        return self.priorities.get(node, self.default_priority) if node else self.default_priority
+
+    def estimate_tokens(self, messages: list[BaseMessage]) -> int:
+        return sum(len(str(m.content)) for m in messages) // 4 + self.expected_output_tokens
+
+    async def acall(self, priority: int, tokens: int, call: Callable[[], Awaitable[T]]) -> T:
+        for attempt in range(self.max_retries + 1):
+            waiter = await self.acquire(priority, tokens)
+            try:
+                result = await call()
+            except RateLimited as e:
+                self.release(waiter, rate_limited=True, retry_after=e.retry_after)
+                if attempt == self.max_retries:
+                    raise e.error
+                continue
+            except BaseException:
+                self.release(waiter)
+                raise
+            self.release(waiter, used_tokens=_used_tokens(result), succeeded=True)
+            return result
+
+    def call(self, priority: int, tokens: int, call: Callable[[], T]) -> T:
+        for attempt in range(self.max_retries + 1):
+            waiter = self.acquire_sync(priority, tokens)
+            try:
+                result = call()
+            except RateLimited as e:
+                self.release(waiter, rate_limited=True, retry_after=e.retry_after)
+                if attempt == self.max_retries:
+                    raise e.error
+                continue
+            except BaseException:
+                self.release(waiter)
+                raise
+            self.release(waiter, used_tokens=_used_tokens(result), succeeded=True)
+            return result
+
+    async def acquire(self, priority: int, tokens: int) -> _Waiter:
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        waiter = _Waiter(priority, tokens, lambda: loop.call_soon_threadsafe(event.set), self._clock())
+        delay = self._enqueue(waiter)
+        try:
+            while not waiter.granted:
+                try:
+                    await asyncio.wait_for(event.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                event.clear()
+                delay = self._retry(waiter)
+        except BaseException:
+            self._abandon(waiter)
+            raise
+        return waiter
+
+    def acquire_sync(self, priority: int, tokens: int) -> _Waiter:
+        event = threading.Event()
+        waiter = _Waiter(priority, tokens, event.set, self._clock())
+        delay = self._enqueue(waiter)
+        try:
+            while not waiter.granted:
+                event.wait(delay)
+                event.clear()
+                delay = self._retry(waiter)
+        except BaseException:
+            self._abandon(waiter)
+            raise
+        return waiter
+
+    def release(
+        self,
+        waiter: _Waiter,
+        used_tokens: int | None = None,
+        succeeded: bool = False,
+        rate_limited: bool = False,
+        retry_after: float | None = None,
+    ) -> None:
+        with self._lock:
+            now = self._clock()
+            self._in_flight -= 1
+            if used_tokens is not None:
+                # Settle the estimate against the reported usage; the bucket may go into debt
+                self._tokens.level = min(self._tokens.capacity, self._tokens.level + waiter.tokens - used_tokens)
+            if rate_limited:
+                self._consecutive_rate_limits += 1
+                if retry_after is None:
+                    backoff = self.backoff_initial_seconds * 2 ** (self._consecutive_rate_limits - 1)
+                    retry_after = random.uniform(0.5, 1.0) * min(self.backoff_max_seconds, backoff)
+                self._paused_until = max(self._paused_until, now + retry_after)
+                self._rate_factor = max(0.1, self._rate_factor / 2)
+                registry.inc("agent_llm_rate_limited_total")
+            elif succeeded:
+                self._consecutive_rate_limits = 0
+                self._rate_factor = min(1.0, self._rate_factor + 0.05)
+            registry.set("agent_llm_governor_rate_factor", self._rate_factor)
+            self._dispatch(None)
+
+    def _enqueue(self, waiter: _Waiter) -> float | None:
+        with self._lock:
+            heapq.heappush(self._queue, (waiter.priority, next(self._sequence), waiter))
+            return self._dispatch(waiter)
+
+    def _retry(self, waiter: _Waiter) -> float | None:
+        with self._lock:
+            return None if waiter.granted else self._dispatch(waiter)
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        with self._lock:
+            if waiter.granted:
+                self._in_flight -= 1
+            waiter.cancelled = True
+            self._dispatch(None)
+
+    def _dispatch(self, caller: _Waiter | None) -> float | None:
+        """Grants slots in queue order while limits allow. Called with self._lock held.
+
+        Returns how long ``caller`` should wait before trying again: a delay if it is
+        first in line and waiting on a bucket or a pause, None to wait for a wake-up.
+        """
+        now = self._clock()
+        self._requests.refill(now, self._rate_factor)
+        self._tokens.refill(now, self._rate_factor)
+        delay = None
+        while self._queue:
+            head = self._queue[0][2]
+            if head.cancelled:
+                heapq.heappop(self._queue)
+                continue
+            if self._in_flight >= self.max_concurrency:
+                break
+            tokens = min(head.tokens, self._tokens.capacity)
+            wait = max(
+                self._paused_until - now,
+                self._requests.delay(1, self._rate_factor),
+                self._tokens.delay(tokens, self._rate_factor),
+            )
+            if wait > 0:
+                if head is caller:
+                    delay = wait
+                else:
+                    head.wake()
+                break
+            heapq.heappop(self._queue)
+            self._requests.level -= 1
+            self._tokens.level -= tokens
+            head.tokens = tokens
+            self._in_flight += 1
+            head.granted = True
+            registry.observe("agent_llm_governor_wait_seconds", now - head.enqueued, lane=str(head.priority))
+            if head is not caller:
+                head.wake()
+        registry.set("agent_llm_governor_in_flight", self._in_flight)
+        registry.set("agent_llm_governor_queue_depth", sum(not entry[2].cancelled for entry in self._queue))
+        return delay
+
+
+def _used_tokens(result) -> int | None:
+    # ChatResult from _generate/_agenerate; anything else reports no usage
+    for generation in getattr(result, "generations", None) or []:
+        usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+        if usage:
+            return usage.get("total_tokens")
+    return None
+
+
+_llm_governor: LLMGovernor | None = None
+_llm_governor_lock = threading.Lock()
+
+
+def get_llm_governor() -> LLMGovernor:
+    """Process-wide governor, so every client and node shares one set of limits."""
+    global _llm_governor
+    if _llm_governor is None:
+        with _llm_governor_lock:
+            if _llm_governor is None:
+                _llm_governor = LLMGovernor.from_config()
+    return _llm_governor
@@ -0,0 +1,199 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Sequence
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumpd, load
+
+from backend.instrumentation.metrics import registry
+
+registry.describe("agent_llm_cache_requests_total", "counter", "LLM response cache lookups by tier and result")
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    """Canonical key for one structured LLM call.
+
+    ``llm_string`` is LangChain's serialisation of the model (name, temperature, ...) plus
+    the bound tool, i.e. the output schema; ``prompt`` is the message list with ids removed.
+    """
+    llm_hash = hashlib.sha256(llm_string.encode("utf-8")).hexdigest()
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    return f"{llm_hash}:{prompt_hash}"
+
+
+class InMemoryTier:
+    """LRU of generations with a per-entry TTL."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, RETURN_VAL_TYPE]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> RETURN_VAL_TYPE | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: RETURN_VAL_TYPE) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqliteTier:
+    """Persistent tier shared by processes on one host; evicts expired rows, then least recently used."""
+
+    name = "sqlite"
+
+    def __init__(self, path: Path, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_response_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS llm_response_cache_last_access ON llm_response_cache (last_access)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> RETURN_VAL_TYPE | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] + self.ttl_seconds < now:
+                self._conn.execute("DELETE FROM llm_response_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE llm_response_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return [load(generation) for generation in json.loads(row[0])]
+
+    def put(self, key: str, value: RETURN_VAL_TYPE) -> None:
+        now = time.time()
+        payload = json.dumps([dumpd(generation) for generation in value])
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_response_cache (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM llm_response_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_response_cache").fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM llm_response_cache WHERE key IN ("
+                "SELECT key FROM llm_response_cache ORDER BY last_access ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_response_cache")
+            self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class ResponseCache(BaseCache):
+    """LangChain LLM cache checked tier by tier; a hit in a slower tier is promoted to the faster ones."""
+
+    def __init__(self, tiers: Sequence[Any]):
+        self.tiers = list(tiers)
+        self.hits: dict[str, int] = {tier.name: 0 for tier in self.tiers}
+        self.misses = 0
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        key = cache_key(prompt, llm_string)
+        for index, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            if value is None:
+                registry.inc("agent_llm_cache_requests_total", tier=tier.name, result="miss")
+                continue
+            registry.inc("agent_llm_cache_requests_total", tier=tier.name, result="hit")
+            self.hits[tier.name] += 1
+            for faster in self.tiers[:index]:
+                faster.put(key, value)
+            return value
+        self.misses += 1
+        return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = cache_key(prompt, llm_string)
+        for tier in self.tiers:
+            tier.put(key, return_val)
+
+    def clear(self, **kwargs: Any) -> None:
+        for tier in self.tiers:
+            tier.clear()
+
+    async def alookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        # The in-memory tier answers most lookups; only go to a thread for the persistent tiers
+        if self.tiers and isinstance(self.tiers[0], InMemoryTier):
+            key = cache_key(prompt, llm_string)
+            value = self.tiers[0].get(key)
+            if value is not None:
+                registry.inc("agent_llm_cache_requests_total", tier=self.tiers[0].name, result="hit")
+                self.hits[self.tiers[0].name] += 1
+                return value
+        return await asyncio.to_thread(self.lookup, prompt, llm_string)
+
+    async def aupdate(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        await asyncio.to_thread(self.update, prompt, llm_string, return_val)
+
+    def stats(self) -> dict:
+        return {"hits": dict(self.hits), "misses": self.misses}
+
+
+def create_response_cache(cache_config: dict, base_dir: Path) -> ResponseCache | None:
+    if not cache_config.get("enabled"):
+        return None
+    tiers: list[Any] = [InMemoryTier(cache_config["max_entries"], cache_config["ttl_seconds"])]
+    sqlite_path = cache_config.get("sqlite_path")
+    if sqlite_path:
+        path = Path(sqlite_path)
+        tiers.append(
+            SqliteTier(
+                path if path.is_absolute() else base_dir / path,
+                cache_config["sqlite_max_entries"],
+                cache_config["ttl_seconds"],
+            )
+        )
+    return ResponseCache(tiers)
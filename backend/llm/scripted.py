@@ -0,0 +1,174 @@
+"""Deterministic local chat model for benchmarks, evals and load tests without OpenRouter."""
+import asyncio
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+_ROUTE = re.compile(r"from\s+([A-Za-z]{3,})\s+to\s+([A-Za-z]{3,})", re.IGNORECASE)
+_TRAVELERS = re.compile(r"(\d+)\s*(?:people|persons|passengers|travell?ers|adults|pax)\b", re.IGNORECASE)
+_DAYS = re.compile(r"(\d+)[- ]day", re.IGNORECASE)
+_MONTH = re.compile(
+    r"\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s*\d{0,2}",
+    re.IGNORECASE,
+)
+
+
+def _last_user_text(messages: list[BaseMessage]) -> str:
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            return str(message.content)
+    return ""
+
+
+def _prompt_tokens(messages: list[BaseMessage]) -> int:
+    return sum(len(str(m.content)) for m in messages) // 4
+
+
+def _intent(text: str) -> dict:
+    lowered = text.lower()
+    if "flight" in lowered or "fly" in lowered or "book" in lowered:
+        return {"intent": "flight_booking", "confidence": 0.95, "reasoning": "Mentions a flight."}
+    if "trip" in lowered or "plan" in lowered or "itinerary" in lowered:
+        return {"intent": "travel_planning", "confidence": 0.9, "reasoning": "Asks for a trip plan."}
+    return {"intent": "unknown", "confidence": 0.2, "reasoning": "No travel intent found."}
+
+
+def _preferences(text: str) -> dict:
+    prefs: dict[str, Any] = {}
+    route = _ROUTE.search(text)
+    if route:
+        prefs["origin"], prefs["destination"] = route.group(1).upper(), route.group(2).upper()
+    travel_date = _MONTH.search(text)
+    if travel_date:
+        prefs["travel_dates"] = travel_date.group(0).strip()
+    travelers = re.search(r"for\s+(\d+)\b(?![- ]day)", text, re.IGNORECASE) or _TRAVELERS.search(text)
+    if travelers:
+        prefs["number_of_travelers"] = travelers.group(1)
+    lowered = text.lower()
+    if "cheap" in lowered:
+        prefs["sort_by"] = "price"
+    elif "fast" in lowered or "shortest" in lowered:
+        prefs["sort_by"] = "duration"
+    elif "direct" in lowered or "non-stop" in lowered:
+        prefs["sort_by"] = "stops"
+    days = _DAYS.search(text)
+    if days:
+        prefs["duration_days"] = int(days.group(1))
+    return prefs
+
+
+def _confirmation(text: str) -> dict:
+    lowered = text.lower()
+    if any(word in lowered for word in ("more", "other option", "next one", "anything else")):
+        return {"action": "more"}
+    confirmed = any(word in lowered for word in ("yes", "confirm", "book it", "go ahead"))
+    return {"action": "confirm" if confirmed else "cancel"}
+
+
+def _intent_with_preferences(text: str) -> dict:
+    result = _intent(text)
+    if result["intent"] == "flight_booking":
+        result["flight_booking_preferences"] = _preferences(text)
+    elif result["intent"] == "travel_planning":
+        result["itinerary_preferences"] = _preferences(text)
+    return result
+
+
+_RULES = {
+    "IntentOutput": _intent,
+    "IntentWithPreferencesOutput": _intent_with_preferences,
+    "FlightBookingPreferences": _preferences,
+    "ItineraryPreferences": _preferences,
+    "UserConfirmationOutput": _confirmation,
+}
+
+
+# Free-text replies (no structured output requested) are recorded under this schema name
+TEXT_FIXTURE = "text"
+
+
+def load_fixtures(path: Path) -> dict[str, dict[str, Any]]:
+    """Reads recorded responses, one ``{"schema", "user_query", "output"}`` object per line.
+
+    Structured outputs are validated against the schema of the same name in
+    ``backend.schema.models``; ``schema: "text"`` records a plain reply string.
+    """
+    from backend.schema import models
+
+    fixtures: dict[str, dict[str, Any]] = {}
+    for line_number, line in enumerate(Path(path).read_text(encoding="utf-8").splitlines(), start=1):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        schema, output = record["schema"], record["output"]
+        if schema == TEXT_FIXTURE:
+            if not isinstance(output, str):
+                raise ValueError(f"{path}:{line_number}: text fixtures need a string output")
+        else:
+            model = getattr(models, schema, None)
+            if model is None:
+                raise ValueError(f"{path}:{line_number}: unknown schema {schema}")
+            output = model.model_validate(output).model_dump(mode="json", exclude_none=True)
+        fixtures.setdefault(schema, {})[record["user_query"].strip().lower()] = output
+    return fixtures
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Answers structured-output calls from recorded fixtures or keyword rules after a simulated delay.
+
+    A fixture matching the requested schema and the last user message (case-insensitive)
+    wins over the rules. The delay is ``latency_seconds`` plus
+    ``seconds_per_1k_input_tokens`` for every thousand prompt tokens, so prompt growth
+    shows up in latency like it does upstream.
+    """
+
+    latency_seconds: float = 0.0
+    seconds_per_1k_input_tokens: float = 0.0
+    fixtures: dict[str, dict[str, Any]] = {}
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, *, tool_choice=None, **kwargs):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    def _delay(self, messages: list[BaseMessage]) -> float:
+        return self.latency_seconds + self.seconds_per_1k_input_tokens * _prompt_tokens(messages) / 1000
+
+    def _respond(self, messages: list[BaseMessage], tools: list[dict] | None) -> ChatResult:
+        text = _last_user_text(messages)
+        prompt_tokens = _prompt_tokens(messages)
+        usage = {"input_tokens": prompt_tokens, "output_tokens": 20, "total_tokens": prompt_tokens + 20}
+        key = text.strip().lower()
+        if not tools:
+            message = AIMessage(content=self.fixtures.get(TEXT_FIXTURE, {}).get(key, text), usage_metadata=usage)
+        else:
+            name = tools[0]["function"]["name"]
+            recorded = self.fixtures.get(name, {}).get(key)
+            args = recorded if recorded is not None else _RULES.get(name, lambda _: {})(text)
+            message = AIMessage(
+                content="",
+                tool_calls=[{"name": name, "args": args, "id": f"call_{name}"}],
+                usage_metadata=usage,
+            )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        delay = self._delay(messages)
+        if delay:
+            time.sleep(delay)
+        return self._respond(messages, kwargs.get("tools"))
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        delay = self._delay(messages)
+        if delay:
+            await asyncio.sleep(delay)
+        return self._respond(messages, kwargs.get("tools"))
@@ -0,0 +1,97 @@
+"""OpenAI-compatible chat completions server that enforces provider-style rate limits.
+
+For exercising the LLM governor without a provider: requests and tokens per second
+are replenished continuously up to ``burst_seconds`` worth, and calls beyond them
+or beyond ``max_concurrency`` get a 429 with ``Retry-After``, as a provider would
+send. Accepted calls answer "ok" after ``latency_seconds``. Streaming is not
+supported.
+"""
+import asyncio
+import socket
+import threading
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+COMPLETION_TOKENS = 5
+
+
+class RateLimitedStub:
+    def __init__(
+        self,
+        requests_per_second: float,
+        tokens_per_second: float = 1_000_000,
+        max_concurrency: int = 1000,
+        burst_seconds: float = 1.0,
+        latency_seconds: float = 0.05,
+    ):
+        self.requests_per_second = requests_per_second
+        self.tokens_per_second = tokens_per_second
+        self.max_concurrency = max_concurrency
+        self.burst_seconds = burst_seconds
+        self.latency_seconds = latency_seconds
+        self._request_level = requests_per_second * burst_seconds
+        self._token_level = tokens_per_second * burst_seconds
+        self._updated = time.monotonic()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.served = 0
+        self.rejected = 0
+        self.app = FastAPI()
+        self.app.post("/v1/chat/completions")(self._complete)
+
+    async def _complete(self, request: Request) -> JSONResponse:
+        body = await request.json()
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in body.get("messages", [])) // 4
+        retry_after = self._admit(prompt_tokens + COMPLETION_TOKENS)
+        if retry_after is not None:
+            self.rejected += 1
+            return JSONResponse(
+                {"error": {"message": "Rate limit exceeded", "type": "rate_limit_error", "code": "rate_limit_exceeded"}},
+                status_code=429,
+                headers={"Retry-After": f"{retry_after:.3f}"},
+            )
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency_seconds)
+        finally:
+            self.in_flight -= 1
+        self.served += 1
+        return JSONResponse({
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": COMPLETION_TOKENS, "total_tokens": prompt_tokens + COMPLETION_TOKENS},
+        })
+
+    def _admit(self, tokens: int) -> float | None:
+        """None if the call is accepted, else the seconds until it would be."""
+        now = time.monotonic()
+        elapsed, self._updated = now - self._updated, now
+        self._request_level = min(self.requests_per_second * self.burst_seconds, self._request_level + elapsed * self.requests_per_second)
+        self._token_level = min(self.tokens_per_second * self.burst_seconds, self._token_level + elapsed * self.tokens_per_second)
+        if self.in_flight >= self.max_concurrency:
+            return self.latency_seconds
+        if self._request_level < 1 or self._token_level < tokens:
+            return max((1 - self._request_level) / self.requests_per_second, (tokens - self._token_level) / self.tokens_per_second)
+        self._request_level -= 1
+        self._token_level -= tokens
+        return None
+
+    def serve_in_thread(self):
+        """Starts uvicorn on a free local port; returns the server and its OpenAI base URL."""
+        import uvicorn
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        server = uvicorn.Server(uvicorn.Config(self.app, host="127.0.0.1", port=port, log_level="warning"))
+        threading.Thread(target=server.run, daemon=True).start()
+        while not server.started:
+            time.sleep(0.01)
+        return server, f"http://127.0.0.1:{port}/v1"
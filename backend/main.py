@@ -1,14 +1,43 @@
+import time
+
+# Import time of the app modules is the first phase of the startup report
+_IMPORTS_STARTED = time.perf_counter()
+
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
+from backend.agent_container import get_agent_container
 from backend.api.chat_controller import router as chat_router
 from backend.api.flight_controller import router as flight_router
+from backend.api.health_controller import router as health_router
+from backend.checkpoint_retention import start_checkpoint_retention, stop_checkpoint_retention
+from backend.instrumentation.metrics import registry
+from backend.service.FlightService import aclose_flight_service
+from backend.util.prompt_registry import get_prompt_registry, start_prompt_hot_reload, stop_prompt_hot_reload
 
+_APP_IMPORT_SECONDS = time.perf_counter() - _IMPORTS_STARTED
 _CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:3000").strip().split(",")
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load and validate every prompt, open the checkpointer and compile the graph before serving traffic
+    get_prompt_registry()
+    await get_agent_container().start({"app_imports": _APP_IMPORT_SECONDS})
+    start_prompt_hot_reload()
+    start_checkpoint_retention()
+    yield
+    await stop_checkpoint_retention()
+    stop_prompt_hot_reload()
+    await get_agent_container().stop()
+    await aclose_flight_service()
+
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[o.strip() for o in _CORS_ORIGINS if o.strip()],
@@ -18,3 +47,9 @@ app.add_middleware(
 )
 app.include_router(chat_router)
 app.include_router(flight_router)
+app.include_router(health_router)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -1,12 +1,40 @@
+import asyncio
 
 from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel
 
+from backend.nodes.context_window import ContextWindow
 from backend.schema.models import State
+from backend.util.prompt_registry import get_prompt_registry
 
 
 class BaseNode:
-    def __init__(self, llm_client: BaseChatModel):
+    # Structured outputs the node asks the LLM for; bound once at construction
+    output_schemas: tuple[type[BaseModel], ...] = ()
+
+    def __init__(self, llm_client: BaseChatModel, context_window: ContextWindow | None = None):
         self._llm_client = llm_client
+        self._context_window = context_window or ContextWindow.from_config()
+        self._prompts = get_prompt_registry()
+        self._structured_llms: dict[type[BaseModel], Runnable] = {}
+        for schema in self.output_schemas:
+            self._structured_llm(schema)
 
     def __call__(self, state:State):
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    async def acall(self, state: State):
+        # Nodes without a native async implementation run on a worker thread
+        return await asyncio.to_thread(self, state)
+
+    def _structured_llm(self, schema: type[BaseModel]) -> Runnable:
+        # with_structured_output converts the schema and builds the parser; do that once per schema, not per call
+        structured_llm = self._structured_llms.get(schema)
+        if structured_llm is None:
+            structured_llm = self._structured_llms[schema] = self._llm_client.with_structured_output(schema)
+        return structured_llm
+
+    def _prompt_messages(self, prompt_name: str, state: State) -> list:
+        # Looked up per call so a hot-reloaded prompt takes effect on the next turn
+        return self._context_window.build_prompt(self._prompts.get(prompt_name).system_message, state)
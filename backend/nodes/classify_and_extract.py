@@ -0,0 +1,72 @@
+from langchain_core.language_models import BaseChatModel
+
+from backend.nodes.base_node import BaseNode
+from backend.nodes.context_window import ContextWindow
+from backend.nodes.flight.extract_flight_preferences import ExtractFlightPreferences
+from backend.nodes.itinerary.extract_itinerary_preferences import ExtractItineraryPreferences
+from backend.nodes.user_intent_classifier import UserIntentClassifier
+from backend.schema.models import (
+    FlightBookingPreferences,
+    IntentType,
+    IntentWithPreferencesOutput,
+    ItineraryPreferences,
+    State,
+)
+
+
+class ClassifyAndExtract(BaseNode):
+    """Classifies intent and extracts the matching preferences in one LLM call (new sessions only).
+
+    Result handling is delegated to the single-purpose nodes so both graph variants
+    produce the same state updates and assistant messages.
+    """
+
+    output_schemas = (IntentWithPreferencesOutput,)
+
+    def __init__(
+        self,
+        llm_client: BaseChatModel,
+        intent_classifier: UserIntentClassifier,
+        flight_extractor: ExtractFlightPreferences,
+        itinerary_extractor: ExtractItineraryPreferences,
+        context_window: ContextWindow | None = None,
+    ):
+        super().__init__(llm_client, context_window)
+        self._prompt_name = "classify_and_extract"
+        self._prompts.get(self._prompt_name)  # fail fast if the prompt is missing
+        self._intent_classifier = intent_classifier
+        self._flight_extractor = flight_extractor
+        self._itinerary_extractor = itinerary_extractor
+
+    def __call__(self, state: State) -> dict:
+        structured_llm = self._structured_llm(IntentWithPreferencesOutput)
+        try:
+            result: IntentWithPreferencesOutput = structured_llm.invoke(self._build_messages(state))
+        except Exception as e:
+            print("ACTUAL ERROR:", type(e), str(e))
+            raise
+        return self._handle_result(state, result)
+
+    async def acall(self, state: State) -> dict:
+        structured_llm = self._structured_llm(IntentWithPreferencesOutput)
+        try:
+            result: IntentWithPreferencesOutput = await structured_llm.ainvoke(self._build_messages(state))
+        except Exception as e:
+            print("ACTUAL ERROR:", type(e), str(e))
+            raise
+        return self._handle_result(state, result)
+
+    def _build_messages(self, state: State) -> list:
+        return self._prompt_messages(self._prompt_name, state)
+
+    def _handle_result(self, state: State, result: IntentWithPreferencesOutput) -> dict:
+        update = self._intent_classifier._handle_result(state, result.intent_output())
+        match update["intent"]:
+            case IntentType.FLIGHT_BOOKING:
+                preferences = result.flight_booking_preferences or FlightBookingPreferences()
+                return {**update, **self._flight_extractor._handle_result(preferences)}
+            case IntentType.TRAVEL_PLANNING:
+                preferences = result.itinerary_preferences or ItineraryPreferences()
+                return {**update, **self._itinerary_extractor._handle_result(preferences)}
+            case _:
+                return update
@@ -0,0 +1,87 @@
+import json
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+from backend.schema.models import BasePreferences, State
+from backend.util.config_reader import get_context_config
+
+
+class ContextWindow:
+    """Bounds what a node sends to the LLM: recent turns verbatim, older turns as a rolling summary.
+
+    A turn starts at a user message and includes the assistant messages after it. The
+    summary is extractive (one line per older message) so keeping it up to date costs
+    no extra LLM call; extracted preferences are passed as structured context instead
+    of relying on the full history to carry them.
+    """
+
+    def __init__(self, max_turns: int | None, summary_max_chars: int = 2000, line_max_chars: int = 200):
+        self.max_turns = max_turns
+        self.summary_max_chars = summary_max_chars
+        self.line_max_chars = line_max_chars
+
+    @classmethod
+    def from_config(cls) -> "ContextWindow":
+        return cls(**get_context_config())
+
+    def window_start(self, messages: list[BaseMessage]) -> int:
+        """Index of the first message kept verbatim."""
+        if not self.max_turns:
+            return 0
+        turn_starts = [i for i, message in enumerate(messages) if isinstance(message, HumanMessage)]
+        if len(turn_starts) <= self.max_turns:
+            return 0
+        return turn_starts[-self.max_turns]
+
+    def summarise(self, state: State) -> dict:
+        """State update folding messages that left the window into ``conversation_summary``."""
+        start = self.window_start(state.messages)
+        if start <= state.summarized_message_count:
+            return {}
+        lines = [self._summary_line(m) for m in state.messages[state.summarized_message_count:start]]
+        summary = "\n".join(filter(None, [state.conversation_summary, *lines]))
+        if len(summary) > self.summary_max_chars:
+            # Rolling: drop the oldest lines first
+            summary = summary[-self.summary_max_chars:].split("\n", 1)[-1]
+        return {"conversation_summary": summary, "summarized_message_count": start}
+
+    def build_prompt(self, system_message: SystemMessage, state: State) -> list[BaseMessage]:
+        messages = state.messages[self.window_start(state.messages):]
+        context = self._context_message(state)
+        return [system_message, *([context] if context else []), *messages]
+
+    def _summary_line(self, message: BaseMessage) -> str:
+        content = message.content if isinstance(message.content, str) else str(message.content)
+        content = " ".join(content.split())
+        if not content:
+            return ""
+        if len(content) > self.line_max_chars:
+            content = content[: self.line_max_chars - 1] + "…"
+        role = "User" if isinstance(message, HumanMessage) else "Assistant"
+        return f"{role}: {content}"
+
+    def _context_message(self, state: State) -> SystemMessage | None:
+        if self.window_start(state.messages) == 0:
+            return None
+        parts = []
+        if state.conversation_summary:
+            parts.append(f"Summary of earlier conversation:\n{state.conversation_summary}")
+        preferences = {
+            name: _compact(value)
+            for name, value in (
+                ("flight_booking_preferences", state.flight_booking_preferences),
+                ("itinerary_preferences", state.itinerary_preferences),
+            )
+            if _compact(value)
+        }
+        if preferences:
+            parts.append(f"Preferences extracted so far:\n{json.dumps(preferences, ensure_ascii=False)}")
+        if not parts:
+            return None
+        return SystemMessage(content="\n\n".join(parts))
+
+
+def _compact(preferences: BasePreferences | None) -> dict:
+    if preferences is None:
+        return {}
+    return preferences.model_dump(exclude_none=True, exclude={"clarification_question"})
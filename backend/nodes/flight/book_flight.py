@@ -1,3 +1,5 @@
+import uuid
+
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import AIMessage
 
@@ -11,15 +13,31 @@ class BookFlight(BaseNode):
         super().__init__(llm_client)
 
     def __call__(self, state: State) -> dict:
+        payload = self._booking_payload(state)
+        if payload is None:
+            return self._no_flight_selected()
+
+        try:
+            result = book_flight_tool.invoke({"flight_payload": payload, "idempotency_key": self._idempotency_key(state, payload)})
+        except Exception as e:
+            return self._booking_failed(e)
+        return self._handle_result(result)
+
+    async def acall(self, state: State) -> dict:
+        payload = self._booking_payload(state)
+        if payload is None:
+            return self._no_flight_selected()
+
+        try:
+            result = await book_flight_tool.ainvoke({"flight_payload": payload, "idempotency_key": self._idempotency_key(state, payload)})
+        except Exception as e:
+            return self._booking_failed(e)
+        return self._handle_result(result)
+
+    def _booking_payload(self, state: State) -> dict | None:
         flight = state.last_flight_search_result
         if not flight:
-            return {
-                "last_flight_search_result": None,
-                "confirmation_action": None,
-                "messages": [
-                    AIMessage(content="No flight selected. Please search for a flight first.")
-                ],
-            }
+            return None
 
         passengers = 1
         prefs = state.flight_booking_preferences
@@ -31,18 +49,37 @@ class BookFlight(BaseNode):
                 passengers = 1
         passengers = max(1, min(9, passengers))
 
-        payload = {**flight, "passengers": passengers}
-        try:
-            result = book_flight_tool.invoke({"flight_payload": payload})
-        except Exception as e:
-            return {
-                "last_flight_search_result": None,
-                "confirmation_action": None,
-                "messages": [
-                    AIMessage(content=f"Booking request failed: {e}. Please try again or search for another flight.")
-                ],
-            }
+        return {**flight, "passengers": passengers}
+
+    @staticmethod
+    def _idempotency_key(state: State, payload: dict) -> str | None:
+        # Same thread, flight and travellers, same key: a retried or double-submitted turn replays the
+        # first booking, while changing the traveller count books anew instead of reusing the key
+        if not state.session_id or not payload.get("id"):
+            return None
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, f"booking:{state.session_id}:{payload['id']}:{payload['passengers']}"))
+
+    def _no_flight_selected(self) -> dict:
+        return {
+            "last_flight_search_result": None,
+            "flight_search_results": None,
+            "confirmation_action": None,
+            "messages": [
+                AIMessage(content="No flight selected. Please search for a flight first.")
+            ],
+        }
+
+    def _booking_failed(self, error: Exception) -> dict:
+        return {
+            "last_flight_search_result": None,
+            "flight_search_results": None,
+            "confirmation_action": None,
+            "messages": [
+                AIMessage(content=f"Booking request failed: {error}. Please try again or search for another flight.")
+            ],
+        }
 
+    def _handle_result(self, result: dict) -> dict:
         if result.get("booking_status") is True:
             msg = (
                 f"Your flight is booked. Confirmation number: **{result.get('confirmation_number', 'N/A')}**. "
@@ -50,6 +87,7 @@ class BookFlight(BaseNode):
             )
             return {
                 "last_flight_search_result": None,
+                "flight_search_results": None,
                 "confirmation_action": None,
                 "flight_booked": True,
                 "messages": [AIMessage(content=msg)],
@@ -59,6 +97,7 @@ class BookFlight(BaseNode):
         msg = f"Booking was not completed ({err_code}): {err_msg} Please try again or choose another flight."
         return {
             "last_flight_search_result": None,
+            "flight_search_results": None,
             "confirmation_action": None,
             "messages": [AIMessage(content=msg)],
         }
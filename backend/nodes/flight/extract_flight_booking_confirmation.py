@@ -1,41 +1,57 @@
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import AIMessage, SystemMessage
+from langchain_core.messages import AIMessage
 
 from backend.nodes.base_node import BaseNode
+from backend.nodes.context_window import ContextWindow
 from backend.schema.models import State, UserConfirmationOutput
-from backend.util.prompt_loader import get_prompt
 
 
 class ExtractFlightBookingConfirmation(BaseNode):
-    def __init__(self, llm_client: BaseChatModel):
-        super().__init__(llm_client)
-        self._prompt = get_prompt("flight_booking/extract_confirmation")
+    output_schemas = (UserConfirmationOutput,)
+
+    def __init__(self, llm_client: BaseChatModel, context_window: ContextWindow | None = None):
+        super().__init__(llm_client, context_window)
+        self._prompt_name = "flight_booking/extract_confirmation"
+        self._prompts.get(self._prompt_name)  # fail fast if the prompt is missing
 
     def __call__(self, state: State) -> dict:
         if not state.last_flight_search_result:
-            return {
-                "messages": [
-                    AIMessage(
-                        content="I don't have a flight selected to confirm. Please search for a flight first."
-                    )
-                ],
-            }
+            return self._no_flight_selected()
+
+        structured_llm = self._structured_llm(UserConfirmationOutput)
+        result: UserConfirmationOutput = structured_llm.invoke(self._build_messages(state))
+        return self._handle_result(result)
+
+    async def acall(self, state: State) -> dict:
+        if not state.last_flight_search_result:
+            return self._no_flight_selected()
 
-        messages = [
-            SystemMessage(content=self._prompt),
-            *state.messages,
-        ]
-        structured_llm = self._llm_client.with_structured_output(UserConfirmationOutput)
-        result: UserConfirmationOutput = structured_llm.invoke(messages)
+        structured_llm = self._structured_llm(UserConfirmationOutput)
+        result: UserConfirmationOutput = await structured_llm.ainvoke(self._build_messages(state))
+        return self._handle_result(result)
+
+    def _build_messages(self, state: State) -> list:
+        return self._prompt_messages(self._prompt_name, state)
+
+    def _no_flight_selected(self) -> dict:
+        return {
+            "messages": [
+                AIMessage(
+                    content="I don't have a flight selected to confirm. Please search for a flight first."
+                )
+            ],
+        }
 
-        if result.action == "confirm":
+    def _handle_result(self, result: UserConfirmationOutput) -> dict:
+        if result.action in ("confirm", "more"):
             return {
-                "confirmation_action": "confirm",
+                "confirmation_action": result.action,
             }
         # cancel: clear selected flight and set action so graph routes to END
         return {
             "confirmation_action": "cancel",
             "last_flight_search_result": None,
+            "flight_search_results": None,
             "messages": [
                 AIMessage(content="Booking cancelled. No flight was booked. Let me know if you'd like to search again.")
             ],
@@ -1,35 +1,45 @@
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import SystemMessage, AIMessage
+from langchain_core.messages import AIMessage
 
 from backend.nodes.base_node import BaseNode
+from backend.nodes.context_window import ContextWindow
 from backend.schema.models import FlightBookingPreferences, State
-from backend.util.prompt_loader import get_system_prompt
+from backend.util.prompt_loader import extraction_prompt_name
 
 
 class ExtractFlightPreferences(BaseNode):
-    def __init__(self, llm_client: BaseChatModel):
-        super().__init__(llm_client)
+    output_schemas = (FlightBookingPreferences,)
 
-    def __call__(self, state:State):
-        prompts = [
-            SystemMessage(content=get_system_prompt(state)),
-            *state.messages
-        ]
+    def __init__(self, llm_client: BaseChatModel, context_window: ContextWindow | None = None):
+        super().__init__(llm_client, context_window)
 
-        structured_llm = self._llm_client.with_structured_output(FlightBookingPreferences)
+    def __call__(self, state:State):
+        structured_llm = self._structured_llm(FlightBookingPreferences)
         try:
-            result: FlightBookingPreferences = structured_llm.invoke(prompts)
-
-            if not result.is_complete():
-                ai_message = self._build_error_message(result)
-                return {"flight_booking_preferences": result, "messages": [AIMessage(content=ai_message)]}
-            else:
-                ai_message = self._build_success_message(result)
-                return {"flight_booking_preferences": result, "messages": [AIMessage(content=ai_message)]}
+            result: FlightBookingPreferences = structured_llm.invoke(self._build_messages(state))
+        except Exception as e:
+            print("ACTUAL ERROR:", type(e), str(e))
+            raise
+        return self._handle_result(result)
 
+    async def acall(self, state: State) -> dict:
+        structured_llm = self._structured_llm(FlightBookingPreferences)
+        try:
+            result: FlightBookingPreferences = await structured_llm.ainvoke(self._build_messages(state))
         except Exception as e:
             print("ACTUAL ERROR:", type(e), str(e))
             raise
+        return self._handle_result(result)
+
+    def _build_messages(self, state: State) -> list:
+        return self._prompt_messages(extraction_prompt_name(state), state)
+
+    def _handle_result(self, result: FlightBookingPreferences) -> dict:
+        if not result.is_complete():
+            ai_message = self._build_error_message(result)
+            return {"flight_booking_preferences": result, "messages": [AIMessage(content=ai_message)]}
+        ai_message = self._build_success_message(result)
+        return {"flight_booking_preferences": result, "messages": [AIMessage(content=ai_message)]}
 
     def _build_error_message(self, preferences) -> str:
         if not preferences:
@@ -48,8 +58,8 @@ class ExtractFlightPreferences(BaseNode):
 
         if not preferences.destination:
             missing_fields.append("destination")
-        if not preferences.travel_dates and preferences.duration_days is None:
-            missing_fields.append("travel dates or duration")
+        if not preferences.travel_dates:
+            missing_fields.append("travel dates")
         if not preferences.origin:
             missing_fields.append("origin")
         if preferences.number_of_travelers is None:
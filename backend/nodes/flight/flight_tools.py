@@ -1,16 +1,26 @@
 from typing import Union
 
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool
 
 from backend.schema.models import FlightBookingPreferences
-from backend.service.FlightService import FlightService
+from backend.service.FlightService import get_flight_service
 from backend.service.models import FlightSearchRequest, FlightSearchResponse
 
 
-@tool(description="book flight api call")
-def book_flight(flight_payload: dict) -> dict:
-    flight_service = FlightService()
-    return flight_service.book_flight(flight_payload)
+def _book_flight(flight_payload: dict, idempotency_key: str | None = None) -> dict:
+    return get_flight_service().book_flight(flight_payload, idempotency_key)
+
+
+async def _abook_flight(flight_payload: dict, idempotency_key: str | None = None) -> dict:
+    return await get_flight_service().abook_flight(flight_payload, idempotency_key)
+
+
+book_flight = StructuredTool.from_function(
+    func=_book_flight,
+    coroutine=_abook_flight,
+    name="book_flight",
+    description="book flight api call",
+)
 
 
 def _to_flight_search_payload(preferences: Union[FlightBookingPreferences, dict]) -> FlightSearchRequest:
@@ -38,8 +48,17 @@ def _to_flight_search_payload(preferences: Union[FlightBookingPreferences, dict]
     )
 
 
-@tool(description="search flight api call")
-def search_flight(preferences: Union[FlightBookingPreferences, dict]) -> FlightSearchResponse:
-    flight_service = FlightService()
-    payload = _to_flight_search_payload(preferences)
-    return flight_service.search_flight(payload)
+def _search_flight(preferences: Union[FlightBookingPreferences, dict]) -> list[FlightSearchResponse]:
+    return get_flight_service().search_flight(_to_flight_search_payload(preferences))
+
+
+async def _asearch_flight(preferences: Union[FlightBookingPreferences, dict]) -> list[FlightSearchResponse]:
+    return await get_flight_service().asearch_flight(_to_flight_search_payload(preferences))
+
+
+search_flight = StructuredTool.from_function(
+    func=_search_flight,
+    coroutine=_asearch_flight,
+    name="search_flight",
+    description="search flight api call",
+)
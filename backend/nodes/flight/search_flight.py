@@ -3,15 +3,41 @@ from langchain_core.messages import AIMessage
 
 from backend.nodes.base_node import BaseNode
 from backend.nodes.flight.flight_tools import search_flight as search_flight_tool
-from backend.schema.models import FlightBookingPreferences, State
+from backend.schema.models import FlightBookingPreferences, FlightSearchResults, State
+from backend.service.ranking import rank_flights
+from backend.util.config_reader import get_flight_search_config
 
 
 class SearchFlight(BaseNode):
     def __init__(self, llm_client: BaseChatModel):
         super().__init__(llm_client)
+        self._max_results = get_flight_search_config()["max_results"]
 
     def __call__(self, state: State) -> dict:
         preferences = state.flight_booking_preferences
+        rejection = self._validate_preferences(preferences)
+        if rejection:
+            return rejection
+
+        try:
+            results = search_flight_tool.invoke({"preferences": preferences})
+        except Exception as e:
+            return self._search_failed(e)
+        return self._handle_result(results, preferences)
+
+    async def acall(self, state: State) -> dict:
+        preferences = state.flight_booking_preferences
+        rejection = self._validate_preferences(preferences)
+        if rejection:
+            return rejection
+
+        try:
+            results = await search_flight_tool.ainvoke({"preferences": preferences})
+        except Exception as e:
+            return self._search_failed(e)
+        return self._handle_result(results, preferences)
+
+    def _validate_preferences(self, preferences) -> dict | None:
         if not isinstance(preferences, FlightBookingPreferences):
             return {
                 "messages": [
@@ -30,34 +56,61 @@ class SearchFlight(BaseNode):
                     )
                 ]
             }
+        return None
 
+    def _search_failed(self, error: Exception) -> dict:
+        return {
+            "messages": [
+                AIMessage(
+                    content=f"Flight search failed: {error}. Please try again or check your preferences."
+                )
+            ]
+        }
+
+    def _handle_result(self, results, preferences: FlightBookingPreferences) -> dict:
         try:
-            result = search_flight_tool.invoke({"preferences": preferences})
-            ai_message = self._format_search_result(result)
-            flight_payload = self._flight_result_to_booking_payload(result)
-            return {
-                "messages": [AIMessage(content=ai_message)],
-                "last_flight_search_result": flight_payload,
-            }
+            flights = [self._flight_result_to_booking_payload(result) for result in results]
         except Exception as e:
+            return self._search_failed(e)
+        if not flights:
             return {
                 "messages": [
-                    AIMessage(
-                        content=f"Flight search failed: {e}. Please try again or check your preferences."
-                    )
+                    AIMessage(content="I couldn't find any flights for these preferences. Would you like to change them?")
                 ]
             }
+        # Keep the best max_results so later "more options" turns page locally instead of searching again
+        ranked = FlightSearchResults.from_flights(rank_flights(flights, preferences, k=self._max_results))
+        return {**self.offer_flight(ranked, 0), "flight_search_results": ranked}
+
+    def offer_flight(self, results: FlightSearchResults, offset: int) -> dict:
+        # Only the offered flight is expanded to a booking payload; the results stay as columns
+        flight = results.flight(offset)
+        return {
+            "messages": [AIMessage(content=self._format_search_result(flight, offset, len(results)))],
+            "last_flight_search_result": flight,
+            "flight_search_offset": offset,
+            "confirmation_action": None,
+        }
 
-    def _format_search_result(self, result) -> str:
+    def _format_search_result(self, flight: dict, offset: int, total: int) -> str:
+        if offset == 0:
+            heading = "Here’s a flight that matches your preferences:"
+        else:
+            heading = f"Here’s another option ({offset + 1} of {total}):"
+        follow_up = (
+            "Would you like me to proceed with booking this flight, or would you prefer that I explore more options for you?"
+            if offset + 1 < total
+            else "Would you like me to proceed with booking this flight?"
+        )
         lines = [
-            "Here’s a flight that matches your preferences:",
-            f"- **Airline:** {result.airline} ({result.flight_number})",
-            f"- **Route:** {result.origin} → {result.destination}",
-            f"- **Duration:** {result.duration_hours}h",
-            f"- **Cabin:** {result.cabin_class}",
-            f"- **Price:** ${result.price_usd:.2f} USD",
-            f"- **Stops:** {result.stops}",
-            "Would you like me to proceed with booking this flight, or would you prefer that I explore more options for you?",
+            heading,
+            f"- **Airline:** {flight['airline']} ({flight['flight_number']})",
+            f"- **Route:** {flight['origin']} → {flight['destination']}",
+            f"- **Duration:** {flight['duration_hours']}h",
+            f"- **Cabin:** {flight['cabin_class']}",
+            f"- **Price:** ${flight['price_usd']:.2f} USD",
+            f"- **Stops:** {flight['stops']}",
+            follow_up,
         ]
         return "\n".join(lines)
 
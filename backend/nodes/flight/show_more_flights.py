@@ -0,0 +1,26 @@
+from langchain_core.messages import AIMessage
+
+from backend.nodes.flight.search_flight import SearchFlight
+from backend.schema.models import State
+
+
+class ShowMoreFlights:
+    """Node that offers the next ranked flight from the stored search results, without searching again."""
+
+    def __init__(self, search_flight: SearchFlight):
+        self._search_flight = search_flight
+
+    def __call__(self, state: State) -> dict:
+        results = state.flight_search_results
+        offset = state.flight_search_offset + 1
+        if results is None or offset >= len(results):
+            return {
+                "confirmation_action": None,
+                "messages": [
+                    AIMessage(
+                        content=f"That was the last of the {len(results) if results else 0} options I found. "
+                        "Would you like to book the flight shown, or cancel?"
+                    )
+                ],
+            }
+        return self._search_flight.offer_flight(results, offset)
@@ -1,36 +1,45 @@
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import AIMessage, SystemMessage
+from langchain_core.messages import AIMessage
 
 from backend.nodes.base_node import BaseNode
-from backend.schema.models import ItineraryPreferences, State, IntentType
-from backend.util.prompt_loader import get_system_prompt
+from backend.nodes.context_window import ContextWindow
+from backend.schema.models import ItineraryPreferences, State
+from backend.util.prompt_loader import extraction_prompt_name
 
 
 class ExtractItineraryPreferences(BaseNode):
+    output_schemas = (ItineraryPreferences,)
 
-    def __init__(self, llm_client: BaseChatModel):
-        super().__init__(llm_client)
+    def __init__(self, llm_client: BaseChatModel, context_window: ContextWindow | None = None):
+        super().__init__(llm_client, context_window)
 
     def __call__(self, state: State) -> dict:
-        prompts = [
-            SystemMessage(content=get_system_prompt(state)),
-            *state.messages
-        ]
-
-        structured_llm = self._llm_client.with_structured_output(ItineraryPreferences)
+        structured_llm = self._structured_llm(ItineraryPreferences)
         try:
-            result: ItineraryPreferences = structured_llm.invoke(prompts)
-
-            if not result.is_complete():
-                ai_message = self._build_error_message(result)
-                return {"itinerary_preferences": result, "messages": [AIMessage(content=ai_message)]}
-            else:
-                ai_message = self._build_success_message(result)
-                return {"itinerary_preferences": result, "messages": [AIMessage(content=ai_message)]}
+            result: ItineraryPreferences = structured_llm.invoke(self._build_messages(state))
+        except Exception as e:
+            print("ACTUAL ERROR:", type(e), str(e))
+            raise
+        return self._handle_result(result)
 
+    async def acall(self, state: State) -> dict:
+        structured_llm = self._structured_llm(ItineraryPreferences)
+        try:
+            result: ItineraryPreferences = await structured_llm.ainvoke(self._build_messages(state))
         except Exception as e:
             print("ACTUAL ERROR:", type(e), str(e))
             raise
+        return self._handle_result(result)
+
+    def _build_messages(self, state: State) -> list:
+        return self._prompt_messages(extraction_prompt_name(state), state)
+
+    def _handle_result(self, result: ItineraryPreferences) -> dict:
+        if not result.is_complete():
+            ai_message = self._build_error_message(result)
+            return {"itinerary_preferences": result, "messages": [AIMessage(content=ai_message)]}
+        ai_message = self._build_success_message(result)
+        return {"itinerary_preferences": result, "messages": [AIMessage(content=ai_message)]}
 
     def _build_error_message(self, preferences) -> str:
         if not preferences:
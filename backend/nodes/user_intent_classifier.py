@@ -1,61 +1,101 @@
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import SystemMessage, AIMessage
+from langchain_core.messages import AIMessage, HumanMessage
 from pydantic import ValidationError
 
+from backend.classifier.model import IntentFastPath
 from backend.nodes.base_node import BaseNode
+from backend.nodes.context_window import ContextWindow
 from backend.schema.models import IntentOutput, State
-from backend.util.prompt_loader import get_prompt
 
 
 class UserIntentClassifier(BaseNode):
-    def __init__(self, llm_client: BaseChatModel):
-        super().__init__(llm_client)
-        self._extract_user_intent_prompt = get_prompt("understand_intent_system")
+    output_schemas = (IntentOutput,)
+
+    def __init__(
+        self,
+        llm_client: BaseChatModel,
+        fast_path: IntentFastPath | None = None,
+        context_window: ContextWindow | None = None,
+    ):
+        super().__init__(llm_client, context_window)
+        self._prompt_name = "understand_intent_system"
+        self._prompts.get(self._prompt_name)  # fail fast if the prompt is missing
+        self._fast_path = fast_path
 
     def __call__(self, state: State):
-        messages = [
-            SystemMessage(content=self._extract_user_intent_prompt),
-            *state.messages
-        ]
-        structured_llm = self._llm_client.with_structured_output(IntentOutput)
+        local_result = self._classify_locally(state)
+        if local_result is not None:
+            return self._handle_result(state, local_result)
+
+        structured_llm = self._structured_llm(IntentOutput)
+        try:
+            result: IntentOutput = structured_llm.invoke(self._build_messages(state))
+        except ValidationError:
+            return self._validation_failed(state)
+        except Exception as e:
+            print("ACTUAL ERROR:", type(e), str(e))
+            raise
+        return self._handle_result(state, result)
+
+    async def acall(self, state: State):
+        local_result = self._classify_locally(state)
+        if local_result is not None:
+            return self._handle_result(state, local_result)
 
+        structured_llm = self._structured_llm(IntentOutput)
         try:
-            result: IntentOutput = structured_llm.invoke(messages)
-            state.retry_count = state.retry_count + 1;
+            result: IntentOutput = await structured_llm.ainvoke(self._build_messages(state))
+        except ValidationError:
+            return self._validation_failed(state)
+        except Exception as e:
+            print("ACTUAL ERROR:", type(e), str(e))
+            raise
+        return self._handle_result(state, result)
+
+    def _classify_locally(self, state: State) -> IntentOutput | None:
+        # Only a brand-new session has a single self-contained message the local model can judge
+        if self._fast_path is None:
+            return None
+        user_messages = [m for m in state.messages if isinstance(m, HumanMessage)]
+        if len(user_messages) != 1 or not isinstance(user_messages[0].content, str):
+            return None
+        return self._fast_path.classify(user_messages[0].content)
 
-            if result.intent != "unknown" and result.confidence >= 0.6:
-                return {
-                    "intent": result.intent,
-                    "confidence": result.confidence,
-                    "reasoning": result.reasoning,
-                    "clarification_question": result.clarification_question,
-                }
+    def _build_messages(self, state: State) -> list:
+        return self._prompt_messages(self._prompt_name, state)
 
+    def _handle_result(self, state: State, result: IntentOutput) -> dict:
+        state.retry_count = state.retry_count + 1;
+
+        if result.intent != "unknown" and result.confidence >= 0.6:
             return {
-                "intent": "unknown",
+                "intent": result.intent,
                 "confidence": result.confidence,
                 "reasoning": result.reasoning,
-                "retry_count": state.retry_count,
-                "messages": [
-                    AIMessage(
-                        content="I'm having trouble understanding your request. "
-                                "Let's start fresh — could you describe your needs again?"
-                    )
-                ],
+                "clarification_question": result.clarification_question,
             }
 
-        except ValidationError:
-            return {
-                "intent": "unknown",
-                "confidence": 0.0,
-                "reasoning": "Structured output validation failed",
-                "clarification_question": "Could you clarify your request?",
-                "retry_count": state.retry_count + 1,
-                "messages": [
-                    AIMessage(content="Could you clarify your request?")
-                ],
-            }
+        return {
+            "intent": "unknown",
+            "confidence": result.confidence,
+            "reasoning": result.reasoning,
+            "retry_count": state.retry_count,
+            "messages": [
+                AIMessage(
+                    content="I'm having trouble understanding your request. "
+                            "Let's start fresh — could you describe your needs again?"
+                )
+            ],
+        }
 
-        except Exception as e:
-            print("ACTUAL ERROR:", type(e), str(e))
-            raise
+    def _validation_failed(self, state: State) -> dict:
+        return {
+            "intent": "unknown",
+            "confidence": 0.0,
+            "reasoning": "Structured output validation failed",
+            "clarification_question": "Could you clarify your request?",
+            "retry_count": state.retry_count + 1,
+            "messages": [
+                AIMessage(content="Could you clarify your request?")
+            ],
+        }
@@ -1,6 +1,6 @@
 from enum import Enum
 from typing import Annotated, Any, Dict, List, Literal, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 from langgraph.graph import add_messages
 from langchain_core.messages import BaseMessage
@@ -32,9 +32,9 @@ class IntentOutput(BaseModel):
 class UserConfirmationOutput(BaseModel):
     """User intent after seeing flight search results: confirm booking or cancel."""
 
-    action: Literal["confirm", "cancel"] = Field(
+    action: Literal["confirm", "more", "cancel"] = Field(
         ...,
-        description="'confirm' if user wants to book the flight, 'cancel' if user declines or wants to exit",
+        description="'confirm' if user wants to book the flight, 'more' if user wants to see other flight options, 'cancel' if user declines or wants to exit",
     )
 
 
@@ -93,6 +93,10 @@ class FlightBookingPreferences(BasePreferences):
         default=None,
         description="Number of travellers"
     )
+    sort_by: Optional[Literal["price", "duration", "stops"]] = Field(
+        default=None,
+        description="What the user prioritises when choosing a flight: price (cheapest), duration (fastest) or stops (direct/fewest stops)"
+    )
 
     def required_fields_missing(self) -> list[str]:
         missing = []
@@ -107,6 +111,78 @@ class FlightBookingPreferences(BasePreferences):
 
         return missing
 
+class IntentWithPreferencesOutput(BaseModel):
+    """Intent plus the intent-specific preferences, produced by a single LLM call for new sessions."""
+
+    intent: IntentType = None
+    confidence: float
+    reasoning: str
+    clarification_question: Optional[str] = None
+    flight_booking_preferences: Optional[FlightBookingPreferences] = Field(
+        default=None,
+        description="Only for intent flight_booking",
+    )
+    itinerary_preferences: Optional[ItineraryPreferences] = Field(
+        default=None,
+        description="Only for intent travel_planning",
+    )
+
+    def intent_output(self) -> IntentOutput:
+        return IntentOutput(
+            intent=self.intent,
+            confidence=self.confidence,
+            reasoning=self.reasoning,
+            clarification_question=self.clarification_question,
+        )
+
+
+class FlightSearchResults(BaseModel):
+    """Ranked search results kept in state as columns, best first; every result shares the searched route.
+
+    Checkpointed on every turn of the session, so it holds one list per field rather than
+    a booking payload per flight; ``flight(index)`` rebuilds the payload being offered.
+    """
+    origin: str
+    destination: str
+    id: List[str] = Field(default_factory=list)
+    airline: List[str] = Field(default_factory=list)
+    flight_number: List[str] = Field(default_factory=list)
+    departure_time: List[str] = Field(default_factory=list)
+    arrival_time: List[str] = Field(default_factory=list)
+    duration_hours: List[int] = Field(default_factory=list)
+    cabin_class: List[str] = Field(default_factory=list)
+    price_usd: List[float] = Field(default_factory=list)
+    stops: List[int] = Field(default_factory=list)
+
+    @classmethod
+    def from_flights(cls, flights: List[Dict[str, Any]]) -> "FlightSearchResults":
+        columns = {name: [flight[name] for flight in flights] for name in cls._per_flight_fields()}
+        return cls(origin=flights[0]["origin"], destination=flights[0]["destination"], **columns)
+
+    def flight(self, index: int) -> Dict[str, Any]:
+        """Booking payload of the result at ``index``."""
+        return {
+            "id": self.id[index],
+            "airline": self.airline[index],
+            "flight_number": self.flight_number[index],
+            "origin": self.origin,
+            "destination": self.destination,
+            "departure_time": self.departure_time[index],
+            "arrival_time": self.arrival_time[index],
+            "duration_hours": self.duration_hours[index],
+            "cabin_class": self.cabin_class[index],
+            "price_usd": self.price_usd[index],
+            "stops": self.stops[index],
+        }
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    @classmethod
+    def _per_flight_fields(cls) -> List[str]:
+        return [name for name in cls.model_fields if name not in ("origin", "destination")]
+
+
 class State(BaseModel):
     messages: Annotated[List[BaseMessage], add_messages] = Field(default_factory=list)
     session_id: Optional[str] = None
@@ -118,14 +194,31 @@ class State(BaseModel):
     clarification_question: Optional[str] = None
 
     retry_count: int = 0
+
+    # Rolling summary of messages that fell out of the prompt window; messages[:summarized_message_count] are folded in
+    conversation_summary: Optional[str] = None
+    summarized_message_count: int = 0
+
     flight_booking_preferences: FlightBookingPreferences = Field(default_factory=FlightBookingPreferences)
     itinerary_preferences: ItineraryPreferences = Field(default_factory=ItineraryPreferences)
 
     # After search_flight: selected flight for booking; cleared after book or cancel
     last_flight_search_result: Optional[Dict[str, Any]] = None
-    confirmation_action: Optional[Literal["confirm", "cancel"]] = None
+    confirmation_action: Optional[Literal["confirm", "more", "cancel"]] = None
+    # Ranked search results and the index of the one being offered; paged without a new search
+    flight_search_results: Optional[FlightSearchResults] = None
+    flight_search_offset: int = 0
 
     # Session-level: True once a flight has been successfully booked this session; prevents starting a new booking workflow
     flight_booked: bool = False
 
     model_config = {"arbitrary_types_allowed": True}
+
+    @field_validator("flight_search_results", mode="before")
+    @classmethod
+    def _compact_search_results(cls, value: Any) -> Any:
+        # Checkpoints written before results were kept as columns hold a list of booking payloads
+        if isinstance(value, list):
+            return FlightSearchResults.from_flights(value) if value else None
+        return value
+
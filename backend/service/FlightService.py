@@ -1,39 +1,219 @@
-import requests
-from langchain_core.messages.tool import tool_call
+import asyncio
+import random
+import threading
+import time
 
+import httpx
+
+from backend.instrumentation.metrics import registry
+from backend.instrumentation.timings import track_tool_call
 from backend.service.models import FlightSearchResponse, FlightSearchRequest
+from backend.service.search_cache import FlightSearchCache
+from backend.util.config_reader import get_flight_service_config
+
+registry.describe("agent_flight_service_retries_total", "counter", "Flight service requests retried, by operation and reason")
 
 
 class FlightService:
-    def __init__(self, base_url = "http://localhost:8080"):
-        self.base_url = base_url.rstrip("/")
+    """Client for the flight API backed by long-lived, pooled httpx clients.
+
+    The sync client serves the threadpool path, the async client the event-loop path;
+    both keep connections alive between tool calls. Transient failures (connection
+    errors, 5xx, and booking error codes listed in ``retryable_error_codes``) are
+    retried up to ``max_retries`` times with full-jitter exponential backoff. A
+    booking POST without an ``Idempotency-Key`` is only retried when the request provably
+    never reached the server; with one, the flight API answers a repeat with the stored result.
+    Searches go through ``search_cache`` when it is enabled.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        config: dict | None = None,
+        async_transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        config = config or get_flight_service_config()
+        self.base_url = (base_url or config["base_url"]).rstrip("/")
+        self._max_retries = config["max_retries"]
+        self._retry_backoff_seconds = config["retry_backoff_seconds"]
+        self._retryable_error_codes = set(config["retryable_error_codes"])
+        self._limits = httpx.Limits(
+            max_connections=config["max_connections"],
+            max_keepalive_connections=config["max_keepalive_connections"],
+            keepalive_expiry=config["keepalive_expiry"],
+        )
+        self._timeout = httpx.Timeout(config["read_timeout"], connect=config["connect_timeout"])
+        cache_config = config["search_cache"]
+        self.search_cache = (
+            FlightSearchCache(cache_config["ttl_seconds"], cache_config["stale_seconds"], cache_config["max_entries"])
+            if cache_config["enabled"]
+            else None
+        )
+        self._client: httpx.Client | None = None
+        # Bound to the event loop that first uses it; the app runs a single loop
+        self._async_client: httpx.AsyncClient | None = None
+        # e.g. httpx.ASGITransport to call the flight API app in-process
+        self._async_transport = async_transport
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = httpx.Client(base_url=self.base_url, limits=self._limits, timeout=self._timeout)
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            with self._lock:
+                if self._async_client is None:
+                    self._async_client = httpx.AsyncClient(
+                        base_url=self.base_url, limits=self._limits, timeout=self._timeout, transport=self._async_transport
+                    )
+        return self._async_client
 
     def search_flight(
         self,
         payload: FlightSearchRequest,
-    ) -> FlightSearchResponse:
-        response = requests.get(
-            f"{self.base_url}/flight-search",
-            params={
-                "origin": payload.origin,
-                "destination": payload.destination,
-                "passengers": payload.number_of_travelers,
-            },
-            timeout=10,
-        )
+    ) -> list[FlightSearchResponse]:
+        if self.search_cache is None:
+            return self._fetch_search(payload)
+        return self.search_cache.get_or_fetch(payload, lambda: self._fetch_search(payload))
 
-        response.raise_for_status()
+    async def asearch_flight(self, payload: FlightSearchRequest) -> list[FlightSearchResponse]:
+        if self.search_cache is None:
+            return await self._afetch_search(payload)
+        return await self.search_cache.aget_or_fetch(payload, lambda: self._afetch_search(payload))
 
-        data = response.json()
-        if "results" in data and data["results"]:
-            return FlightSearchResponse.model_validate(data["results"][0])
-        return FlightSearchResponse.model_validate(data)
+    def book_flight(self, payload: dict, idempotency_key: str | None = None) -> dict:
+        with track_tool_call("book_flight"):
+            return self._send("book_flight", "POST", "/book-flight", json=payload, headers=self._booking_headers(idempotency_key))
 
-    def book_flight(self, payload: dict) -> dict:
-        response = requests.post(
-            f"{self.base_url}/book-flight",
-            json=payload,
-            timeout=10,
-        )
-        response.raise_for_status()
-        return response.json()
+    async def abook_flight(self, payload: dict, idempotency_key: str | None = None) -> dict:
+        with track_tool_call("book_flight"):
+            return await self._asend(
+                "book_flight", "POST", "/book-flight", json=payload, headers=self._booking_headers(idempotency_key)
+            )
+
+    def _fetch_search(self, payload: FlightSearchRequest) -> list[FlightSearchResponse]:
+        with track_tool_call("search_flight"):
+            data = self._send("search_flight", "GET", "/flight-search", params=self._search_params(payload))
+        return self._search_results(data)
+
+    async def _afetch_search(self, payload: FlightSearchRequest) -> list[FlightSearchResponse]:
+        with track_tool_call("search_flight"):
+            data = await self._asend("search_flight", "GET", "/flight-search", params=self._search_params(payload))
+        return self._search_results(data)
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        self.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    def _send(self, operation: str, method: str, url: str, **kwargs) -> dict:
+        for attempt in range(self._max_retries + 1):
+            try:
+                response = self.client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if not self._retry_transport_error(operation, self._idempotent(method, kwargs), e, attempt):
+                    raise
+            else:
+                if not self._retry_response(operation, response, attempt):
+                    response.raise_for_status()
+                    return response.json()
+            time.sleep(self._backoff(attempt))
+
+    async def _asend(self, operation: str, method: str, url: str, **kwargs) -> dict:
+        for attempt in range(self._max_retries + 1):
+            try:
+                response = await self.async_client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if not self._retry_transport_error(operation, self._idempotent(method, kwargs), e, attempt):
+                    raise
+            else:
+                if not self._retry_response(operation, response, attempt):
+                    response.raise_for_status()
+                    return response.json()
+            await asyncio.sleep(self._backoff(attempt))
+
+    def _retry_transport_error(self, operation: str, idempotent: bool, error: httpx.TransportError, attempt: int) -> bool:
+        if attempt >= self._max_retries:
+            return False
+        # A POST that may have reached the server is only safe to repeat under an idempotency key
+        if not idempotent and not isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout)):
+            return False
+        registry.inc("agent_flight_service_retries_total", operation=operation, reason=type(error).__name__)
+        return True
+
+    def _retry_response(self, operation: str, response: httpx.Response, attempt: int) -> bool:
+        if attempt >= self._max_retries:
+            return False
+        if response.status_code >= 500:
+            reason = str(response.status_code)
+        elif response.is_success and (body := response.json()).get("error_code") in self._retryable_error_codes:
+            reason = body["error_code"]
+        else:
+            return False
+        registry.inc("agent_flight_service_retries_total", operation=operation, reason=reason)
+        return True
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, self._retry_backoff_seconds * 2 ** attempt)
+
+    @staticmethod
+    def _idempotent(method: str, kwargs: dict) -> bool:
+        return method == "GET" or "Idempotency-Key" in (kwargs.get("headers") or {})
+
+    @staticmethod
+    def _booking_headers(idempotency_key: str | None) -> dict:
+        return {"Idempotency-Key": idempotency_key} if idempotency_key else {}
+
+    @staticmethod
+    def _search_params(payload: FlightSearchRequest) -> dict:
+        return {
+            "origin": payload.origin,
+            "destination": payload.destination,
+            "passengers": payload.number_of_travelers,
+        }
+
+    @staticmethod
+    def _search_results(data: dict) -> list[FlightSearchResponse]:
+        if "results" in data:
+            return [FlightSearchResponse.model_validate(flight) for flight in data["results"]]
+        return [FlightSearchResponse.model_validate(data)]
+
+
+_flight_service: FlightService | None = None
+_flight_service_lock = threading.Lock()
+
+
+def get_flight_service() -> FlightService:
+    """Process-wide FlightService so every tool call reuses the same connection pools."""
+    global _flight_service
+    if _flight_service is None:
+        with _flight_service_lock:
+            if _flight_service is None:
+                _flight_service = FlightService()
+    return _flight_service
+
+
+def set_flight_service(service: FlightService | None) -> None:
+    """Replace the process-wide FlightService, e.g. with one bound to an in-process flight API."""
+    global _flight_service
+    with _flight_service_lock:
+        _flight_service = service
+
+
+async def aclose_flight_service() -> None:
+    global _flight_service
+    if _flight_service is not None:
+        await _flight_service.aclose()
+        _flight_service = None
@@ -0,0 +1,65 @@
+import numpy as np
+
+from backend.schema.models import FlightBookingPreferences
+
+# Weights for (price, duration, stops); keys match FlightBookingPreferences.sort_by
+RANKING_WEIGHTS = {
+    None: (0.5, 0.3, 0.2),
+    "price": (0.8, 0.1, 0.1),
+    "duration": (0.2, 0.6, 0.2),
+    "stops": (0.2, 0.2, 0.6),
+}
+
+
+def ranking_weights(preferences: FlightBookingPreferences | None) -> np.ndarray:
+    sort_by = preferences.sort_by if preferences is not None else None
+    return np.asarray(RANKING_WEIGHTS.get(sort_by, RANKING_WEIGHTS[None]), dtype=np.float64)
+
+
+def _normalise(columns: np.ndarray) -> np.ndarray:
+    low = columns.min(axis=0)
+    spread = columns.max(axis=0) - low
+    # A constant column (e.g. every fare non-stop) carries no signal
+    return np.divide(columns - low, spread, out=np.zeros_like(columns), where=spread > 0)
+
+
+def rank_fares(
+    prices: np.ndarray,
+    durations: np.ndarray,
+    stops: np.ndarray,
+    weights: np.ndarray,
+    k: int | None = None,
+) -> np.ndarray:
+    """Indices of the ``k`` best fares, best first; lower weighted min-max score is better.
+
+    Finds the k-th best score with ``argpartition`` and only sorts the selected fares,
+    so ranking stays O(n) in the result set size. Ties keep input order, including
+    which of the fares tied at the k-th score make the cut.
+    """
+    count = len(prices)
+    if count == 0:
+        return np.empty(0, dtype=np.intp)
+    columns = np.column_stack([prices, durations, stops]).astype(np.float64, copy=False)
+    scores = _normalise(columns) @ weights
+    k = count if k is None else min(k, count)
+    if k < count:
+        # argpartition puts an arbitrary member of a tie group at the boundary, so select by threshold
+        threshold = scores[np.argpartition(scores, k - 1)[k - 1]]
+        better = np.flatnonzero(scores < threshold)
+        candidates = np.concatenate([better, np.flatnonzero(scores == threshold)[: k - len(better)]])
+    else:
+        candidates = np.arange(count)
+    return candidates[np.lexsort((candidates, scores[candidates]))]
+
+
+def rank_flights(flights: list[dict], preferences: FlightBookingPreferences | None, k: int | None = None) -> list[dict]:
+    if not flights:
+        return []
+    order = rank_fares(
+        np.fromiter((f["price_usd"] for f in flights), dtype=np.float64, count=len(flights)),
+        np.fromiter((f["duration_hours"] for f in flights), dtype=np.float64, count=len(flights)),
+        np.fromiter((f["stops"] for f in flights), dtype=np.float64, count=len(flights)),
+        ranking_weights(preferences),
+        k,
+    )
+    return [flights[i] for i in order]
@@ -0,0 +1,165 @@
+import asyncio
+import contextvars
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Awaitable, Callable
+
+from backend.instrumentation.metrics import registry
+from backend.service.models import FlightSearchRequest, FlightSearchResponse
+
+registry.describe(
+    "agent_flight_search_cache_requests_total",
+    "counter",
+    "Flight searches by cache result: hit, stale (served while revalidating), coalesced (joined an in-flight call) or miss",
+)
+registry.describe("agent_flight_search_upstream_calls_total", "counter", "Flight searches sent to the flight API")
+registry.describe("agent_flight_search_upstream_saved_total", "counter", "Flight searches answered without their own upstream call")
+registry.describe("agent_flight_search_cache_hit_ratio", "gauge", "Share of flight searches answered without their own upstream call")
+
+SearchResults = list[FlightSearchResponse]
+
+
+def search_cache_key(request: FlightSearchRequest) -> str:
+    normalised = {
+        "origin": request.origin.strip().upper(),
+        "destination": request.destination.strip().upper(),
+        "number_of_travelers": request.number_of_travelers,
+    }
+    return json.dumps(normalised, sort_keys=True)
+
+
+class FlightSearchCache:
+    """TTL cache for flight searches with stale-while-revalidate and request coalescing.
+
+    An entry is fresh for ``ttl_seconds``; for ``stale_seconds`` after that it is still
+    served while one background call refreshes it. Concurrent misses for the same key
+    share a single upstream call. Sync and async callers coalesce separately because
+    they wait on different primitives. Failures are never cached.
+    """
+
+    def __init__(self, ttl_seconds: float, stale_seconds: float, max_entries: int, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, SearchResults]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: dict[str, Future] = {}
+        self._ainflight: dict[str, asyncio.Task] = {}
+        self._counts = {"hit": 0, "stale": 0, "coalesced": 0, "miss": 0}
+
+    def get_or_fetch(self, request: FlightSearchRequest, fetch: Callable[[], SearchResults]) -> SearchResults:
+        key = search_cache_key(request)
+        with self._lock:
+            state, results = self._lookup(key)
+            if state == "stale" and key not in self._inflight:
+                self._inflight[key] = Future()
+                threading.Thread(target=self._run, args=(key, fetch, True), daemon=True).start()
+            if results is not None:
+                self._record(state)
+                return results
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            self._record("miss" if leader else "coalesced")
+        if leader:
+            self._run(key, fetch)
+        return future.result()
+
+    async def aget_or_fetch(self, request: FlightSearchRequest, fetch: Callable[[], Awaitable[SearchResults]]) -> SearchResults:
+        key = search_cache_key(request)
+        with self._lock:
+            state, results = self._lookup(key)
+            task = self._ainflight.get(key)
+            if state == "stale" and task is None:
+                # Run in an empty context: the refresh outlives this turn, so its tool time must not count towards it
+                refresh = asyncio.get_running_loop().create_task(self._arun(key, fetch), context=contextvars.Context())
+                self._ainflight[key] = refresh
+                refresh.add_done_callback(_log_refresh_failure)
+            if results is not None:
+                self._record(state)
+                return results
+            if task is None:
+                task = self._ainflight[key] = asyncio.ensure_future(self._arun(key, fetch))
+                self._record("miss")
+            else:
+                self._record("coalesced")
+        # Shield so one cancelled caller does not cancel the call the others are waiting on
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = sum(self._counts.values())
+            saved = total - self._counts["miss"]
+            return {**self._counts, "upstream_saved": saved, "hit_ratio": saved / total if total else 0.0}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, key: str) -> tuple[str, SearchResults | None]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return "miss", None
+        age = self._clock() - entry[0]
+        if age < self.ttl_seconds:
+            self._entries.move_to_end(key)
+            return "hit", entry[1]
+        if age < self.ttl_seconds + self.stale_seconds:
+            return "stale", entry[1]
+        del self._entries[key]
+        return "miss", None
+
+    def _store(self, key: str, results: SearchResults) -> None:
+        self._entries[key] = (self._clock(), results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _run(self, key: str, fetch: Callable[[], SearchResults], background: bool = False) -> None:
+        future = self._inflight[key]
+        registry.inc("agent_flight_search_upstream_calls_total")
+        try:
+            results = fetch()
+        except Exception as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            if background:
+                print("ACTUAL ERROR:", type(e), str(e))
+            return
+        with self._lock:
+            self._store(key, results)
+            del self._inflight[key]
+        future.set_result(results)
+
+    async def _arun(self, key: str, fetch: Callable[[], Awaitable[SearchResults]]) -> SearchResults:
+        registry.inc("agent_flight_search_upstream_calls_total")
+        try:
+            results = await fetch()
+            with self._lock:
+                self._store(key, results)
+            return results
+        finally:
+            with self._lock:
+                self._ainflight.pop(key, None)
+
+    def _record(self, result: str) -> None:
+        # Called with self._lock held
+        self._counts[result] += 1
+        registry.inc("agent_flight_search_cache_requests_total", result=result)
+        if result != "miss":
+            registry.inc("agent_flight_search_upstream_saved_total")
+        total = sum(self._counts.values())
+        registry.set("agent_flight_search_cache_hit_ratio", (total - self._counts["miss"]) / total)
+
+
+def _log_refresh_failure(task: asyncio.Task) -> None:
+    # Background refreshes have no awaiting caller; keep the stale entry and report the failure
+    if not task.cancelled() and task.exception() is not None:
+        e = task.exception()
+        print("ACTUAL ERROR:", type(e), str(e))
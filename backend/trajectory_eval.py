@@ -0,0 +1,215 @@
+"""Run trajectory cases against the compiled graph in-process, many at a time.
+
+Cases are JSONL, one conversation per line::
+
+    {"id": "flight_new_user", "graph": "default",
+     "turns": [{"user_query": "Book a flight from London to Berlin on March 10 for 3 travelers.",
+                "expect": {"starts_with": ["returning_user_middleware"],
+                           "in_order": ["user_intent_classifier", "search_flight"]}}]}
+
+``expect`` may hold ``equals`` (the whole trajectory), ``starts_with`` (a prefix),
+``in_order`` (a subsequence) and ``excludes`` (nodes that must not run). ``graph``
+is ``default`` or ``combined``; cases for the other variant than
+``graph.combined_intent_extraction`` selects are skipped. Every case gets its own
+thread in one in-memory checkpointer, and at most ``--concurrency`` cases run at a
+time. Flight API calls go to the repo's flight router in-process unless
+``--flight-api-url`` is given. One result per case (status, latency, tokens,
+trajectories, failures) is written to ``--output``.
+
+    python -m backend.trajectory_eval --cases tests/cases/trajectories.jsonl --concurrency 16
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+DEFAULT_CASES_PATH = Path(__file__).resolve().parent.parent / "tests" / "cases" / "trajectories.jsonl"
+EXPECTATIONS = ("equals", "starts_with", "in_order", "excludes")
+
+
+@dataclass
+class CaseResult:
+    case_id: str
+    status: str  # "passed", "failed", "error" or "skipped"
+    latency_ms: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    trajectories: list[list[str]] = field(default_factory=list)
+    failures: list[str] = field(default_factory=list)
+
+
+def load_cases(path: Path) -> list[dict]:
+    cases = []
+    for line_number, line in enumerate(Path(path).read_text(encoding="utf-8").splitlines(), start=1):
+        if not line.strip():
+            continue
+        case = json.loads(line)
+        if not case.get("id") or not case.get("turns"):
+            raise ValueError(f"{path}:{line_number}: a case needs an id and at least one turn")
+        for turn in case["turns"]:
+            unknown = set(turn.get("expect", {})) - set(EXPECTATIONS)
+            if unknown:
+                raise ValueError(f"{path}:{line_number}: unknown expectation(s) {sorted(unknown)}")
+        cases.append(case)
+    return cases
+
+
+def check_trajectory(trajectory: list[str], expect: dict) -> list[str]:
+    """Returns a message per unmet expectation; empty when the trajectory matches."""
+    failures = []
+    if "equals" in expect and trajectory != expect["equals"]:
+        failures.append(f"expected {expect['equals']}, got {trajectory}")
+    prefix = expect.get("starts_with", [])
+    if trajectory[: len(prefix)] != prefix:
+        failures.append(f"expected to start with {prefix}, got {trajectory}")
+    remaining = iter(trajectory)
+    if not all(node in remaining for node in expect.get("in_order", [])):
+        failures.append(f"expected {expect['in_order']} in order, got {trajectory}")
+    unexpected = [node for node in expect.get("excludes", []) if node in trajectory]
+    if unexpected:
+        failures.append(f"expected no {unexpected}, got {trajectory}")
+    return failures
+
+
+def in_process_flight_service():
+    """FlightService that calls the flight API router through ASGI instead of over the network."""
+    import httpx
+    from fastapi import FastAPI
+
+    from backend.api.flight_controller import router as flight_router
+    from backend.service.FlightService import FlightService
+
+    app = FastAPI()
+    app.include_router(flight_router)
+    return FlightService(base_url="http://flight-api", async_transport=httpx.ASGITransport(app=app))
+
+
+class TrajectoryEvaluator:
+    """Runs cases concurrently on one agent; each case is a fresh conversation thread."""
+
+    def __init__(self, agent, concurrency: int = 8, turn_timeout_seconds: float = 60.0):
+        self.agent = agent
+        self.concurrency = concurrency
+        self.turn_timeout_seconds = turn_timeout_seconds
+        self.graph_variant = "combined" if agent.combined_intent_extraction else "default"
+
+    async def run(self, cases: list[dict]) -> list[CaseResult]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(case: dict) -> CaseResult:
+            async with semaphore:
+                return await self.run_case(case)
+
+        return await asyncio.gather(*(bounded(case) for case in cases))
+
+    async def run_case(self, case: dict) -> CaseResult:
+        result = CaseResult(case_id=case["id"], status="passed")
+        if case.get("graph", self.graph_variant) != self.graph_variant:
+            result.status = "skipped"
+            return result
+        session_id = str(uuid.uuid4())
+        started = time.perf_counter()
+        try:
+            for index, turn in enumerate(case["turns"]):
+                response = await asyncio.wait_for(
+                    self.agent.ainvoke(turn["user_query"], session_id), self.turn_timeout_seconds
+                )
+                result.trajectories.append(response["trajectory"])
+                for node in response["timings"].nodes:
+                    result.input_tokens += node.input_tokens
+                    result.output_tokens += node.output_tokens
+                result.failures += [f"turn {index + 1}: {failure}" for failure in check_trajectory(response["trajectory"], turn.get("expect", {}))]
+        except Exception as e:
+            result.status = "error"
+            result.failures.append(f"{type(e).__name__}: {e}")
+        result.latency_ms = (time.perf_counter() - started) * 1000
+        if result.status == "passed" and result.failures:
+            result.status = "failed"
+        return result
+
+
+def write_results(results: list[CaseResult], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        for result in results:
+            file.write(json.dumps(asdict(result)) + "\n")
+
+
+def summarize(results: list[CaseResult], seconds: float) -> str:
+    counts = {status: sum(r.status == status for r in results) for status in ("passed", "failed", "error", "skipped")}
+    ran = [r for r in results if r.status != "skipped"]
+    latencies = sorted(r.latency_ms for r in ran)
+    p95 = latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0
+    tokens = sum(r.input_tokens + r.output_tokens for r in ran)
+    return (
+        f"{len(results)} cases in {seconds:.1f}s: " + " ".join(f"{status}={count}" for status, count in counts.items())
+        + f" case p95={p95:.0f}ms tokens={tokens}"
+    )
+
+
+async def _amain(args: argparse.Namespace) -> int:
+    from backend.app_workflow import IntentClassifierAgent
+    from backend.checkpoint_manager import InMemoryCheckpointerManager
+    from backend.service.FlightService import aclose_flight_service, set_flight_service
+
+    if args.scripted:
+        from backend.llm.scripted import ScriptedChatModel
+
+        llm_client = ScriptedChatModel()
+    else:
+        from backend.llm.client import create_llm_client
+        from backend.llm.response_cache import create_response_cache
+        from backend.util.config_reader import _default_config_path, get_llm_cache_config
+
+        cache = None
+        if args.llm_cache:
+            # Reruns of a suite replay unchanged structured-output calls instead of paying for them again
+            cache = create_response_cache({**get_llm_cache_config(), "enabled": True}, _default_config_path().resolve().parent)
+        llm_client = create_llm_client(cache=cache)
+    if args.flight_api_url:
+        from backend.service.FlightService import FlightService
+
+        set_flight_service(FlightService(base_url=args.flight_api_url))
+    else:
+        set_flight_service(in_process_flight_service())
+
+    cases = load_cases(args.cases)
+    agent = IntentClassifierAgent(llm_client, InMemoryCheckpointerManager())
+    await agent.abuild_workflow()
+    started = time.perf_counter()
+    try:
+        results = await TrajectoryEvaluator(agent, args.concurrency, args.timeout).run(cases)
+    finally:
+        await agent.aclose()
+        await aclose_flight_service()
+    write_results(results, args.output)
+    for result in results:
+        if result.status in ("failed", "error"):
+            print(f"{result.status.upper()} {result.case_id}: " + "; ".join(result.failures))
+    print(summarize(results, time.perf_counter() - started))
+    print(f"Results written to {args.output}")
+    return 0 if all(r.status in ("passed", "skipped") for r in results) else 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=Path, default=DEFAULT_CASES_PATH)
+    parser.add_argument("--output", type=Path, default=Path(".cache/trajectory_eval_results.jsonl"))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds allowed per turn")
+    parser.add_argument("--scripted", action="store_true", help="Use the scripted chat model instead of the configured LLM")
+    parser.add_argument("--llm-cache", action="store_true", help="Use the llm.cache response cache even if it is disabled")
+    parser.add_argument("--flight-api-url", help="Call a running flight API instead of the in-process router")
+    args = parser.parse_args()
+    load_dotenv()
+    sys.exit(asyncio.run(_amain(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+from langgraph.checkpoint.serde.base import CipherProtocol, SerializerProtocol
+from langgraph.checkpoint.serde.encrypted import EncryptedSerializer
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+
+class ZstdCodec(CipherProtocol):
+    """zstd-compresses checkpoint blobs of at least ``min_bytes``; smaller ones are stored as is.
+
+    Plugged in through LangGraph's ``EncryptedSerializer`` so blobs are tagged by codec
+    (``msgpack+zstd``) and the msgpack allowlist keeps working. Blobs written before
+    compression was enabled carry no tag and still load.
+    """
+
+    def __init__(self, min_bytes: int = 1024, level: int = 3):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(
+                "zstandard is not installed. Install it with `pip install zstandard` or disable checkpoint.compression."
+            ) from None
+        self.min_bytes = min_bytes
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def encrypt(self, plaintext: bytes) -> tuple[str, bytes]:
+        if len(plaintext) < self.min_bytes:
+            return "raw", plaintext
+        return "zstd", self._compressor.compress(plaintext)
+
+    def decrypt(self, ciphername: str, ciphertext: bytes) -> bytes:
+        if ciphername == "raw":
+            return ciphertext
+        if ciphername != "zstd":
+            raise ValueError(f"Unsupported checkpoint codec: {ciphername}")
+        return self._decompressor.decompress(ciphertext)
+
+
+def create_checkpoint_serde(compression: dict) -> SerializerProtocol | None:
+    """Serializer for checkpoint blobs, or None for the saver's default."""
+    if not compression["enabled"]:
+        return None
+    return EncryptedSerializer(ZstdCodec(compression["min_bytes"], compression["level"]), JsonPlusSerializer())
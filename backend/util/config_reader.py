@@ -18,6 +18,9 @@ def read_config(path: Path | None = None) -> dict:
         return json.load(f)
 
 
+LLM_PROVIDERS = ("openrouter", "scripted")
+
+
 def get_llm_config(path: Path | None = None) -> dict:
     config = read_config(path)
     llm = config.get("llm") or {}
@@ -26,4 +29,267 @@ def get_llm_config(path: Path | None = None) -> dict:
         raise ValueError(
             "Config must contain llm.model_name"
         )
-    return {"model_name": model_name}
+    provider = os.getenv("LLM_PROVIDER") or llm.get("provider", "openrouter")
+    if provider not in LLM_PROVIDERS:
+        raise ValueError(f"llm.provider must be one of {', '.join(LLM_PROVIDERS)}")
+    scripted = llm.get("scripted") or {}
+    latency_seconds = float(os.getenv("LLM_SCRIPTED_LATENCY_SECONDS") or scripted.get("latency_seconds", 0.0))
+    seconds_per_1k_input_tokens = float(scripted.get("seconds_per_1k_input_tokens", 0.0))
+    if latency_seconds < 0 or seconds_per_1k_input_tokens < 0:
+        raise ValueError("llm.scripted latencies must be >= 0")
+    return {
+        "model_name": model_name,
+        "provider": provider,
+        "scripted": {
+            "latency_seconds": latency_seconds,
+            "seconds_per_1k_input_tokens": seconds_per_1k_input_tokens,
+            "fixtures_path": scripted.get("fixtures_path"),
+        },
+    }
+
+
+def get_llm_cache_config(path: Path | None = None) -> dict:
+    config = read_config(path)
+    cache = (config.get("llm") or {}).get("cache") or {}
+    # Off for live traffic; evals and benchmarks turn it on with LLM_CACHE_ENABLED
+    enabled = os.getenv("LLM_CACHE_ENABLED", str(cache.get("enabled", False))).lower() not in ("0", "false", "no")
+    return {
+        "enabled": enabled,
+        "max_entries": int(cache.get("max_entries", 1024)),
+        "ttl_seconds": float(cache.get("ttl_seconds", 86400)),
+        "sqlite_path": cache.get("sqlite_path"),
+        "sqlite_max_entries": int(cache.get("sqlite_max_entries", 100_000)),
+    }
+
+
+def get_llm_governor_config(path: Path | None = None) -> dict:
+    config = read_config(path)
+    governor = (config.get("llm") or {}).get("governor") or {}
+    limits = {
+        "requests_per_minute": float(governor.get("requests_per_minute", 500)),
+        "tokens_per_minute": float(governor.get("tokens_per_minute", 200_000)),
+        "max_concurrency": int(governor.get("max_concurrency", 16)),
+        "burst_seconds": float(governor.get("burst_seconds", 6)),
+    }
+    if any(value <= 0 for value in limits.values()):
+        raise ValueError("llm.governor limits must be > 0")
+    backoff = governor.get("backoff") or {}
+    return {
+        "enabled": bool(governor.get("enabled", True)),
+        **limits,
+        "expected_output_tokens": int(governor.get("expected_output_tokens", 300)),
+        "max_retries": int(governor.get("max_retries", 5)),
+        "backoff_initial_seconds": float(backoff.get("initial_seconds", 1.0)),
+        "backoff_max_seconds": float(backoff.get("max_seconds", 60.0)),
+        # Lower runs first; nodes not listed use default_priority
+        "priorities": {str(node): int(lane) for node, lane in (governor.get("priorities") or {}).items()},
+        "default_priority": int(governor.get("default_priority", 1)),
+    }
+
+
+def get_intent_fast_path_config(path: Path | None = None) -> dict:
+    config = read_config(path)
+    fast_path = config.get("intent_fast_path") or {}
+    threshold = float(fast_path.get("threshold", 0.9))
+    if not 0.0 < threshold <= 1.0:
+        raise ValueError("intent_fast_path.threshold must be in (0, 1]")
+    return {
+        "enabled": bool(fast_path.get("enabled", False)),
+        "threshold": threshold,
+        "weights_path": fast_path.get("weights_path"),
+    }
+
+
+def get_graph_config(path: Path | None = None) -> dict:
+    config = read_config(path)
+    graph = config.get("graph") or {}
+    return {
+        "combined_intent_extraction": bool(graph.get("combined_intent_extraction", False)),
+    }
+
+
+def get_context_config(path: Path | None = None) -> dict:
+    config = read_config(path)
+    context = config.get("context") or {}
+    max_turns = context.get("max_turns")
+    if max_turns is not None and int(max_turns) < 1:
+        raise ValueError("context.max_turns must be a positive integer or null")
+    return {
+        "max_turns": int(max_turns) if max_turns is not None else None,
+        "summary_max_chars": int(context.get("summary_max_chars", 2000)),
+    }
+
+
+def get_flight_service_config(path: Path | None = None) -> dict:
+    config = read_config(path)
+    service = config.get("flight_service") or {}
+    search_cache = service.get("search_cache") or {}
+    max_retries = int(service.get("max_retries", 2))
+    if max_retries < 0:
+        raise ValueError("flight_service.max_retries must be >= 0")
+    return {
+        "base_url": os.getenv("FLIGHT_SERVICE_URL") or service.get("base_url", "http://localhost:8080"),
+        "max_connections": int(service.get("max_connections", 20)),
+        "max_keepalive_connections": int(service.get("max_keepalive_connections", 10)),
+        "keepalive_expiry": float(service.get("keepalive_expiry", 30)),
+        "connect_timeout": float(service.get("connect_timeout", 2)),
+        "read_timeout": float(service.get("read_timeout", 10)),
+        "max_retries": max_retries,
+        "retry_backoff_seconds": float(service.get("retry_backoff_seconds", 0.2)),
+        "retryable_error_codes": list(service.get("retryable_error_codes", ["ERR_INVENTORY"])),
+        "search_cache": {
+            "enabled": bool(search_cache.get("enabled", False)),
+            "ttl_seconds": float(search_cache.get("ttl_seconds", 60)),
+            "stale_seconds": float(search_cache.get("stale_seconds", 240)),
+            "max_entries": int(search_cache.get("max_entries", 1024)),
+        },
+    }
+
+
+def get_flight_search_config(path: Path | None = None) -> dict:
+    config = read_config(path)
+    search = config.get("flight_search") or {}
+    max_results = int(search.get("max_results", 20))
+    if max_results < 1:
+        raise ValueError("flight_search.max_results must be >= 1")
+    return {"max_results": max_results}
+
+
+def get_flight_api_config(path: Path | None = None) -> dict:
+    config = read_config(path)
+    inventory = (config.get("flight_api") or {}).get("inventory") or {}
+    days = int(inventory.get("days", 180))
+    fares_per_day = int(inventory.get("fares_per_day", 100))
+    if days < 1 or fares_per_day < 1:
+        raise ValueError("flight_api.inventory.days and fares_per_day must be >= 1")
+    airports = [str(code).upper() for code in inventory.get("airports", ["JFK", "LHR", "DXB", "CDG", "SIN", "FRA", "DEL", "SFO"])]
+    if any(len(code) != 3 for code in airports):
+        raise ValueError("flight_api.inventory.airports must be 3-letter codes")
+    return {
+        "seed": int(inventory.get("seed", 42)),
+        "days": days,
+        "fares_per_day": fares_per_day,
+        "airports": airports,
+        "max_window_days": int(inventory.get("max_window_days", 31)),
+        "cached_buckets": int(inventory.get("cached_buckets", 4096)),
+    }
+
+
+def get_flight_booking_config(path: Path | None = None) -> dict:
+    config = read_config(path)
+    booking = (config.get("flight_api") or {}).get("booking") or {}
+    ttl_seconds = float(booking.get("idempotency_ttl_seconds", 86400))
+    max_entries = int(booking.get("idempotency_max_entries", 100_000))
+    if ttl_seconds <= 0 or max_entries < 1:
+        raise ValueError("flight_api.booking.idempotency_ttl_seconds and idempotency_max_entries must be positive")
+    failure_rate = float(booking.get("failure_rate", 0.5))
+    if not 0 <= failure_rate <= 1:
+        raise ValueError("flight_api.booking.failure_rate must be between 0 and 1")
+    return {"idempotency_ttl_seconds": ttl_seconds, "idempotency_max_entries": max_entries, "failure_rate": failure_rate}
+
+
+def get_prompts_config(path: Path | None = None) -> dict:
+    config = read_config(path)
+    prompts = config.get("prompts") or {}
+    return {
+        "hot_reload": bool(prompts.get("hot_reload", False)),
+        "poll_interval_seconds": float(prompts.get("poll_interval_seconds", 2)),
+    }
+
+
+CHECKPOINT_DURABILITY_MODES = ("sync", "async", "exit", "deferred")
+CHECKPOINT_BACKENDS = ("memory", "sqlite", "postgres")
+TURN_LOCK_POLICIES = ("wait", "reject")
+
+
+def get_checkpoint_config(path: Path | None = None) -> dict:
+    config = read_config(path)
+    checkpoint = config.get("checkpoint") or {}
+    durability = checkpoint.get("durability", "async")
+    if durability not in CHECKPOINT_DURABILITY_MODES:
+        raise ValueError(f"checkpoint.durability must be one of {', '.join(CHECKPOINT_DURABILITY_MODES)}")
+    backend = os.getenv("CHECKPOINT_BACKEND") or checkpoint.get("backend", "postgres")
+    if backend not in CHECKPOINT_BACKENDS:
+        raise ValueError(f"checkpoint.backend must be one of {', '.join(CHECKPOINT_BACKENDS)}")
+    postgres_pool_size = int(checkpoint.get("postgres_pool_size", 10))
+    if postgres_pool_size < 1:
+        raise ValueError("checkpoint.postgres_pool_size must be >= 1")
+    snapshot_every = int(checkpoint.get("snapshot_every", 20))
+    if snapshot_every < 1:
+        raise ValueError("checkpoint.snapshot_every must be >= 1")
+    compression = checkpoint.get("compression") or {}
+    level = int(compression.get("level", 3))
+    if not 1 <= level <= 22:
+        raise ValueError("checkpoint.compression.level must be between 1 and 22")
+    turn_lock = checkpoint.get("turn_lock") or {}
+    turn_lock_policy = os.getenv("TURN_LOCK_POLICY") or turn_lock.get("policy", "wait")
+    if turn_lock_policy not in TURN_LOCK_POLICIES:
+        raise ValueError(f"checkpoint.turn_lock.policy must be one of {', '.join(TURN_LOCK_POLICIES)}")
+    wait_timeout_seconds = float(turn_lock.get("wait_timeout_seconds", 30))
+    turn_lock_pool_size = int(turn_lock.get("postgres_pool_size", postgres_pool_size))
+    if wait_timeout_seconds < 0 or turn_lock_pool_size < 1:
+        raise ValueError("checkpoint.turn_lock.wait_timeout_seconds must be >= 0 and postgres_pool_size >= 1")
+    return {
+        "durability": durability,
+        "backend": backend,
+        "sqlite_path": os.getenv("CHECKPOINT_SQLITE_PATH") or checkpoint.get("sqlite_path", ".cache/checkpoints.sqlite"),
+        "postgres_pool_size": postgres_pool_size,
+        "message_deltas": bool(checkpoint.get("message_deltas", True)),
+        "snapshot_every": snapshot_every,
+        "compression": {
+            "enabled": bool(compression.get("enabled", False)),
+            "min_bytes": int(compression.get("min_bytes", 1024)),
+            "level": level,
+        },
+        "turn_lock": {
+            "policy": turn_lock_policy,
+            "wait_timeout_seconds": wait_timeout_seconds,
+            "postgres_pool_size": turn_lock_pool_size,
+        },
+    }
+
+
+def get_admission_config(path: Path | None = None) -> dict:
+    """Admission limits for /chat. On Postgres the in-flight limit defaults to, and never
+    exceeds, the checkpoint pool size, so admitted turns cannot starve each other of
+    connections; other backends default to 64."""
+    config = read_config(path)
+    admission = config.get("admission") or {}
+    enabled = os.getenv("ADMISSION_ENABLED", str(admission.get("enabled", True))).lower() not in ("0", "false", "no")
+    checkpoint = get_checkpoint_config(path)
+    postgres = checkpoint["backend"] == "postgres"
+    max_in_flight = int(admission.get("max_in_flight") or (checkpoint["postgres_pool_size"] if postgres else 64))
+    max_queue = int(admission.get("max_queue", 50))
+    queue_timeout_seconds = float(admission.get("queue_timeout_seconds", 10))
+    if max_in_flight < 1 or max_queue < 0 or queue_timeout_seconds <= 0:
+        raise ValueError("admission.max_in_flight must be >= 1, max_queue >= 0 and queue_timeout_seconds > 0")
+    return {
+        "enabled": enabled,
+        "max_in_flight": min(max_in_flight, checkpoint["postgres_pool_size"]) if postgres else max_in_flight,
+        "max_queue": max_queue,
+        "queue_timeout_seconds": queue_timeout_seconds,
+        "retry_after_seconds": max(1, int(admission.get("retry_after_seconds", 1))),
+    }
+
+
+def get_checkpoint_retention_config(path: Path | None = None) -> dict:
+    config = read_config(path)
+    retention = (config.get("checkpoint") or {}).get("retention") or {}
+    idle_seconds = float(retention.get("idle_seconds", 86400))
+    ttl_seconds = float(retention.get("ttl_seconds", 2592000))
+    if idle_seconds <= 0:
+        raise ValueError("checkpoint.retention.idle_seconds must be > 0")
+    if ttl_seconds and ttl_seconds < idle_seconds:
+        raise ValueError("checkpoint.retention.ttl_seconds must be 0 (keep forever) or >= idle_seconds")
+    batch_size = int(retention.get("batch_size", 200))
+    if batch_size < 1:
+        raise ValueError("checkpoint.retention.batch_size must be >= 1")
+    return {
+        "background": bool(retention.get("background", False)),
+        "interval_seconds": float(retention.get("interval_seconds", 3600)),
+        "idle_seconds": idle_seconds,
+        "ttl_seconds": ttl_seconds,
+        "batch_size": batch_size,
+        "pause_seconds": float(retention.get("pause_seconds", 0.1)),
+        "lock_timeout_ms": int(retention.get("lock_timeout_ms", 2000)),
+    }
@@ -0,0 +1,141 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from backend.instrumentation.metrics import registry
+from backend.util.delegating_checkpointer import DelegatingCheckpointSaver
+
+registry.describe("agent_checkpoint_deferred_failures_total", "counter", "Deferred checkpoint writes that failed in the background")
+
+
+def _thread_id(config) -> str:
+    return str(config["configurable"]["thread_id"])
+
+
+def _saved_config(config, checkpoint) -> dict:
+    return {
+        "configurable": {
+            "thread_id": config["configurable"]["thread_id"],
+            "checkpoint_ns": config["configurable"].get("checkpoint_ns", ""),
+            "checkpoint_id": checkpoint["id"],
+        }
+    }
+
+
+def _log_failure(error: BaseException) -> None:
+    registry.inc("agent_checkpoint_deferred_failures_total")
+    print("ACTUAL ERROR:", type(error), str(error))
+
+
+class DeferredCheckpointSaver(DelegatingCheckpointSaver):
+    """Acknowledges checkpoint writes at once and persists them in the background.
+
+    Writes for a thread are applied in order, and reads of a thread wait for its pending
+    writes, so the next turn of a session always sees the previous one from this process.
+    A crash loses writes not yet flushed. Call ``flush``/``aflush`` before closing the
+    underlying saver.
+    """
+
+    def __init__(self, saver):
+        super().__init__(saver)
+        # One worker keeps sync writes in submission order
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint-writer")
+        self._pending: dict[str, Future] = {}
+        self._apending: dict[str, asyncio.Task] = {}
+
+    # Sync path
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        self._submit(config, self.saver.put, config, checkpoint, metadata, new_versions)
+        return _saved_config(config, checkpoint)
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        self._submit(config, self.saver.put_writes, config, list(writes), task_id, task_path)
+
+    def get_tuple(self, config):
+        self._wait(config)
+        return super().get_tuple(config)
+
+    def list(self, config, **kwargs):
+        if config is not None:
+            self._wait(config)
+        return super().list(config, **kwargs)
+
+    def get_delta_channel_history(self, *, config, channels):
+        self._wait(config)
+        return super().get_delta_channel_history(config=config, channels=channels)
+
+    def delete_thread(self, thread_id):
+        self._wait({"configurable": {"thread_id": thread_id}})
+        return super().delete_thread(thread_id)
+
+    def flush(self) -> None:
+        for future in list(self._pending.values()):
+            future.exception()
+
+    def _submit(self, config, method, *args) -> None:
+        thread_id = _thread_id(config)
+        future = self._executor.submit(method, *args)
+        self._pending[thread_id] = future
+        future.add_done_callback(lambda f: self._written(self._pending, thread_id, f))
+
+    def _wait(self, config) -> None:
+        future = self._pending.get(_thread_id(config))
+        if future is not None:
+            future.exception()  # waits; a failure was already reported
+
+    # Async path
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        self._schedule(config, self.saver.aput, config, checkpoint, metadata, new_versions)
+        return _saved_config(config, checkpoint)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        self._schedule(config, self.saver.aput_writes, config, list(writes), task_id, task_path)
+
+    async def aget_tuple(self, config):
+        await self._await(config)
+        return await super().aget_tuple(config)
+
+    async def alist(self, config, **kwargs):
+        if config is not None:
+            await self._await(config)
+        async for item in super().alist(config, **kwargs):
+            yield item
+
+    async def aget_delta_channel_history(self, *, config, channels):
+        await self._await(config)
+        return await super().aget_delta_channel_history(config=config, channels=channels)
+
+    async def adelete_thread(self, thread_id):
+        await self._await({"configurable": {"thread_id": thread_id}})
+        return await super().adelete_thread(thread_id)
+
+    async def aflush(self) -> None:
+        await asyncio.gather(*self._apending.values(), return_exceptions=True)
+        await asyncio.to_thread(self.flush)
+
+    def _schedule(self, config, method, *args) -> None:
+        thread_id = _thread_id(config)
+        previous = self._apending.get(thread_id)
+
+        async def write():
+            if previous is not None:
+                # Its failure is reported by its own callback; later writes still go ahead
+                await asyncio.gather(previous, return_exceptions=True)
+            await method(*args)
+
+        task = asyncio.ensure_future(write())
+        self._apending[thread_id] = task
+        task.add_done_callback(lambda t: self._written(self._apending, thread_id, t))
+
+    async def _await(self, config) -> None:
+        task = self._apending.get(_thread_id(config))
+        if task is not None:
+            await asyncio.gather(asyncio.shield(task), return_exceptions=True)
+
+    @staticmethod
+    def _written(pending: dict, thread_id: str, future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            _log_failure(future.exception())
+        if pending.get(thread_id) is future:
+            del pending[thread_id]
@@ -0,0 +1,249 @@
+import threading
+from collections import OrderedDict
+
+from langchain_core.messages import BaseMessage
+from pydantic import BaseModel
+
+from backend.util.delegating_checkpointer import DelegatingCheckpointSaver
+
+# Marks a stored ``messages`` value as "messages of checkpoint ``base`` + ``appended``"
+DELTA_MARKER = "__message_delta__"
+
+
+def compact_model_channels(schema: type[BaseModel]) -> dict[str, type[BaseModel]]:
+    """State fields holding a pydantic model, which are stored as plain dicts."""
+    return {
+        name: field.annotation
+        for name, field in schema.model_fields.items()
+        if isinstance(field.annotation, type) and issubclass(field.annotation, BaseModel)
+    }
+
+
+def is_message_delta(value) -> bool:
+    return isinstance(value, dict) and DELTA_MARKER in value
+
+
+class _ThreadHead:
+    """Last checkpoint written or read for a thread, with its resolved messages."""
+
+    __slots__ = ("checkpoint_id", "messages", "stored", "depth")
+
+    def __init__(self, checkpoint_id: str, messages: list[BaseMessage], stored, depth: int):
+        self.checkpoint_id = checkpoint_id
+        self.messages = messages
+        self.stored = stored
+        self.depth = depth
+
+
+class MessageDeltaCheckpointSaver(DelegatingCheckpointSaver):
+    """Stores ``messages`` append-only and pydantic model channels as compact dicts.
+
+    A checkpoint whose messages extend its parent's stores only the new messages and a
+    reference to the parent, instead of the whole history. Every ``snapshot_every`` deltas,
+    or when history was rewritten, the full list is stored again, which bounds the number
+    of ancestors read to resume a thread. The last checkpoint of recently used threads is
+    kept resolved in memory so the next turn reads no ancestors.
+
+    Deltas depend on their ancestors: pruning a thread must keep (or first snapshot) the
+    checkpoints its latest one refers to.
+    """
+
+    def __init__(self, saver, model_channels: dict[str, type[BaseModel]], snapshot_every: int = 20, max_threads: int = 1024):
+        super().__init__(saver)
+        self.model_channels = model_channels
+        self.snapshot_every = snapshot_every
+        self.max_threads = max_threads
+        self._heads: OrderedDict[tuple[str, str], _ThreadHead] = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Sync path
+
+    def get_tuple(self, config):
+        checkpoint_tuple = self.saver.get_tuple(config)
+        if checkpoint_tuple is None:
+            return None
+        messages, depth = self._resolve(checkpoint_tuple)
+        self._remember_read(checkpoint_tuple, messages, depth)
+        return self._decode(checkpoint_tuple, messages)
+
+    def list(self, config, **kwargs):
+        for checkpoint_tuple in self.saver.list(config, **kwargs):
+            yield self._decode(checkpoint_tuple, self._resolve(checkpoint_tuple)[0])
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        return self.saver.put(config, self._encode(config, checkpoint, new_versions), metadata, new_versions)
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        return self.saver.put_writes(config, self._compact_writes(writes), task_id, task_path)
+
+    def _resolve(self, checkpoint_tuple):
+        chain = []
+        while True:
+            head = self._known_head(checkpoint_tuple)
+            if head is not None:
+                resolved, depth = head.messages, head.depth
+                break
+            value = checkpoint_tuple.checkpoint["channel_values"].get("messages")
+            if not is_message_delta(value):
+                resolved, depth = value, 0
+                break
+            chain.append(value)
+            checkpoint_tuple = self._base(checkpoint_tuple, self.saver.get_tuple(self._base_config(checkpoint_tuple, value)))
+        return self._replay(resolved, chain), depth + len(chain)
+
+    # Async path
+
+    async def aget_tuple(self, config):
+        checkpoint_tuple = await self.saver.aget_tuple(config)
+        if checkpoint_tuple is None:
+            return None
+        messages, depth = await self._aresolve(checkpoint_tuple)
+        self._remember_read(checkpoint_tuple, messages, depth)
+        return self._decode(checkpoint_tuple, messages)
+
+    async def alist(self, config, **kwargs):
+        async for checkpoint_tuple in self.saver.alist(config, **kwargs):
+            yield self._decode(checkpoint_tuple, (await self._aresolve(checkpoint_tuple))[0])
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await self.saver.aput(config, self._encode(config, checkpoint, new_versions), metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        return await self.saver.aput_writes(config, self._compact_writes(writes), task_id, task_path)
+
+    async def _aresolve(self, checkpoint_tuple):
+        chain = []
+        while True:
+            head = self._known_head(checkpoint_tuple)
+            if head is not None:
+                resolved, depth = head.messages, head.depth
+                break
+            value = checkpoint_tuple.checkpoint["channel_values"].get("messages")
+            if not is_message_delta(value):
+                resolved, depth = value, 0
+                break
+            chain.append(value)
+            base = await self.saver.aget_tuple(self._base_config(checkpoint_tuple, value))
+            checkpoint_tuple = self._base(checkpoint_tuple, base)
+        return self._replay(resolved, chain), depth + len(chain)
+
+    # Encoding
+
+    def _encode(self, config, checkpoint, new_versions):
+        values = dict(checkpoint["channel_values"])
+        for channel in self.model_channels:
+            if isinstance(values.get(channel), BaseModel):
+                values[channel] = values[channel].model_dump(mode="json", exclude_defaults=True)
+        messages = values.get("messages")
+        if isinstance(messages, list):
+            values["messages"] = self._encode_messages(config, checkpoint["id"], messages, "messages" in new_versions)
+        return {**checkpoint, "channel_values": values}
+
+    def _encode_messages(self, config, checkpoint_id: str, messages, changed: bool):
+        key = self._key(config)
+        parent_id = config["configurable"].get("checkpoint_id")
+        with self._lock:
+            head = self._heads.get(key)
+        if head is None or head.checkpoint_id != parent_id:
+            stored, depth = messages, 0
+        elif not changed:
+            # Same value as the parent: reuse its stored form so the chain does not grow
+            stored, depth = head.stored, head.depth
+        elif head.depth < self.snapshot_every and self._extends(head.messages, messages):
+            stored = {DELTA_MARKER: 1, "base": parent_id, "appended": messages[len(head.messages):]}
+            depth = head.depth + 1
+        else:
+            stored, depth = messages, 0
+        self._remember(key, _ThreadHead(checkpoint_id, list(messages), stored, depth))
+        return stored
+
+    def _compact_writes(self, writes):
+        return [
+            (channel, value.model_dump(mode="json", exclude_defaults=True))
+            if channel in self.model_channels and isinstance(value, BaseModel)
+            else (channel, value)
+            for channel, value in writes
+        ]
+
+    @staticmethod
+    def _extends(previous, messages) -> bool:
+        if len(messages) < len(previous):
+            return False
+        return all(old is new or old == new for old, new in zip(previous, messages))
+
+    # Decoding
+
+    def _decode(self, checkpoint_tuple, messages):
+        values = dict(checkpoint_tuple.checkpoint["channel_values"])
+        for channel, model in self.model_channels.items():
+            if isinstance(values.get(channel), dict):
+                values[channel] = model.model_validate(values[channel])
+        if messages is not None:
+            values["messages"] = messages
+        pending_writes = checkpoint_tuple.pending_writes
+        if pending_writes:
+            pending_writes = [
+                (task_id, channel, self.model_channels[channel].model_validate(value))
+                if channel in self.model_channels and isinstance(value, dict)
+                else (task_id, channel, value)
+                for task_id, channel, value in pending_writes
+            ]
+        return checkpoint_tuple._replace(
+            checkpoint={**checkpoint_tuple.checkpoint, "channel_values": values}, pending_writes=pending_writes
+        )
+
+    def _known_head(self, checkpoint_tuple) -> _ThreadHead | None:
+        with self._lock:
+            head = self._heads.get(self._key(checkpoint_tuple.config))
+        if head is not None and head.checkpoint_id == checkpoint_tuple.config["configurable"]["checkpoint_id"]:
+            return head
+        return None
+
+    def _remember_read(self, checkpoint_tuple, messages, depth: int) -> None:
+        # The checkpoint read is usually the parent of the next write; keep it so that write can be a delta
+        if messages is None or self._known_head(checkpoint_tuple) is not None:
+            return
+        stored = checkpoint_tuple.checkpoint["channel_values"].get("messages")
+        checkpoint_id = checkpoint_tuple.config["configurable"]["checkpoint_id"]
+        self._remember(self._key(checkpoint_tuple.config), _ThreadHead(checkpoint_id, messages, stored, depth))
+
+    def _replay(self, messages, chain):
+        if messages is None:
+            return None
+        messages = list(messages)
+        for delta in reversed(chain):
+            messages.extend(delta["appended"])
+        return messages
+
+    @staticmethod
+    def _base_config(checkpoint_tuple, delta) -> dict:
+        configurable = checkpoint_tuple.config["configurable"]
+        return {
+            "configurable": {
+                "thread_id": configurable["thread_id"],
+                "checkpoint_ns": configurable.get("checkpoint_ns", ""),
+                "checkpoint_id": delta["base"],
+            }
+        }
+
+    @staticmethod
+    def _base(checkpoint_tuple, base):
+        if base is None:
+            configurable = checkpoint_tuple.config["configurable"]
+            raise RuntimeError(
+                f"Checkpoint {configurable['checkpoint_id']} of thread {configurable['thread_id']} "
+                "refers to a message history that is no longer stored"
+            )
+        return base
+
+    @staticmethod
+    def _key(config) -> tuple[str, str]:
+        configurable = config["configurable"]
+        return str(configurable["thread_id"]), configurable.get("checkpoint_ns", "")
+
+    def _remember(self, key, head: _ThreadHead) -> None:
+        with self._lock:
+            self._heads[key] = head
+            self._heads.move_to_end(key)
+            while len(self._heads) > self.max_threads:
+                self._heads.popitem(last=False)
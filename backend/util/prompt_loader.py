@@ -1,30 +1,20 @@
-from pathlib import Path
-
 from backend.schema.models import State, IntentType
-
-
-def _prompts_dir() -> Path:
-    return Path(__file__).resolve().parent.parent / "prompts"
+from backend.util.prompt_registry import get_prompt_registry
 
 
 def get_prompt(name: str) -> str:
-    path = _prompts_dir() / f"{name}.txt"
-    if not path.is_file():
-        raise FileNotFoundError(f"Prompt file not found: {path}")
-    return path.read_text(encoding="utf-8").strip()
+    return get_prompt_registry().get(name).text
 
 
-def get_system_prompt(state: State) -> str:
+def extraction_prompt_name(state: State) -> str:
     match state.intent:
-        case IntentType.TRAVEL_PLANNING:
-            return get_prompt(
-                f"{state.intent.value}/extract_preferences"
-            )
-        case IntentType.FLIGHT_BOOKING:
-            return get_prompt(
-                f"{state.intent.value}/extract_preferences"
-            )
+        case IntentType.TRAVEL_PLANNING | IntentType.FLIGHT_BOOKING:
+            return f"{state.intent.value}/extract_preferences"
         case _:
             raise ValueError(
                 f"No extraction prompt for intent: {state.intent}"
             )
+
+
+def get_system_prompt(state: State) -> str:
+    return get_prompt(extraction_prompt_name(state))
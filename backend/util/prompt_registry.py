@@ -0,0 +1,141 @@
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from langchain_core.messages import SystemMessage
+
+from backend.instrumentation.metrics import registry as metrics
+from backend.util.config_reader import get_prompts_config
+
+metrics.describe("agent_prompt_info", "gauge", "Loaded prompt versions (content hash), one series per prompt")
+
+
+def _prompts_dir() -> Path:
+    return Path(__file__).resolve().parent.parent / "prompts"
+
+
+@dataclass(frozen=True)
+class Prompt:
+    name: str
+    text: str
+    version: str
+    system_message: SystemMessage = field(compare=False)
+
+    @classmethod
+    def from_text(cls, name: str, text: str) -> "Prompt":
+        version = hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+        return cls(name=name, text=text, version=version, system_message=SystemMessage(content=text))
+
+
+class PromptRegistry:
+    """All prompts under ``backend/prompts`` loaded once, validated and hashed.
+
+    Prompts are addressed by their path without ``.txt`` (``flight_booking/extract_preferences``).
+    Each carries a prebuilt ``SystemMessage`` and a content hash; ``version`` hashes the
+    whole set. ``start_watching`` polls the tree and swaps in a reloaded set when files
+    change; a set that fails validation is rejected and the current one kept.
+    """
+
+    def __init__(self, prompts_dir: Path | None = None):
+        self.prompts_dir = prompts_dir or _prompts_dir()
+        self._prompts: dict[str, Prompt] = {}
+        self._snapshot: dict[str, tuple[int, int]] = {}
+        self._watcher: threading.Thread | None = None
+        self._stop = threading.Event()
+        self.reload()
+
+    @property
+    def version(self) -> str:
+        digest = hashlib.sha256()
+        for name, prompt in sorted(self._prompts.items()):
+            digest.update(f"{name}:{prompt.version}\n".encode("utf-8"))
+        return digest.hexdigest()[:12]
+
+    def get(self, name: str) -> Prompt:
+        prompt = self._prompts.get(name)
+        if prompt is None:
+            raise FileNotFoundError(f"Prompt not found: {self.prompts_dir / name}.txt")
+        return prompt
+
+    def versions(self) -> dict[str, str]:
+        return {name: prompt.version for name, prompt in sorted(self._prompts.items())}
+
+    def reload(self) -> None:
+        snapshot = self._scan()
+        prompts = {}
+        for name in snapshot:
+            path = self.prompts_dir / f"{name}.txt"
+            try:
+                text = path.read_text(encoding="utf-8").strip()
+            except UnicodeDecodeError as e:
+                raise ValueError(f"Prompt is not valid UTF-8: {path}") from e
+            if not text:
+                raise ValueError(f"Prompt is empty: {path}")
+            prompts[name] = Prompt.from_text(name, text)
+        if not prompts:
+            raise FileNotFoundError(f"No prompts found in {self.prompts_dir}")
+        for name, old in self._prompts.items():
+            if name not in prompts or prompts[name].version != old.version:
+                metrics.set("agent_prompt_info", 0, prompt=name, version=old.version)
+        self._prompts, self._snapshot = prompts, snapshot
+        for prompt in prompts.values():
+            metrics.set("agent_prompt_info", 1, prompt=prompt.name, version=prompt.version)
+
+    def start_watching(self, poll_interval_seconds: float) -> None:
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(poll_interval_seconds,), daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        if self._watcher is None:
+            return
+        self._stop.set()
+        self._watcher.join()
+        self._watcher = None
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        snapshot = {}
+        for path in sorted(self.prompts_dir.rglob("*.txt")):
+            stat = path.stat()
+            snapshot[path.relative_to(self.prompts_dir).with_suffix("").as_posix()] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _watch(self, poll_interval_seconds: float) -> None:
+        while not self._stop.wait(poll_interval_seconds):
+            try:
+                snapshot = self._scan()
+                if snapshot == self._snapshot:
+                    continue
+                self.reload()
+                print(f"Reloaded prompts (version {self.version})")
+            except Exception as e:
+                # Keep serving the current prompts; retry once the files change again
+                self._snapshot = snapshot
+                print("ACTUAL ERROR:", type(e), str(e))
+
+
+_prompt_registry: PromptRegistry | None = None
+_prompt_registry_lock = threading.Lock()
+
+
+def get_prompt_registry() -> PromptRegistry:
+    global _prompt_registry
+    if _prompt_registry is None:
+        with _prompt_registry_lock:
+            if _prompt_registry is None:
+                _prompt_registry = PromptRegistry()
+    return _prompt_registry
+
+
+def start_prompt_hot_reload() -> None:
+    config = get_prompts_config()
+    if config["hot_reload"]:
+        get_prompt_registry().start_watching(config["poll_interval_seconds"])
+
+
+def stop_prompt_hot_reload() -> None:
+    if _prompt_registry is not None:
+        _prompt_registry.stop_watching()
@@ -0,0 +1,177 @@
+"""One turn at a time per conversation thread.
+
+Two overlapping turns on one ``thread_id`` would both read the same checkpoint and
+write diverging children, dropping one turn's state. A turn lock serialises turns
+per thread while turns of different threads run fully in parallel. ``policy``
+decides what a second turn does while one is running: ``wait`` queues it (FIFO, up
+to ``wait_timeout_seconds``), ``reject`` fails it at once. Either way a turn that
+does not get the lock raises ``TurnInProgress``.
+
+``InProcessTurnLock`` covers a single worker. ``PostgresTurnLock`` also takes a
+Postgres session advisory lock on the thread, so turns are serialised across
+workers and hosts sharing the checkpoint database; Postgres releases it by itself if
+the worker dies.
+"""
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+from backend.instrumentation.metrics import registry
+from backend.util.config_reader import TURN_LOCK_POLICIES
+
+registry.describe("agent_turn_lock_wait_seconds", "summary", "Time a turn waited for its thread's turn lock")
+registry.describe("agent_turn_lock_busy_total", "counter", "Turns refused because another turn held their thread, by policy")
+
+
+class TurnInProgress(RuntimeError):
+    """Another turn of the same thread holds the lock and this one may not wait (longer) for it."""
+
+    def __init__(self, thread_id: str, policy: str):
+        super().__init__(f"Another turn of session {thread_id} is still running")
+        self.thread_id = thread_id
+        self.policy = policy
+
+
+class InProcessTurnLock:
+    """Per-thread locks in this process. Entries exist only while a turn holds or awaits them.
+
+    The sync (``hold``) and async (``ahold``) paths keep separate tables; a process
+    serves turns through one of them.
+    """
+
+    def __init__(self, policy: str = "wait", wait_timeout_seconds: float = 30.0):
+        if policy not in TURN_LOCK_POLICIES:
+            raise ValueError(f"turn lock policy must be one of {', '.join(TURN_LOCK_POLICIES)}")
+        self.policy = policy
+        self.wait_timeout_seconds = wait_timeout_seconds
+        # thread_id -> [lock, turns holding or waiting]
+        self._locks: dict[str, list] = {}
+        self._async_locks: dict[str, list] = {}
+        self._table_lock = threading.Lock()
+
+    @contextmanager
+    def hold(self, thread_id: str):
+        with self._table_lock:
+            entry = self._locks.setdefault(thread_id, [threading.Lock(), 0])
+            entry[1] += 1
+        started = time.perf_counter()
+        try:
+            if self.policy == "reject":
+                acquired = entry[0].acquire(blocking=False)
+            else:
+                acquired = entry[0].acquire(timeout=self.wait_timeout_seconds)
+            if not acquired:
+                raise self._busy(thread_id)
+            registry.observe("agent_turn_lock_wait_seconds", time.perf_counter() - started)
+            try:
+                yield
+            finally:
+                entry[0].release()
+        finally:
+            with self._table_lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[thread_id]
+
+    @asynccontextmanager
+    async def ahold(self, thread_id: str):
+        # Only touched from the event loop, so the table needs no lock
+        entry = self._async_locks.setdefault(thread_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        started = time.perf_counter()
+        try:
+            if self.policy == "reject" and entry[0].locked():
+                raise self._busy(thread_id)
+            if not entry[0].locked():
+                await entry[0].acquire()
+            else:
+                try:
+                    await asyncio.wait_for(entry[0].acquire(), self.wait_timeout_seconds)
+                except asyncio.TimeoutError:
+                    raise self._busy(thread_id) from None
+            registry.observe("agent_turn_lock_wait_seconds", time.perf_counter() - started)
+            try:
+                yield
+            finally:
+                entry[0].release()
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._async_locks[thread_id]
+
+    async def aopen(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+    def _busy(self, thread_id: str) -> TurnInProgress:
+        registry.inc("agent_turn_lock_busy_total", policy=self.policy)
+        return TurnInProgress(thread_id, self.policy)
+
+
+class PostgresTurnLock(InProcessTurnLock):
+    """Serialises turns across workers with Postgres session advisory locks.
+
+    A turn first takes the in-process lock, so turns queued in this worker do not tie
+    up connections, then holds a connection from a small dedicated pool for as long as
+    it holds the advisory lock. The pool is separate from the checkpointer's so held
+    locks can never starve checkpoint writes; its size caps this worker's concurrent
+    turns. The sync path (``hold``) is in-process only.
+    """
+
+    def __init__(self, conn_info: str, pool_size: int = 10, policy: str = "wait", wait_timeout_seconds: float = 30.0):
+        super().__init__(policy, wait_timeout_seconds)
+        self.conn_info = conn_info
+        self.pool_size = pool_size
+        self._pool = None
+
+    async def aopen(self) -> None:
+        from psycopg_pool import AsyncConnectionPool
+
+        self._pool = AsyncConnectionPool(
+            conninfo=self.conn_info, max_size=self.pool_size, open=False, timeout=5, kwargs={"autocommit": True}
+        )
+        await self._pool.open()
+
+    async def aclose(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    @asynccontextmanager
+    async def ahold(self, thread_id: str):
+        started = time.perf_counter()
+        async with super().ahold(thread_id):
+            remaining = max(0.0, self.wait_timeout_seconds - (time.perf_counter() - started))
+            async with self._pool.connection(timeout=max(remaining, 1.0)) as conn:
+                if not await self._advisory_lock(conn, thread_id, remaining):
+                    raise self._busy(thread_id)
+                try:
+                    yield
+                finally:
+                    try:
+                        await conn.execute("SELECT pg_advisory_unlock(hashtextextended(%s, 0))", (self._key(thread_id),))
+                    except Exception as e:
+                        # A broken connection has ended its session, which released the lock
+                        print("ACTUAL ERROR:", type(e), str(e))
+
+    async def _advisory_lock(self, conn, thread_id: str, timeout_seconds: float) -> bool:
+        from psycopg.errors import LockNotAvailable
+
+        key = self._key(thread_id)
+        if self.policy == "reject":
+            cursor = await conn.execute("SELECT pg_try_advisory_lock(hashtextextended(%s, 0))", (key,))
+            return (await cursor.fetchone())[0]
+        # lock_timeout bounds the wait for advisory locks too; 0 would mean forever
+        await conn.execute("SELECT set_config('lock_timeout', %s, false)", (f"{max(1, int(timeout_seconds * 1000))}ms",))
+        try:
+            await conn.execute("SELECT pg_advisory_lock(hashtextextended(%s, 0))", (key,))
+        except LockNotAvailable:
+            return False
+        return True
+
+    @staticmethod
+    def _key(thread_id: str) -> str:
+        return f"agent-turn:{thread_id}"
@@ -0,0 +1,81 @@
+"""Concurrent-session throughput of the sync (threadpool) and async /chat paths.
+
+Runs ``--sessions`` first turns concurrently against the compiled graph with a
+scripted LLM that sleeps ``--latency`` seconds per call. The sync path is driven
+from a threadpool the size of Starlette's default (40 workers), the async path
+from a single event loop.
+
+    python -m benchmarks.bench_async_chat --sessions 200 --latency 1.0
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.app_workflow import IntentClassifierAgent
+from backend.checkpoint_manager import InMemoryCheckpointerManager
+from backend.llm.scripted import ScriptedChatModel
+
+QUERY = "Book a flight from JFK to LHR for 2"
+STARLETTE_THREADPOOL_SIZE = 40
+
+
+def _build_agent(latency: float) -> IntentClassifierAgent:
+    agent = IntentClassifierAgent(
+        llm_client=ScriptedChatModel(latency_seconds=latency),
+        checkpointer_manager=InMemoryCheckpointerManager(),
+    )
+    agent.build_workflow()
+    return agent
+
+
+def _report(label: str, latencies: list[float], elapsed: float) -> None:
+    latencies = sorted(latencies)
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+    print(
+        f"{label:<6} sessions={len(latencies):<5} wall={elapsed:7.2f}s "
+        f"throughput={len(latencies) / elapsed:8.1f} turns/s "
+        f"p50={statistics.median(latencies) * 1000:7.0f}ms p95={p95 * 1000:7.0f}ms"
+    )
+
+
+def run_sync(agent: IntentClassifierAgent, sessions: int) -> None:
+    def turn(_):
+        started = time.perf_counter()
+        agent.invoke(QUERY, str(uuid.uuid4()))
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=STARLETTE_THREADPOOL_SIZE) as pool:
+        latencies = list(pool.map(turn, range(sessions)))
+    _report("sync", latencies, time.perf_counter() - started)
+
+
+async def run_async(agent: IntentClassifierAgent, sessions: int) -> None:
+    await agent.abuild_workflow()
+
+    async def turn():
+        started = time.perf_counter()
+        await agent.ainvoke(QUERY, str(uuid.uuid4()))
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(turn() for _ in range(sessions)))
+    _report("async", list(latencies), time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=1.0, help="Simulated seconds per LLM call")
+    args = parser.parse_args()
+
+    agent = _build_agent(args.latency)
+    run_sync(agent, args.sessions)
+    asyncio.run(run_async(agent, args.sessions))
+
+
+if __name__ == "__main__":
+    main()
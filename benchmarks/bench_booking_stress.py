@@ -0,0 +1,91 @@
+"""Concurrent /book-flight stress test: many bookers on one fare, no overbooking allowed.
+
+Sends ``--bookings`` requests for the same fare with ``--concurrency`` in flight to the
+flight router in-process behind ``httpx.ASGITransport``. A ``--duplicates`` share of
+them repeat an earlier request's ``Idempotency-Key``, as retries would. Random
+upstream failures are switched off so every outcome comes from the seat ledger.
+Prints throughput and checks that seats sold never exceed the fare's seats and
+that every repeated key got the original result.
+
+    python -m benchmarks.bench_booking_stress --bookings 1000 --concurrency 64
+"""
+import argparse
+import asyncio
+import datetime as dt
+import random
+import time
+
+import httpx
+from fastapi import FastAPI
+
+import backend.api.booking_ledger as booking_ledger
+from backend.api.booking_ledger import BookingLedger
+from backend.api.fare_inventory import get_fare_inventory
+from backend.api.flight_controller import router as flight_router
+
+
+def _fare() -> dict:
+    inventory = get_fare_inventory()
+    origin, destination = inventory.core_routes[0]
+    day = dt.date.today() + dt.timedelta(days=1)
+    fares, _ = inventory.search(origin, destination, day, day, limit=1000)
+    return max(inventory.to_flights(fares), key=lambda flight: inventory.seats(flight["id"]))
+
+
+async def run(bookings: int, concurrency: int, duplicates: float, seed: int) -> bool:
+    ledger = booking_ledger._booking_ledger = BookingLedger(failure_rate=0)
+    fare = _fare()
+    seats = get_fare_inventory().seats(fare["id"])
+    rng = random.Random(seed)
+    keys, passengers = [], {}
+    for i in range(bookings):
+        if keys and rng.random() < duplicates:
+            keys.append(rng.choice(keys))
+        else:
+            keys.append(f"booking-{i}")
+            passengers[keys[-1]] = rng.randint(1, 3)
+    # A repeated key carries the same payload it was first sent with
+    payloads = [{**fare, "passengers": passengers[key]} for key in keys]
+
+    app = FastAPI()
+    app.include_router(flight_router)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(client: httpx.AsyncClient, key: str, payload: dict) -> dict:
+        async with semaphore:
+            response = await client.post("/book-flight", json=payload, headers={"Idempotency-Key": key})
+            response.raise_for_status()
+            return response.json()
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://flight-api") as client:
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one(client, key, payload) for key, payload in zip(keys, payloads)))
+        elapsed = time.perf_counter() - started
+
+    first_result: dict[str, dict] = {}
+    mismatched = sum(first_result.setdefault(key, result) != result for key, result in zip(keys, results))
+    confirmed = {r["confirmation_number"]: r["passengers"] for r in results if r["booking_status"]}
+    sold = ledger.seats_sold(fare["id"])
+    ok = sold == sum(confirmed.values()) <= seats and mismatched == 0
+    print(
+        f"fare={fare['id']} seats={seats} requests={bookings} unique_keys={len(first_result)} "
+        f"confirmed={len(confirmed)} seats_sold={sold} sold_out={sum(not r['booking_status'] for r in results)} "
+        f"replay_mismatches={mismatched} wall={elapsed:.2f}s throughput={bookings / elapsed:,.0f} bookings/s "
+        f"{'OK' if ok else 'OVERBOOKED OR INCONSISTENT'}"
+    )
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bookings", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duplicates", type=float, default=0.2, help="Share of requests that reuse an earlier key")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if not asyncio.run(run(args.bookings, args.concurrency, args.duplicates, args.seed)):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
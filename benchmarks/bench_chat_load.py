@@ -0,0 +1,96 @@
+"""Load test of POST /chat: turns/second and latency percentiles with the scripted LLM.
+
+``--users`` simulated users each hold a ``--turns``-turn conversation and send the
+next turn as soon as the previous answer arrives. By default the FastAPI app runs
+in-process behind ``httpx.ASGITransport`` (lifespan included) with
+``LLM_PROVIDER=scripted``, ``--latency`` seconds per LLM call
+(``LLM_SCRIPTED_LATENCY_SECONDS``) and the in-memory checkpointer. ``--url``
+instead targets a running server; start it with the same environment variables to
+keep it hermetic.
+
+    python -m benchmarks.bench_chat_load --users 50 --turns 4 --latency 0.2
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+import uuid
+from contextlib import asynccontextmanager
+
+import httpx
+
+CONVERSATION = [
+    "Book a flight from JFK to LHR on Mar 3 for 2",
+    "Can you show me other options?",
+    "Show me another one",
+    "Plan a 5-day trip to Tokyo in April",
+]
+
+
+@asynccontextmanager
+async def _in_process_client(latency: float):
+    # Same switches a deployment would use to run hermetically
+    os.environ.update(LLM_PROVIDER="scripted", LLM_SCRIPTED_LATENCY_SECONDS=str(latency), CHECKPOINT_BACKEND="memory")
+    from backend.main import app
+    from backend.service.FlightService import set_flight_service
+    from backend.trajectory_eval import in_process_flight_service
+
+    set_flight_service(in_process_flight_service())
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://chat-api", timeout=120) as client:
+            yield client
+
+
+async def _user(client: httpx.AsyncClient, turns: int, latencies: list[float], errors: list[str]) -> None:
+    session_id = str(uuid.uuid4())
+    for turn in range(turns):
+        started = time.perf_counter()
+        try:
+            response = await client.post("/chat", json={"user_query": CONVERSATION[turn % len(CONVERSATION)], "session_id": session_id})
+            response.raise_for_status()
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+            return
+        latencies.append(time.perf_counter() - started)
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    return values[int(fraction * (len(values) - 1))]
+
+
+async def run(users: int, turns: int, latency: float, url: str | None) -> None:
+    if url:
+        client_context = httpx.AsyncClient(base_url=url, timeout=120, limits=httpx.Limits(max_connections=users))
+    else:
+        client_context = _in_process_client(latency)
+    latencies: list[float] = []
+    errors: list[str] = []
+    async with client_context as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(_user(client, turns, latencies, errors) for _ in range(users)))
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    if latencies:
+        print(
+            f"users={users} turns={len(latencies)} errors={len(errors)} wall={elapsed:6.2f}s "
+            f"throughput={len(latencies) / elapsed:7.1f} turns/s p50={statistics.median(latencies) * 1000:6.0f}ms "
+            f"p95={_percentile(latencies, 0.95) * 1000:6.0f}ms p99={_percentile(latencies, 0.99) * 1000:6.0f}ms"
+        )
+    for error in errors[:5]:
+        print("ERROR", error)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=4, help="Turns per user conversation")
+    parser.add_argument("--latency", type=float, default=0.2, help="Scripted LLM seconds per call (in-process only)")
+    parser.add_argument("--url", help="Base URL of a running API instead of the in-process app")
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.turns, args.latency, args.url))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Overload test of POST /chat: latency of served turns with and without admission control.
+
+Requests arrive open-loop at ``--rate`` per second for ``--seconds``, each a new
+session, whatever the server's progress; pick a rate above what one process serves
+(see ``bench_chat_load``). The app runs in-process with the scripted LLM, as in
+``bench_chat_load``. The run is repeated with admission control off and on
+(``--max-in-flight``, ``--max-queue``, ``--queue-timeout``). Without it every
+request is let in and latency grows for as long as the overload lasts; with it the
+excess is shed at once with 503 and served turns keep a stable p99.
+
+    python -m benchmarks.bench_chat_overload --rate 200 --seconds 10
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+import backend.api.admission as admission
+from backend.api.admission import AdmissionController
+from benchmarks.bench_chat_load import _in_process_client, _percentile
+
+QUERY = "Book a flight from JFK to LHR on Mar 3 for 2"
+
+
+async def _request(
+    client: httpx.AsyncClient, scheduled: float, latencies: list[float], statuses: dict[int, int], shed: list[float]
+) -> None:
+    try:
+        response = await client.post("/chat", json={"user_query": QUERY, "session_id": str(uuid.uuid4())})
+        status = response.status_code
+    except Exception:
+        status = 0
+    # From the scheduled send time, so a client held up by the busy event loop still counts
+    elapsed = time.perf_counter() - scheduled
+    statuses[status] = statuses.get(status, 0) + 1
+    (latencies if status == 200 else shed).append(elapsed)
+
+
+async def _run(client: httpx.AsyncClient, rate: float, seconds: float, label: str) -> None:
+    latencies: list[float] = []
+    shed: list[float] = []
+    statuses: dict[int, int] = {}
+    requests = []
+    started = time.perf_counter()
+    for index in range(int(rate * seconds)):
+        # Open loop: send on schedule whether or not earlier requests have finished
+        scheduled = started + index / rate
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        requests.append(asyncio.create_task(_request(client, scheduled, latencies, statuses, shed)))
+    await asyncio.gather(*requests)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    served = (
+        f"p50={statistics.median(latencies) * 1000:6.0f}ms p99={_percentile(latencies, 0.99) * 1000:6.0f}ms "
+        f"max={latencies[-1] * 1000:6.0f}ms"
+        if latencies else "none served"
+    )
+    shed_ms = f" shed p99={_percentile(sorted(shed), 0.99) * 1000:.0f}ms" if shed else ""
+    print(
+        f"{label:<14} statuses={dict(sorted(statuses.items()))} goodput={len(latencies) / elapsed:6.1f} turns/s "
+        f"wall={elapsed:5.1f}s served {served}{shed_ms}"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    async with _in_process_client(args.latency) as client:
+        # Warm up so both runs start from a built graph and a measured turn duration
+        await asyncio.gather(*(client.post("/chat", json={"user_query": QUERY, "session_id": str(uuid.uuid4())}) for _ in range(8)))
+        admission._admission_controller = AdmissionController(args.max_in_flight, enabled=False)
+        await _run(client, args.rate, args.seconds, "no admission")
+        admission._admission_controller = AdmissionController(args.max_in_flight, args.max_queue, args.queue_timeout)
+        await _run(client, args.rate, args.seconds, "admission")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=200, help="Requests per second")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--latency", type=float, default=0.2, help="Scripted LLM seconds per call")
+    parser.add_argument("--max-in-flight", type=int, default=64)
+    parser.add_argument("--max-queue", type=int, default=64)
+    parser.add_argument("--queue-timeout", type=float, default=2.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
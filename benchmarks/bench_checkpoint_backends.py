@@ -0,0 +1,72 @@
+"""Per-turn checkpoint cost of each checkpointer backend.
+
+Runs ``--sessions`` three-turn flight conversations on the async path against the
+in-memory, SQLite (WAL, in a temporary directory) and, when ``POSTGRES_URI`` is set,
+Postgres backends, and reports the checkpoint read/write time recorded per turn.
+
+    python -m benchmarks.bench_checkpoint_backends --sessions 50 --durability async
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import uuid
+from pathlib import Path
+
+from backend.app_workflow import IntentClassifierAgent
+from backend.checkpoint_manager import (
+    CheckpointerManager,
+    InMemoryCheckpointerManager,
+    PostgresCheckpointerManager,
+    SqliteCheckpointerManager,
+)
+from backend.llm.scripted import ScriptedChatModel
+from backend.util.config_reader import CHECKPOINT_DURABILITY_MODES
+from benchmarks.bench_checkpoint_durability import TURNS
+
+
+async def run(label: str, manager: CheckpointerManager, sessions: int) -> None:
+    agent = IntentClassifierAgent(llm_client=ScriptedChatModel(), checkpointer_manager=manager)
+    await agent.abuild_workflow()
+
+    checkpoint_ms, totals_ms, writes = [], [], 0
+    for _ in range(sessions):
+        session_id = str(uuid.uuid4())
+        for query in TURNS:
+            timings = (await agent.ainvoke(query, session_id))["timings"]
+            checkpoint_ms.append(timings.checkpoint_read_ms + timings.checkpoint_write_ms)
+            totals_ms.append(timings.total_ms)
+            writes += timings.checkpoint_writes
+    await agent.aclose()
+
+    checkpoint_ms.sort()
+    p95 = checkpoint_ms[int(0.95 * (len(checkpoint_ms) - 1))]
+    print(
+        f"{label:<9} writes/turn={writes / len(checkpoint_ms):5.1f} "
+        f"checkpoint p50={statistics.median(checkpoint_ms):6.2f}ms p95={p95:6.2f}ms "
+        f"turn p50={statistics.median(totals_ms):6.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--durability", choices=CHECKPOINT_DURABILITY_MODES, default="async")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        managers = {
+            "memory": InMemoryCheckpointerManager(args.durability),
+            "sqlite": SqliteCheckpointerManager(str(Path(directory) / "checkpoints.sqlite"), args.durability),
+        }
+        if os.getenv("POSTGRES_URI"):
+            managers["postgres"] = PostgresCheckpointerManager(os.getenv("POSTGRES_URI"), durability=args.durability)
+        else:
+            print("POSTGRES_URI not set; skipping postgres")
+        for label, manager in managers.items():
+            asyncio.run(run(label, manager, args.sessions))
+
+
+if __name__ == "__main__":
+    main()
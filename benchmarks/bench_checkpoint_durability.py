@@ -0,0 +1,92 @@
+"""Checkpoint writes per turn and turn latency for each ``checkpoint.durability`` mode.
+
+Runs ``--sessions`` three-turn flight conversations on the async path against an
+in-memory saver that sleeps ``--write-ms`` per write and ``--read-ms`` per read to stand
+in for Postgres round trips, and counts the writes that reach it.
+
+    python -m benchmarks.bench_checkpoint_durability --sessions 50 --write-ms 3
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from backend.app_workflow import IntentClassifierAgent
+from backend.checkpoint_manager import InMemoryCheckpointerManager
+from backend.llm.scripted import ScriptedChatModel
+from backend.util.config_reader import CHECKPOINT_DURABILITY_MODES
+from backend.util.delegating_checkpointer import DelegatingCheckpointSaver
+
+TURNS = [
+    "Book a flight from JFK to LHR",
+    "It's for 2 travellers",
+    "What about flying from JFK to CDG instead, for 2?",
+]
+
+
+class _SlowSaver(DelegatingCheckpointSaver):
+    """In-memory saver with simulated database round trips; counts backend writes."""
+
+    def __init__(self, read_seconds: float, write_seconds: float):
+        super().__init__(InMemorySaver())
+        self.read_seconds = read_seconds
+        self.write_seconds = write_seconds
+        self.writes = 0
+
+    async def aget_tuple(self, config):
+        await asyncio.sleep(self.read_seconds)
+        return await super().aget_tuple(config)
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        self.writes += 1
+        await asyncio.sleep(self.write_seconds)
+        return await super().aput(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        self.writes += 1
+        await asyncio.sleep(self.write_seconds)
+        return await super().aput_writes(config, writes, task_id, task_path)
+
+
+async def run(durability: str, sessions: int, read_seconds: float, write_seconds: float) -> None:
+    saver = _SlowSaver(read_seconds, write_seconds)
+    agent = IntentClassifierAgent(
+        llm_client=ScriptedChatModel(),
+        checkpointer_manager=InMemoryCheckpointerManager(durability, saver_factory=lambda: saver),
+    )
+    await agent.abuild_workflow()
+
+    latencies = []
+    for _ in range(sessions):
+        session_id = str(uuid.uuid4())
+        for query in TURNS:
+            started = time.perf_counter()
+            await agent.ainvoke(query, session_id)
+            latencies.append(time.perf_counter() - started)
+    await agent.aclose()
+    await asyncio.sleep(write_seconds * 4)  # let deferred writes land before counting
+
+    latencies.sort()
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+    print(
+        f"{durability:<9} writes/turn={saver.writes / len(latencies):5.1f} "
+        f"p50={statistics.median(latencies) * 1000:6.1f}ms p95={p95 * 1000:6.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--read-ms", type=float, default=1.0)
+    parser.add_argument("--write-ms", type=float, default=3.0)
+    args = parser.parse_args()
+
+    for durability in CHECKPOINT_DURABILITY_MODES:
+        asyncio.run(run(durability, args.sessions, args.read_ms / 1000, args.write_ms / 1000))
+
+
+if __name__ == "__main__":
+    main()
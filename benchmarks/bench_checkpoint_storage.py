@@ -0,0 +1,132 @@
+"""Checkpoint bytes written per turn and thread resume time, full history vs message deltas.
+
+Writes ``--sessions`` synthetic ``--turns``-turn conversations (one checkpoint per turn,
+as with ``durability: exit``) straight to a saver, counting the bytes its serializer
+produces, then times resuming each thread from a cold process (no cached heads).
+``--backend memory`` stores one blob per changed channel like Postgres; ``sqlite``
+stores the whole checkpoint per write.
+
+    python -m benchmarks.bench_checkpoint_storage --turns 100 --sessions 20
+"""
+import argparse
+import sqlite3
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.base.id import uuid6
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from backend.schema.models import FlightBookingPreferences, State
+from backend.util.checkpoint_serde import create_checkpoint_serde
+from backend.util.message_delta_checkpointer import MessageDeltaCheckpointSaver, compact_model_channels
+
+USER_TEXT = "I'd like to fly from JFK to LHR next Friday with my partner, preferably a morning departure. "
+ASSISTANT_TEXT = (
+    "Here is the best option I found: BA 178 departing JFK at 08:15 and arriving LHR at 20:05, "
+    "one stop, 2 travellers, total 1,240 USD. Reply 'book' to confirm, 'more' for other options "
+    "or 'cancel' to stop. "
+)
+
+
+class _CountingSerde:
+    def __init__(self, serde):
+        self.serde = serde
+        self.bytes = 0
+
+    def dumps_typed(self, obj):
+        typ, data = self.serde.dumps_typed(obj)
+        self.bytes += len(data)
+        return typ, data
+
+    def loads_typed(self, data):
+        return self.serde.loads_typed(data)
+
+
+def _open_saver(backend: str, serde, directory: str, label: str):
+    if backend == "sqlite":
+        conn = sqlite3.connect(str(Path(directory) / f"{label}.sqlite"), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        saver = SqliteSaver(conn, serde=serde)
+        saver.setup()
+        return saver
+    return InMemorySaver(serde=serde)
+
+
+def _write_session(saver, thread_id: str, turns: int) -> None:
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    messages = []
+    for turn in range(1, turns + 1):
+        messages = messages + [
+            HumanMessage(content=USER_TEXT * 2, id=str(uuid.uuid4())),
+            AIMessage(content=ASSISTANT_TEXT * 2, id=str(uuid.uuid4())),
+        ]
+        preferences = FlightBookingPreferences(origin="JFK", destination="LHR", travel_dates="next Friday", number_of_travelers=str(turn % 4 + 1))
+        checkpoint = empty_checkpoint()
+        checkpoint["id"] = str(uuid6(clock_seq=turn))
+        checkpoint["channel_values"] = {"messages": messages, "flight_booking_preferences": preferences, "session_id": thread_id}
+        checkpoint["channel_versions"] = {"messages": turn, "flight_booking_preferences": turn, "session_id": 1}
+        new_versions = {"messages": turn, "flight_booking_preferences": turn}
+        if turn == 1:
+            new_versions["session_id"] = 1
+        config = saver.put(config, checkpoint, {"source": "loop", "step": turn}, new_versions)
+
+
+def run(label: str, backend: str, message_deltas: bool, compression: bool, turns: int, sessions: int, snapshot_every: int, directory: str) -> None:
+    serde = create_checkpoint_serde({"enabled": compression, "min_bytes": 1024, "level": 3}) or JsonPlusSerializer()
+    counting = _CountingSerde(serde)
+    store = _open_saver(backend, counting, directory, label)
+    channels = compact_model_channels(State)
+
+    def wrap(saver):
+        return MessageDeltaCheckpointSaver(saver, channels, snapshot_every) if message_deltas else saver
+
+    writer = wrap(store)
+    thread_ids = [str(uuid.uuid4()) for _ in range(sessions)]
+    started = time.perf_counter()
+    for thread_id in thread_ids:
+        _write_session(writer, thread_id, turns)
+    write_seconds = time.perf_counter() - started
+
+    loads = []
+    for thread_id in thread_ids:
+        reader = wrap(store)
+        started = time.perf_counter()
+        checkpoint_tuple = reader.get_tuple({"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}})
+        loads.append(time.perf_counter() - started)
+        assert len(checkpoint_tuple.checkpoint["channel_values"]["messages"]) == 2 * turns
+
+    per_turn = counting.bytes / (sessions * turns)
+    print(
+        f"{label:<14} bytes/turn={per_turn / 1024:8.1f}KiB total={counting.bytes / 2**20:8.1f}MiB "
+        f"write={write_seconds * 1000 / (sessions * turns):6.2f}ms/turn "
+        f"resume p50={statistics.median(loads) * 1000:6.2f}ms max={max(loads) * 1000:6.2f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--snapshot-every", type=int, default=20)
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="memory")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for label, message_deltas, compression in [
+            ("full", False, False),
+            ("full+zstd", False, True),
+            ("delta", True, False),
+            ("delta+zstd", True, True),
+        ]:
+            run(label, args.backend, message_deltas, compression, args.turns, args.sessions, args.snapshot_every, directory)
+
+
+if __name__ == "__main__":
+    main()
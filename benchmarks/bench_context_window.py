@@ -0,0 +1,76 @@
+"""Prompt size and latency over a long session, with and without the context window.
+
+Replays ``--turns`` follow-up turns of one flight-booking session against the graph
+with a scripted LLM whose latency grows with prompt tokens, once with the configured
+``context.max_turns`` window and once sending the full history.
+
+    python -m benchmarks.bench_context_window --turns 50
+"""
+import argparse
+import statistics
+import time
+import uuid
+
+from backend.app_workflow import IntentClassifierAgent
+from backend.checkpoint_manager import InMemoryCheckpointerManager
+from backend.llm.scripted import ScriptedChatModel
+from backend.nodes.context_window import ContextWindow
+from backend.util.config_reader import get_context_config
+
+FIRST_TURN = "I want to fly from JFK to LHR"
+FOLLOW_UPS = [
+    "Can you make that flight for {n} travellers instead?",
+    "I'd prefer a window seat if possible, and please keep the flight under twelve hours.",
+    "Actually, what airlines usually fly that route? I'd still like to book the flight.",
+    "My colleague might join, so the flight could be for {n} people.",
+]
+
+
+def _session(turns: int) -> list[str]:
+    return [FIRST_TURN] + [FOLLOW_UPS[i % len(FOLLOW_UPS)].format(n=i % 4 + 1) for i in range(turns - 1)]
+
+
+def run(label: str, context_window: ContextWindow, turns: int, latency: float, per_1k_tokens: float) -> None:
+    agent = IntentClassifierAgent(
+        llm_client=ScriptedChatModel(latency_seconds=latency, seconds_per_1k_input_tokens=per_1k_tokens),
+        checkpointer_manager=InMemoryCheckpointerManager(),
+        context_window=context_window,
+    )
+    agent.build_workflow()
+    session_id = str(uuid.uuid4())
+
+    rows = []
+    for turn, query in enumerate(_session(turns), start=1):
+        started = time.perf_counter()
+        result = agent.invoke(query, session_id)
+        wall_ms = (time.perf_counter() - started) * 1000
+        input_tokens = sum(node.input_tokens for node in result["timings"].nodes)
+        rows.append((turn, input_tokens, wall_ms))
+
+    print(f"\n{label}")
+    print(f"{'turn':>5} {'input_tokens':>13} {'wall_ms':>9}")
+    for turn, input_tokens, wall_ms in rows:
+        if turn in (1, 2, 5) or turn % 10 == 0 or turn == turns:
+            print(f"{turn:>5} {input_tokens:>13} {wall_ms:>9.1f}")
+    tail = rows[-10:]
+    print(
+        f"last 10 turns: mean input_tokens={statistics.mean(r[1] for r in tail):.0f} "
+        f"mean wall={statistics.mean(r[2] for r in tail):.1f}ms"
+    )
+    agent.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.01, help="Fixed simulated seconds per LLM call")
+    parser.add_argument("--per-1k-tokens", type=float, default=0.05, help="Simulated seconds per 1k prompt tokens")
+    args = parser.parse_args()
+
+    config = get_context_config()
+    run(f"windowed (max_turns={config['max_turns']})", ContextWindow(**config), args.turns, args.latency, args.per_1k_tokens)
+    run("full history", ContextWindow(max_turns=None), args.turns, args.latency, args.per_1k_tokens)
+
+
+if __name__ == "__main__":
+    main()
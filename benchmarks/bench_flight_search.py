@@ -0,0 +1,133 @@
+"""/flight-search throughput on the seeded fare inventory at large result sizes.
+
+Builds the inventory from config (reporting fares, memory and build time), then for
+each page size times, per request: the inventory search and formatting alone,
+the old per-field ``random``/``uuid``/``datetime`` loop producing the same number of
+flights, and full HTTP requests to the router served by uvicorn with
+``--concurrency`` in flight. Searches use random core routes and ``--window-days``
+date windows.
+
+    python -m benchmarks.bench_flight_search --requests 200 --concurrency 8
+"""
+import argparse
+import asyncio
+import datetime as dt
+import random
+import socket
+import statistics
+import threading
+import time
+import uuid
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+from backend.api.fare_inventory import AIRLINES, CABIN_CLASSES, get_fare_inventory
+from backend.api.flight_controller import router as flight_router
+
+PAGE_SIZES = (20, 200, 1000)
+
+
+def _legacy_flight(origin: str, destination: str) -> dict:
+    departure_time = dt.datetime.now() + dt.timedelta(hours=random.randint(1, 72))
+    duration_hours = random.randint(2, 15)
+    return {
+        "id": str(uuid.uuid4()),
+        "airline": random.choice(AIRLINES)[0],
+        "flight_number": f"{random.choice(['DL', 'LH', 'EK', 'QR', 'AI'])}{random.randint(100, 999)}",
+        "origin": origin,
+        "destination": destination,
+        "departure_time": departure_time.isoformat(),
+        "arrival_time": (departure_time + dt.timedelta(hours=duration_hours)).isoformat(),
+        "duration_hours": duration_hours,
+        "cabin_class": random.choice(CABIN_CLASSES),
+        "price_usd": round(random.uniform(150, 1500), 2),
+        "stops": random.choice([0, 1, 2]),
+    }
+
+
+def _start_server() -> tuple[uvicorn.Server, str]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    app = FastAPI()
+    app.include_router(flight_router)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}"
+
+
+def _queries(count: int, window_days: int, seed: int) -> list[dict]:
+    inventory = get_fare_inventory()
+    rng = random.Random(seed)
+    today = dt.date.today()
+    queries = []
+    for _ in range(count):
+        origin, destination = rng.choice(inventory.core_routes)
+        date_from = today + dt.timedelta(days=rng.randrange(0, inventory.days - window_days))
+        queries.append({"origin": origin, "destination": destination, "date_from": date_from, "date_to": date_from + dt.timedelta(days=window_days - 1)})
+    return queries
+
+
+async def _http(url: str, queries: list[dict], limit: int, concurrency: int) -> tuple[float, int]:
+    semaphore = asyncio.Semaphore(concurrency)
+    returned = 0
+
+    async def one(client: httpx.AsyncClient, query: dict) -> None:
+        nonlocal returned
+        params = {**query, "date_from": query["date_from"].isoformat(), "date_to": query["date_to"].isoformat(), "limit": limit}
+        async with semaphore:
+            response = await client.get("/flight-search", params=params)
+            response.raise_for_status()
+            returned += len(response.json()["results"])
+
+    async with httpx.AsyncClient(base_url=url, timeout=30, limits=httpx.Limits(max_connections=concurrency)) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(one(client, query) for query in queries))
+        return time.perf_counter() - started, returned
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--window-days", type=int, default=31)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    inventory = get_fare_inventory()
+    build_seconds = time.perf_counter() - started
+    size_mib = sum(column.nbytes for column in inventory.columns.values()) / 2**20
+    print(f"inventory: {len(inventory):,} fares, {len(inventory.routes)} routes, {size_mib:.1f}MiB, built in {build_seconds:.2f}s")
+
+    server, url = _start_server()
+    try:
+        print(f"{'page':>5} {'matches':>8} {'engine':>10} {'legacy loop':>12} {'http req/s':>11} {'http fares/s':>13}")
+        for limit in PAGE_SIZES:
+            queries = _queries(args.requests, args.window_days, seed=limit)
+            engine, matches = [], []
+            for query in queries:
+                query_started = time.perf_counter()
+                fares, total = inventory.search(**query, limit=limit)
+                flights = inventory.to_flights(fares)
+                engine.append(time.perf_counter() - query_started)
+                matches.append(total)
+            legacy = []
+            for query in queries[:20]:
+                query_started = time.perf_counter()
+                [_legacy_flight(query["origin"], query["destination"]) for _ in range(len(flights))]
+                legacy.append(time.perf_counter() - query_started)
+            seconds, returned = asyncio.run(_http(url, queries, limit, args.concurrency))
+            print(
+                f"{limit:>5} {statistics.median(matches):>8.0f} {statistics.median(engine) * 1000:>8.2f}ms "
+                f"{statistics.median(legacy) * 1000:>10.2f}ms {len(queries) / seconds:>11.1f} {returned / seconds:>13,.0f}"
+            )
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
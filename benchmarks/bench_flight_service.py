@@ -0,0 +1,135 @@
+"""Tool-call latency of the flight API client: per-call connections vs pooled keep-alive.
+
+Serves the in-process ``flight_controller`` router with uvicorn on a local port and
+times ``--calls`` flight searches three ways: a fresh ``requests.get`` per call (the
+previous client), the pooled sync ``FlightService``, and the pooled async client with
+``--concurrency`` calls in flight; the search cache is off for these. A last run sends
+bursts of identical searches through the search cache and reports upstream calls saved.
+
+    python -m benchmarks.bench_flight_service --calls 500
+"""
+import argparse
+import asyncio
+import socket
+import statistics
+import threading
+import time
+
+import requests
+import uvicorn
+from fastapi import FastAPI
+
+from backend.api.flight_controller import router as flight_router
+from backend.service.FlightService import FlightService
+from backend.service.models import FlightSearchRequest
+from backend.util.config_reader import get_flight_service_config
+
+PAYLOAD = FlightSearchRequest(origin="JFK", destination="LHR", number_of_travelers=2)
+
+
+def _start_server() -> tuple[uvicorn.Server, str]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    app = FastAPI()
+    app.include_router(flight_router)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}"
+
+
+def _report(label: str, latencies: list[float], elapsed: float) -> None:
+    latencies = sorted(latencies)
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+    print(
+        f"{label:<22} calls={len(latencies):<5} wall={elapsed:6.2f}s "
+        f"p50={statistics.median(latencies) * 1000:6.2f}ms p95={p95 * 1000:6.2f}ms"
+    )
+
+
+def _timed(call) -> float:
+    started = time.perf_counter()
+    call()
+    return time.perf_counter() - started
+
+
+def run_per_call_connection(base_url: str, calls: int) -> None:
+    def search():
+        params = {"origin": PAYLOAD.origin, "destination": PAYLOAD.destination, "passengers": PAYLOAD.number_of_travelers}
+        requests.get(f"{base_url}/flight-search", params=params, timeout=10).raise_for_status()
+
+    started = time.perf_counter()
+    latencies = [_timed(search) for _ in range(calls)]
+    _report("requests per call", latencies, time.perf_counter() - started)
+
+
+def run_pooled_sync(service: FlightService, calls: int) -> None:
+    started = time.perf_counter()
+    latencies = [_timed(lambda: service.search_flight(PAYLOAD)) for _ in range(calls)]
+    _report("pooled sync", latencies, time.perf_counter() - started)
+
+
+async def run_pooled_async(service: FlightService, calls: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def search() -> float:
+        async with semaphore:
+            started = time.perf_counter()
+            await service.asearch_flight(PAYLOAD)
+            return time.perf_counter() - started
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(search() for _ in range(calls)))
+    _report(f"pooled async (x{concurrency})", list(latencies), time.perf_counter() - started)
+    await service.aclose()
+
+
+async def run_cached(base_url: str, calls: int, burst: int) -> None:
+    config = get_flight_service_config()
+    service = FlightService(base_url=base_url, config={**config, "search_cache": {**config["search_cache"], "enabled": True}})
+    routes = [
+        FlightSearchRequest(origin=origin, destination="LHR", number_of_travelers=2)
+        for origin in ("JFK", "CDG", "DXB", "SIN", "FRA")
+    ]
+
+    async def search(payload: FlightSearchRequest) -> float:
+        started = time.perf_counter()
+        await service.asearch_flight(payload)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    latencies = []
+    for i in range(0, calls, burst):
+        latencies += await asyncio.gather(*(search(routes[(i + j) % len(routes)]) for j in range(burst)))
+    _report(f"search cache (x{burst})", latencies, time.perf_counter() - started)
+    stats = service.search_cache.stats()
+    print(
+        f"{'':<22} upstream={stats['miss']} saved={stats['upstream_saved']} "
+        f"(hit={stats['hit']} coalesced={stats['coalesced']} stale={stats['stale']}) hit_ratio={stats['hit_ratio']:.2%}"
+    )
+    await service.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=1, help="Async calls in flight; the server shares this process")
+    args = parser.parse_args()
+
+    server, base_url = _start_server()
+    config = get_flight_service_config()
+    service = FlightService(base_url=base_url, config={**config, "search_cache": {"enabled": False}})
+    service.search_flight(PAYLOAD)  # warm up the server and the pool
+
+    run_per_call_connection(base_url, args.calls)
+    run_pooled_sync(service, args.calls)
+    asyncio.run(run_pooled_async(service, args.calls, args.concurrency))
+    asyncio.run(run_cached(base_url, args.calls, burst=10))
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
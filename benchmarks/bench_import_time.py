@@ -0,0 +1,70 @@
+"""Cold import time of the backend entry points, from ``python -X importtime``.
+
+Each module is imported in a fresh interpreter ``--runs`` times; the report shows the
+median cumulative import time against its budget in ``IMPORT_BUDGETS_MS`` and the
+slowest top-level packages it pulled in. ``tests/test_import_time.py`` enforces the
+budgets and the list of packages the API module must not load at import time.
+
+    python -m benchmarks.bench_import_time --runs 5
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Generous enough for a slow CI box; a heavy dependency creeping back in blows through them
+IMPORT_BUDGETS_MS = {
+    "backend.main": 1500,
+    "backend.llm.client": 3000,
+    "backend.app_workflow": 4000,
+}
+# Loaded by the agent container during startup (and timed there), not by importing the app
+DEFERRED_FROM_MAIN = ["langfuse", "langchain_openai", "openai", "langgraph.graph", "numpy", "psycopg"]
+
+
+def measure_import(module: str, env: dict | None = None) -> dict:
+    """Imports ``module`` in a fresh interpreter; returns its cumulative time and self time per module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    self_us: dict[str, int] = {}
+    cumulative_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        self_us[name.strip()] = int(own)
+        if name.strip() == module:
+            cumulative_us = int(cumulative)
+    return {"seconds": cumulative_us / 1e6, "modules": self_us}
+
+
+def _by_package(modules: dict[str, int]) -> dict[str, int]:
+    packages: dict[str, int] = {}
+    for name, own in modules.items():
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + own
+    return packages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    for module, budget_ms in IMPORT_BUDGETS_MS.items():
+        runs = [measure_import(module) for _ in range(args.runs)]
+        median_ms = statistics.median(run["seconds"] for run in runs) * 1000
+        status = "ok" if median_ms <= budget_ms else "OVER BUDGET"
+        print(f"{module:<22} median={median_ms:7.0f}ms budget={budget_ms:5d}ms {status}")
+        packages = sorted(_by_package(runs[-1]["modules"]).items(), key=lambda item: item[1], reverse=True)
+        print("    " + ", ".join(f"{name} {own / 1000:.0f}ms" for name, own in packages[: args.top]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""LLM calls against a rate-limited provider, with and without the client-side governor.
+
+Starts the OpenAI-compatible stub in ``backend.llm.stub_server`` with ``--rps``
+requests per second and ``--max-concurrency`` calls in flight, then fires ``--calls``
+concurrent ``ainvoke`` calls twice: through a plain ChatOpenAI with the SDK's own
+retries (``--sdk-retries``), and through GovernedChatOpenAI with a governor set to
+``--headroom`` of the stub's limits. Reports throughput, 429s seen by the stub and
+calls that failed.
+
+    python -m benchmarks.bench_llm_governor --calls 300 --rps 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from langchain_openai import ChatOpenAI
+
+from backend.llm.client import GovernedChatOpenAI
+from backend.llm.governor import LLMGovernor
+from backend.llm.stub_server import RateLimitedStub
+
+
+async def _run(client: ChatOpenAI, stub: RateLimitedStub, calls: int, label: str) -> None:
+    stub.served = stub.rejected = stub.max_in_flight = 0
+    latencies: list[float] = []
+
+    async def call(index: int) -> bool:
+        started = time.perf_counter()
+        try:
+            await client.ainvoke(f"question {index}")
+        except Exception:
+            return False
+        latencies.append(time.perf_counter() - started)
+        return True
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(call(i) for i in range(calls)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    latency = f"p50={statistics.median(latencies):5.2f}s max={latencies[-1]:5.2f}s" if latencies else "none served"
+    print(
+        f"{label:<10} ok={sum(results):4d} failed={results.count(False):4d} 429s={stub.rejected:5d} "
+        f"throughput={sum(results) / elapsed:6.1f} calls/s wall={elapsed:5.1f}s {latency} peak_in_flight={stub.max_in_flight}"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    stub = RateLimitedStub(args.rps, max_concurrency=args.max_concurrency, burst_seconds=1.0, latency_seconds=args.latency)
+    server, url = stub.serve_in_thread()
+    try:
+        options = {"base_url": url, "api_key": "bench", "model": "stub"}
+        await _run(ChatOpenAI(max_retries=args.sdk_retries, **options), stub, args.calls, "plain")
+        # Start the governed run from a refilled provider bucket
+        await asyncio.sleep(1.0)
+        governor = LLMGovernor(
+            args.rps * 60 * args.headroom, 10**9, max(1, int(args.max_concurrency * args.headroom)), burst_seconds=1.0,
+            backoff_initial_seconds=0.1,
+        )
+        await _run(GovernedChatOpenAI(max_retries=0, governor=governor, **options), stub, args.calls, "governed")
+    finally:
+        server.should_exit = True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--rps", type=float, default=50, help="Stub requests per second")
+    parser.add_argument("--max-concurrency", type=int, default=16, help="Stub calls in flight")
+    parser.add_argument("--latency", type=float, default=0.1, help="Stub seconds per call")
+    parser.add_argument("--sdk-retries", type=int, default=2, help="OpenAI SDK retries for the plain client")
+    parser.add_argument("--headroom", type=float, default=0.9, help="Governor limits as a share of the stub's")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Framework cost per node and per turn with the network taken out.
+
+Uses the scripted chat model with no latency, so everything measured is local work:
+prompt building, structured-output binding and parsing, graph scheduling and
+checkpointing. Node calls are timed with the bound structured runnables reused (as
+the nodes do) and rebuilt on every call (as they used to).
+
+    python -m benchmarks.bench_node_overhead --iterations 200
+"""
+import argparse
+import statistics
+import time
+import uuid
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from backend.app_workflow import IntentClassifierAgent
+from backend.checkpoint_manager import InMemoryCheckpointerManager
+from backend.llm.scripted import ScriptedChatModel
+from backend.schema.models import FlightBookingPreferences, IntentType, State
+
+QUERY = "Book a flight from JFK to LHR on Mar 3 for 2"
+# No travel date, so search_flight asks for it instead of calling the flight API
+TURN_QUERY = "Book a flight from JFK to LHR for 2"
+
+
+def _states() -> dict[str, State]:
+    first_turn = State(messages=[HumanMessage(content="Hi, I need some help with travel")])
+    flight = State(messages=[HumanMessage(content=QUERY)], intent=IntentType.FLIGHT_BOOKING)
+    trip = State(messages=[HumanMessage(content="Plan a 5-day trip to Tokyo in April")], intent=IntentType.TRAVEL_PLANNING)
+    confirming = State(
+        messages=[HumanMessage(content=QUERY), AIMessage(content="Here's a flight..."), HumanMessage(content="yes book it")],
+        intent=IntentType.FLIGHT_BOOKING,
+        flight_booking_preferences=FlightBookingPreferences(origin="JFK", destination="LHR", travel_dates="Mar 3", number_of_travelers="2"),
+        last_flight_search_result={"id": "f-1"},
+    )
+    return {
+        "user_intent_classifier": first_turn,
+        "classify_and_extract": first_turn,
+        "extract_flight_preferences": flight,
+        "extract_itinerary_preferences": trip,
+        "extract_flight_booking_confirmation": confirming,
+    }
+
+
+def _per_call_us(call, iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1_000_000
+
+
+def run_nodes(agent: IntentClassifierAgent, iterations: int) -> None:
+    print(f"{'node':<38} {'reused':>10} {'rebuilt':>10}")
+    for name, state in _states().items():
+        node = getattr(agent, name)
+        reused = _per_call_us(lambda: node(state), iterations)
+
+        def rebuilt():
+            node._structured_llms.clear()
+            node(state)
+
+        print(f"{name:<38} {reused:>8.0f}us {_per_call_us(rebuilt, iterations):>8.0f}us")
+
+
+def run_turns(agent: IntentClassifierAgent, iterations: int) -> None:
+    totals, node_ms = [], {}
+    for _ in range(iterations):
+        result = agent.invoke(TURN_QUERY, str(uuid.uuid4()))
+        totals.append(result["timings"].total_ms)
+        for node in result["timings"].nodes:
+            node_ms.setdefault(node.node, []).append(node.wall_ms)
+    total = statistics.median(totals)
+    in_nodes = sum(statistics.median(v) for v in node_ms.values())
+    print(f"\nfirst turn, no network: median {total:.2f}ms")
+    for node, values in node_ms.items():
+        print(f"  {node:<36} {statistics.median(values):6.2f}ms")
+    print(f"  {'graph + checkpoint overhead':<36} {total - in_nodes:6.2f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    agent = IntentClassifierAgent(llm_client=ScriptedChatModel(), checkpointer_manager=InMemoryCheckpointerManager())
+    agent.build_workflow()
+    run_nodes(agent, args.iterations)
+    run_turns(agent, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
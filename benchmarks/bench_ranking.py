@@ -0,0 +1,57 @@
+"""Flight ranking cost by result-set size: NumPy top-k vs a Python sort.
+
+    python -m benchmarks.bench_ranking --top 20
+"""
+import argparse
+import time
+
+import numpy as np
+
+from backend.service.ranking import rank_fares, rank_flights, ranking_weights
+
+
+def _python_rank(flights: list[dict], weights: np.ndarray, k: int) -> list[dict]:
+    columns = [[f[key] for f in flights] for key in ("price_usd", "duration_hours", "stops")]
+    bounds = [(min(c), max(c) - min(c) or 1.0) for c in columns]
+
+    def score(f: dict) -> float:
+        values = (f["price_usd"], f["duration_hours"], f["stops"])
+        return sum(w * (v - low) / spread for w, v, (low, spread) in zip(weights, values, bounds))
+
+    return sorted(flights, key=score)[:k]
+
+
+def _best_of(repeats: int, call) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    weights = ranking_weights(None)
+    print(f"{'fares':>8} {'numpy arrays':>13} {'numpy dicts':>12} {'python sort':>12}")
+    for size in (100, 1_000, 10_000, 100_000):
+        prices = rng.uniform(100, 2000, size)
+        durations = rng.integers(1, 20, size)
+        stops = rng.integers(0, 3, size)
+        flights = [
+            {"id": str(i), "price_usd": float(p), "duration_hours": int(d), "stops": int(s)}
+            for i, (p, d, s) in enumerate(zip(prices, durations, stops))
+        ]
+        arrays_ms = _best_of(args.repeats, lambda: rank_fares(prices, durations, stops, weights, args.top))
+        dicts_ms = _best_of(args.repeats, lambda: rank_flights(flights, None, args.top))
+        python_ms = _best_of(args.repeats, lambda: _python_rank(flights, weights, args.top))
+        print(f"{size:>8} {arrays_ms:>11.2f}ms {dicts_ms:>10.2f}ms {python_ms:>10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,15 @@ import os
 import pytest
 
 CHAT_API_BASE_URL = os.getenv("CHAT_API_BASE_URL", "http://localhost:8080")
+# Set to "combined" when the server runs with graph.combined_intent_extraction enabled
+AGENT_GRAPH_VARIANT = os.getenv("AGENT_GRAPH_VARIANT", "default")
+
+default_graph_only = pytest.mark.skipif(
+    AGENT_GRAPH_VARIANT != "default", reason="expects separate intent and extraction nodes"
+)
+combined_graph_only = pytest.mark.skipif(
+    AGENT_GRAPH_VARIANT != "combined", reason="expects the combined classify_and_extract node"
+)
 
 
 @pytest.fixture(scope="module")
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from backend.api.admission import AdmissionController, AdmissionRejected
+
+
+async def _turn(admission: AdmissionController, release: asyncio.Event, admitted: list[int], index: int) -> None:
+    async with admission.admit():
+        admitted.append(index)
+        await release.wait()
+
+
+class TestAdmissionController:
+
+    def test_queue_is_bounded_and_admits_in_order(self) -> None:
+        async def scenario():
+            admission = AdmissionController(max_in_flight=2, max_queue=2, queue_timeout_seconds=5)
+            release, admitted = asyncio.Event(), []
+            turns = [asyncio.create_task(_turn(admission, release, admitted, i)) for i in range(4)]
+            await asyncio.sleep(0.01)
+            assert (admitted, admission.in_flight, admission.queue_depth) == ([0, 1], 2, 2)
+            with pytest.raises(AdmissionRejected) as rejected:
+                await admission.acquire()
+            assert rejected.value.reason == "queue_full"
+            release.set()
+            await asyncio.gather(*turns)
+            assert admitted == [0, 1, 2, 3]
+            assert (admission.in_flight, admission.queue_depth) == (0, 0)
+
+        asyncio.run(scenario())
+
+    def test_waiters_past_their_deadline_are_dropped(self) -> None:
+        async def scenario():
+            admission = AdmissionController(max_in_flight=1, max_queue=5, queue_timeout_seconds=0.05)
+            release, admitted = asyncio.Event(), []
+            running = asyncio.create_task(_turn(admission, release, admitted, 0))
+            await asyncio.sleep(0)
+            with pytest.raises(AdmissionRejected) as rejected:
+                await _turn(admission, release, admitted, 1)
+            assert rejected.value.reason == "timeout"
+            release.set()
+            await running
+            assert admitted == [0]
+            assert (admission.in_flight, admission.queue_depth) == (0, 0)
+
+        asyncio.run(scenario())
+
+    def test_expected_wait_beyond_the_deadline_is_shed_at_once(self) -> None:
+        async def scenario():
+            admission = AdmissionController(max_in_flight=1, max_queue=10, queue_timeout_seconds=1, retry_after_seconds=1)
+            admission._turn_seconds = 0.6
+            release, admitted = asyncio.Event(), []
+            turns = [asyncio.create_task(_turn(admission, release, admitted, i)) for i in range(2)]
+            await asyncio.sleep(0)
+            # Third in line: two turns of 0.6s ahead of it cannot finish within the 1s queue timeout
+            with pytest.raises(AdmissionRejected) as rejected:
+                await admission.acquire()
+            assert (rejected.value.reason, rejected.value.retry_after_seconds) == ("deadline", 2)
+            release.set()
+            await asyncio.gather(*turns)
+
+        asyncio.run(scenario())
+
+    def test_cancelled_waiter_leaves_the_queue(self) -> None:
+        async def scenario():
+            admission = AdmissionController(max_in_flight=1, max_queue=5, queue_timeout_seconds=5)
+            release, admitted = asyncio.Event(), []
+            running = asyncio.create_task(_turn(admission, release, admitted, 0))
+            await asyncio.sleep(0)
+            waiting = asyncio.create_task(_turn(admission, release, admitted, 1))
+            await asyncio.sleep(0.01)
+            assert admission.queue_depth == 1
+            waiting.cancel()
+            await asyncio.gather(waiting, return_exceptions=True)
+            assert admission.queue_depth == 0
+            release.set()
+            await running
+            assert admission.in_flight == 0
+
+        asyncio.run(scenario())
+
+    def test_stream_releases_when_client_leaves_before_the_body(self) -> None:
+        from backend.api.chat_controller import _TurnStream
+
+        async def body():
+            read.append(True)
+            yield "event: response\n\n"
+
+        async def disconnect() -> dict:
+            return {"type": "http.disconnect"}
+
+        async def gone(message: dict) -> None:
+            raise OSError("client went away")
+
+        async def stalled(message: dict) -> None:
+            await asyncio.sleep(10)
+
+        async def scenario(spec_version: str, send) -> AdmissionController:
+            admission = AdmissionController(max_in_flight=1, max_queue=0, queue_timeout_seconds=1)
+            await admission.acquire()
+
+            async def finish() -> None:
+                admission.release()
+
+            try:
+                await _TurnStream(body(), finish)({"type": "http", "asgi": {"spec_version": spec_version}}, disconnect, send)
+            except Exception:
+                pass
+            return admission
+
+        read = []
+        # ASGI 2.4 servers report the disconnect from send; older ones from receive
+        for spec_version, send in (("2.4", gone), ("2.0", stalled)):
+            admission = asyncio.run(scenario(spec_version, send))
+            assert admission.in_flight == 0, spec_version
+        assert read == []
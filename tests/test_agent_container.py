@@ -0,0 +1,74 @@
+import asyncio
+
+from backend.agent_container import AgentContainer
+from backend.app_workflow import IntentClassifierAgent
+from backend.checkpoint_manager import InMemoryCheckpointerManager
+from backend.llm.scripted import ScriptedChatModel
+
+
+class _CountingFactory:
+    def __init__(self, failures: int = 0):
+        self.calls = 0
+        self.failures = failures
+
+    def __call__(self) -> IntentClassifierAgent:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("LLM endpoint unreachable")
+        return IntentClassifierAgent(ScriptedChatModel(), InMemoryCheckpointerManager())
+
+
+class TestAgentContainer:
+
+    def test_concurrent_callers_share_one_agent(self) -> None:
+        factory = _CountingFactory()
+        container = AgentContainer(agent_factory=factory)
+
+        async def scenario():
+            agents = await asyncio.gather(*(container.get() for _ in range(8)))
+            await container.stop()
+            return agents
+
+        agents = asyncio.run(scenario())
+        assert factory.calls == 1
+        assert all(agent is agents[0] for agent in agents)
+
+    def test_start_records_phases_and_is_ready(self) -> None:
+        container = AgentContainer(agent_factory=_CountingFactory())
+
+        async def scenario():
+            await container.start({"app_imports": 0.5})
+            stats = await container.ready()
+            agent = await container.get()
+            response = await agent.ainvoke("Book a flight from JFK to LHR", "warm")
+            await container.stop()
+            return stats, response
+
+        stats, response = asyncio.run(scenario())
+        assert isinstance(stats, dict)
+        assert response
+        assert {"app_imports", "imports", "agent", "checkpointer", "compile", "ready_check", "total"} <= set(container.phases)
+        assert container.phases["total"] >= 0.5
+        assert not container.started
+
+    def test_failed_start_is_not_ready_and_retries(self) -> None:
+        factory = _CountingFactory(failures=1)
+        container = AgentContainer(agent_factory=factory)
+
+        async def scenario():
+            await container.start()
+            try:
+                await container.ready()
+            except RuntimeError as e:
+                error = str(e)
+            else:
+                error = None
+            agent = await container.get()
+            await container.stop()
+            return error, agent
+
+        error, agent = asyncio.run(scenario())
+        assert "LLM endpoint unreachable" in error
+        assert agent is not None
+        assert factory.calls == 2
+        assert container.error is None
@@ -0,0 +1,29 @@
+from langchain_core.messages import HumanMessage
+
+from backend.llm.scripted import ScriptedChatModel
+from backend.nodes.flight.extract_flight_preferences import ExtractFlightPreferences
+from backend.schema.models import FlightBookingPreferences, IntentType, State
+
+
+class _CountingChatModel(ScriptedChatModel):
+    bind_calls: int = 0
+
+    def bind_tools(self, tools, *, tool_choice=None, **kwargs):
+        self.bind_calls += 1
+        return super().bind_tools(tools, tool_choice=tool_choice, **kwargs)
+
+
+class TestStructuredRunnableCache:
+
+    def test_schema_is_bound_once_at_construction(self) -> None:
+        llm = _CountingChatModel()
+        node = ExtractFlightPreferences(llm)
+        assert llm.bind_calls == 1
+
+        state = State(messages=[HumanMessage(content="Fly from JFK to LHR for 2")], intent=IntentType.FLIGHT_BOOKING)
+        for _ in range(3):
+            result = node(state)
+        assert llm.bind_calls == 1
+        assert result["flight_booking_preferences"] == FlightBookingPreferences(
+            origin="JFK", destination="LHR", number_of_travelers="2"
+        )
@@ -0,0 +1,125 @@
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import backend.api.booking_ledger as booking_ledger
+import backend.api.fare_inventory as fare_inventory
+from backend.api.booking_ledger import BookingLedger, IdempotencyKeyReused
+from backend.api.fare_inventory import FareInventory
+from backend.api.flight_controller import router as flight_router
+from backend.nodes.flight.book_flight import BookFlight
+from backend.schema.models import FlightBookingPreferences, State
+
+START = dt.date(2026, 3, 1)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _client(monkeypatch) -> tuple[TestClient, FareInventory]:
+    inventory = FareInventory(seed=7, airports=["JFK", "LHR"], days=3, fares_per_day=30, start_date=START)
+    monkeypatch.setattr(fare_inventory, "_fare_inventory", inventory)
+    monkeypatch.setattr(booking_ledger, "_booking_ledger", BookingLedger(failure_rate=0))
+    app = FastAPI()
+    app.include_router(flight_router)
+    return TestClient(app), inventory
+
+
+def _fullest_fare(inventory: FareInventory) -> dict:
+    fares, _ = inventory.search("JFK", "LHR", START, START, limit=1000)
+    return max(inventory.to_flights(fares), key=lambda flight: inventory.seats(flight["id"]))
+
+
+class TestBookingLedger:
+
+    def test_parallel_bookings_never_oversell(self) -> None:
+        ledger = BookingLedger()
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            results = list(pool.map(lambda i: ledger.book("JFKLHR-20260301-0001", 1 + i % 3, 100, f"key-{i}"), range(300)))
+        booked = [r for r in results if r["booking_status"]]
+        assert ledger.seats_sold("JFKLHR-20260301-0001") == sum(r["passengers"] for r in booked) <= 100
+        assert min(r["seats_remaining"] for r in booked) < 3
+        assert all(r["error_code"] == "ERR_SEAT_UNAVAILABLE" for r in results if not r["booking_status"])
+
+    def test_repeated_key_replays_the_first_result(self) -> None:
+        ledger = BookingLedger()
+        first = ledger.book("f-1", 2, 10, "key")
+        assert ledger.book("f-1", 2, 10, "key") == first == ledger.replay("key", "f-1", 2)
+        assert ledger.seats_sold("f-1") == 2
+        with pytest.raises(IdempotencyKeyReused):
+            ledger.book("f-1", 3, 10, "key")
+
+    def test_results_expire_and_are_bounded(self) -> None:
+        clock = _Clock()
+        ledger = BookingLedger(ttl_seconds=60, max_entries=2, clock=clock)
+        first = ledger.book("f-1", 1, 10, "a")
+        ledger.book("f-1", 1, 10, "b")
+        ledger.book("f-1", 1, 10, "c")
+        assert len(ledger) == 2 and ledger.replay("a", "f-1", 1) is None
+        clock.now = 61
+        assert len(ledger) == 0
+        assert ledger.book("f-1", 1, 10, "a") != first
+
+
+class TestBookFlightEndpoint:
+
+    def test_concurrent_requests_respect_seats_and_keys(self, monkeypatch) -> None:
+        client, inventory = _client(monkeypatch)
+        flight = _fullest_fare(inventory)
+        seats = inventory.seats(flight["id"])
+
+        def post(i: int) -> dict:
+            # Every key is sent twice, as a client retrying after a lost response would
+            headers = {"Idempotency-Key": f"key-{i // 2}"}
+            return client.post("/book-flight", json={**flight, "passengers": 1}, headers=headers).json()
+
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            results = list(pool.map(post, range(2 * (seats + 50))))
+        confirmations = {r["confirmation_number"] for r in results if r["booking_status"]}
+        assert len(confirmations) == seats
+        assert booking_ledger._booking_ledger.seats_sold(flight["id"]) == seats
+        assert all(results[i] == results[i + 1] for i in range(0, len(results), 2))
+
+    def test_search_skips_fares_without_enough_seats_left(self, monkeypatch) -> None:
+        client, inventory = _client(monkeypatch)
+        flight = _fullest_fare(inventory)
+        seats = inventory.seats(flight["id"])
+        params = {"origin": "JFK", "destination": "LHR", "date_from": START.isoformat(), "date_to": START.isoformat(), "limit": 1000}
+
+        def found(passengers: int) -> bool:
+            results = client.get("/flight-search", params={**params, "passengers": passengers}).json()["results"]
+            return flight["id"] in {r["id"] for r in results}
+
+        assert found(1)
+        assert booking_ledger._booking_ledger.book(flight["id"], seats - 2, seats)["booking_status"]
+        assert found(2) and not found(3)
+
+    def test_key_reused_for_another_request_is_rejected(self, monkeypatch) -> None:
+        client, inventory = _client(monkeypatch)
+        flight = _fullest_fare(inventory)
+        assert client.post("/book-flight", json=flight, headers={"Idempotency-Key": "k"}).json()["booking_status"]
+        response = client.post("/book-flight", json={**flight, "passengers": 2}, headers={"Idempotency-Key": "k"})
+        assert response.status_code == 422
+
+
+class TestBookFlightNode:
+
+    def test_key_changes_with_the_traveller_count(self) -> None:
+        def key(travellers: str) -> str:
+            state = State(
+                session_id="s-1",
+                last_flight_search_result={"id": "f-1"},
+                flight_booking_preferences=FlightBookingPreferences(number_of_travelers=travellers),
+            )
+            return BookFlight._idempotency_key(state, BookFlight(None)._booking_payload(state))
+
+        assert key("2") == key("2")
+        assert key("2") != key("3")
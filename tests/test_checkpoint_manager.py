@@ -0,0 +1,73 @@
+import asyncio
+import uuid
+
+import pytest
+
+from backend.app_workflow import IntentClassifierAgent
+from backend.checkpoint_manager import (
+    InMemoryCheckpointerManager,
+    PostgresCheckpointerManager,
+    SqliteCheckpointerManager,
+    create_checkpointer_manager,
+)
+from backend.llm.scripted import ScriptedChatModel
+from backend.util.config_reader import get_checkpoint_config
+
+QUERY = "Book a flight from JFK to LHR"
+
+
+def _config(backend: str, **overrides) -> dict:
+    return {**get_checkpoint_config(), "durability": "exit", "backend": backend, **overrides}
+
+
+class TestCreateCheckpointerManager:
+
+    def test_selects_backend_from_config(self) -> None:
+        assert isinstance(create_checkpointer_manager(_config("memory")), InMemoryCheckpointerManager)
+        manager = create_checkpointer_manager(_config("sqlite", sqlite_path="/tmp/x.sqlite"))
+        assert isinstance(manager, SqliteCheckpointerManager)
+        assert manager.path == "/tmp/x.sqlite"
+        assert manager.durability == "exit"
+
+    def test_postgres_requires_uri(self, monkeypatch) -> None:
+        monkeypatch.delenv("POSTGRES_URI", raising=False)
+        with pytest.raises(ValueError):
+            create_checkpointer_manager(_config("postgres"))
+        monkeypatch.setenv("POSTGRES_URI", "postgresql://localhost/db")
+        assert isinstance(create_checkpointer_manager(_config("postgres")), PostgresCheckpointerManager)
+
+
+class TestSqliteCheckpointer:
+
+    def test_sync_state_survives_reopen(self, tmp_path) -> None:
+        path = str(tmp_path / "checkpoints.sqlite")
+        session = {"configurable": {"thread_id": str(uuid.uuid4())}}
+        agent = IntentClassifierAgent(ScriptedChatModel(), SqliteCheckpointerManager(path, "exit"))
+        agent.build_workflow()
+        agent.invoke(QUERY, session["configurable"]["thread_id"])
+        agent.close()
+
+        agent = IntentClassifierAgent(ScriptedChatModel(), SqliteCheckpointerManager(path, "exit"))
+        agent.build_workflow()
+        assert len(agent.workflow.get_state(session).values["messages"]) == 3
+        agent.close()
+
+    def test_async_deferred_writes_are_flushed_on_close(self, tmp_path) -> None:
+        path = str(tmp_path / "checkpoints.sqlite")
+        session = {"configurable": {"thread_id": str(uuid.uuid4())}}
+
+        async def turn():
+            agent = IntentClassifierAgent(ScriptedChatModel(), SqliteCheckpointerManager(path, "deferred"))
+            await agent.abuild_workflow()
+            await agent.ainvoke(QUERY, session["configurable"]["thread_id"])
+            await agent.aclose()
+
+        async def read():
+            agent = IntentClassifierAgent(ScriptedChatModel(), SqliteCheckpointerManager(path, "exit"))
+            await agent.abuild_workflow()
+            state = await agent.async_workflow.aget_state(session)
+            await agent.aclose()
+            return state
+
+        asyncio.run(turn())
+        assert len(asyncio.run(read()).values["messages"]) == 3
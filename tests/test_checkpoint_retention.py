@@ -0,0 +1,83 @@
+import sqlite3
+import time
+import uuid
+
+from backend.app_workflow import IntentClassifierAgent
+from backend.checkpoint_manager import SqliteCheckpointerManager
+from backend.checkpoint_retention import SqliteCheckpointRetention, checkpoint_id_before
+from backend.llm.scripted import ScriptedChatModel
+from backend.util.config_reader import get_checkpoint_config, get_checkpoint_retention_config
+
+TURNS = ["Book a flight from JFK to LHR", "It's for 2 travellers", "Make it JFK to CDG instead"]
+DAY = 86400
+
+
+def _checkpoint_config(path: str) -> dict:
+    return {**get_checkpoint_config(), "backend": "sqlite", "sqlite_path": path, "durability": "async", "snapshot_every": 2}
+
+
+def _retention(path: str, days_later: float, batch_size: int = 1) -> SqliteCheckpointRetention:
+    retention = {**get_checkpoint_retention_config(), "idle_seconds": DAY, "ttl_seconds": 30 * DAY, "batch_size": batch_size, "pause_seconds": 0}
+    return SqliteCheckpointRetention(path, retention, _checkpoint_config(path), clock=lambda: time.time() + days_later * DAY)
+
+
+def _converse(path: str, thread_ids: list[str]) -> dict[str, list[str]]:
+    agent = IntentClassifierAgent(ScriptedChatModel(), SqliteCheckpointerManager(path, config=_checkpoint_config(path)))
+    agent.build_workflow()
+    for thread_id in thread_ids:
+        for query in TURNS:
+            agent.invoke(query, thread_id)
+    contents = {
+        thread_id: [m.content for m in agent.workflow.get_state({"configurable": {"thread_id": thread_id}}).values["messages"]]
+        for thread_id in thread_ids
+    }
+    agent.close()
+    return contents
+
+
+def _checkpoint_counts(path: str) -> dict[str, int]:
+    with sqlite3.connect(path) as conn:
+        return dict(conn.execute("SELECT thread_id, COUNT(*) FROM checkpoints GROUP BY thread_id").fetchall())
+
+
+class TestCheckpointRetention:
+
+    def test_checkpoint_ids_compare_in_time_order(self) -> None:
+        from langgraph.checkpoint.base.id import uuid6
+
+        before = checkpoint_id_before(time.time() - 1)
+        assert before < str(uuid6()) < checkpoint_id_before(time.time() + 1)
+
+    def test_recent_threads_are_untouched(self, tmp_path) -> None:
+        path = str(tmp_path / "checkpoints.sqlite")
+        _converse(path, ["a"])
+        counts = _checkpoint_counts(path)
+        stats = _retention(path, days_later=0).run()
+        assert (stats.threads_compacted, stats.threads_deleted) == (0, 0)
+        assert _checkpoint_counts(path) == counts
+
+    def test_idle_threads_keep_latest_checkpoint_and_state(self, tmp_path) -> None:
+        path = str(tmp_path / "checkpoints.sqlite")
+        expected = _converse(path, ["a", "b", "c"])
+        stats = _retention(path, days_later=2).run()
+        assert stats.threads_compacted == 3
+        assert stats.rows_deleted["checkpoints"] > 0
+        assert _checkpoint_counts(path) == {"a": 1, "b": 1, "c": 1}
+        # Message deltas were folded into the kept checkpoint, so the state still resolves and resumes
+        agent = IntentClassifierAgent(ScriptedChatModel(), SqliteCheckpointerManager(path, config=_checkpoint_config(path)))
+        agent.build_workflow()
+        for thread_id, contents in expected.items():
+            state = agent.workflow.get_state({"configurable": {"thread_id": thread_id}})
+            assert [m.content for m in state.values["messages"]] == contents
+        agent.invoke("It's for 3 travellers", "a")
+        agent.close()
+
+    def test_expired_threads_are_deleted(self, tmp_path) -> None:
+        path = str(tmp_path / "checkpoints.sqlite")
+        _converse(path, ["a", "b"])
+        dry_run = _retention(path, days_later=31).run(dry_run=True)
+        assert dry_run.threads_deleted == 2
+        assert len(_checkpoint_counts(path)) == 2
+        stats = _retention(path, days_later=31).run()
+        assert stats.threads_deleted == 2
+        assert _checkpoint_counts(path) == {}
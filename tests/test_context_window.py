@@ -0,0 +1,48 @@
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from backend.nodes.context_window import ContextWindow
+from backend.schema.models import FlightBookingPreferences, State
+
+
+def _conversation(turns: int) -> list:
+    messages = []
+    for i in range(turns):
+        messages += [HumanMessage(content=f"question {i}"), AIMessage(content=f"answer {i}")]
+    return messages
+
+
+class TestContextWindow:
+
+    def test_short_conversation_is_sent_verbatim(self) -> None:
+        window = ContextWindow(max_turns=3)
+        state = State(messages=_conversation(2))
+        prompt = window.build_prompt(SystemMessage(content="system"), state)
+        assert len(prompt) == 5
+        assert window.summarise(state) == {}
+
+    def test_older_turns_are_summarised_and_preferences_kept(self) -> None:
+        window = ContextWindow(max_turns=2)
+        state = State(
+            messages=_conversation(5),
+            flight_booking_preferences=FlightBookingPreferences(origin="JFK", destination="LHR"),
+        )
+        update = window.summarise(state)
+        assert update["summarized_message_count"] == 6
+        assert update["conversation_summary"].splitlines()[0] == "User: question 0"
+        assert "Assistant: answer 2" in update["conversation_summary"]
+
+        state = state.model_copy(update=update)
+        prompt = window.build_prompt(SystemMessage(content="system"), state)
+        assert [type(m) for m in prompt[:2]] == [SystemMessage, SystemMessage]
+        assert "question 1" in prompt[1].content and '"origin": "JFK"' in prompt[1].content
+        assert [m.content for m in prompt[2:]] == ["question 3", "answer 3", "question 4", "answer 4"]
+
+    def test_summary_is_incremental_and_bounded(self) -> None:
+        window = ContextWindow(max_turns=1, summary_max_chars=60)
+        state = State(messages=_conversation(3))
+        state = state.model_copy(update=window.summarise(state))
+        state = state.model_copy(update={"messages": state.messages + _conversation(4)[6:]})
+        update = window.summarise(state)
+        assert update["summarized_message_count"] == 6
+        assert len(update["conversation_summary"]) <= 60
+        assert update["conversation_summary"].endswith("Assistant: answer 2")
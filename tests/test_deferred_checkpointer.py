@@ -0,0 +1,59 @@
+import asyncio
+import time
+import uuid
+
+from backend.app_workflow import IntentClassifierAgent
+from backend.checkpoint_manager import InMemoryCheckpointerManager
+from backend.llm.scripted import ScriptedChatModel
+from benchmarks.bench_checkpoint_durability import _SlowSaver
+
+TURNS = ["Book a flight from JFK to LHR", "It's for 2 travellers"]
+# Each turn adds the user message, the preferences summary and the missing-fields reply
+MESSAGES_PER_TURN = 3
+
+
+def _agent(saver) -> IntentClassifierAgent:
+    return IntentClassifierAgent(
+        llm_client=ScriptedChatModel(),
+        checkpointer_manager=InMemoryCheckpointerManager("deferred", saver_factory=lambda: saver),
+    )
+
+
+class _SlowSyncSaver(_SlowSaver):
+    def put(self, config, checkpoint, metadata, new_versions):
+        self.writes += 1
+        time.sleep(self.write_seconds)
+        return super().put(config, checkpoint, metadata, new_versions)
+
+
+class TestDeferredCheckpoints:
+
+    def test_async_turns_see_previous_turn_and_write_once(self) -> None:
+        saver = _SlowSaver(read_seconds=0, write_seconds=0.05)
+        agent = _agent(saver)
+        session_id = str(uuid.uuid4())
+
+        async def scenario():
+            await agent.abuild_workflow()
+            for query in TURNS:
+                result = await agent.ainvoke(query, session_id)
+            await agent.aclose()
+            return result
+
+        result = asyncio.run(scenario())
+        assert result["trajectory"][1] == "extract_flight_preferences"
+        assert saver.writes == len(TURNS)
+        state = agent.async_workflow.get_state({"configurable": {"thread_id": session_id}})
+        assert len(state.values["messages"]) == MESSAGES_PER_TURN * len(TURNS)
+
+    def test_sync_reads_wait_for_pending_writes(self) -> None:
+        saver = _SlowSyncSaver(read_seconds=0, write_seconds=0.05)
+        agent = _agent(saver)
+        agent.build_workflow()
+        session_id = str(uuid.uuid4())
+        for query in TURNS:
+            result = agent.invoke(query, session_id)
+        assert result["trajectory"][1] == "extract_flight_preferences"
+        state = agent.workflow.get_state({"configurable": {"thread_id": session_id}})
+        assert len(state.values["messages"]) == MESSAGES_PER_TURN * len(TURNS)
+        agent.close()
@@ -0,0 +1,98 @@
+import datetime as dt
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import backend.api.fare_inventory as fare_inventory
+from backend.api.fare_inventory import FareInventory
+from backend.api.flight_controller import router as flight_router
+
+START = dt.date(2026, 3, 1)
+
+
+def _inventory() -> FareInventory:
+    return FareInventory(seed=7, airports=["JFK", "LHR", "CDG"], days=10, fares_per_day=30, start_date=START)
+
+
+def _days(first: int, last: int) -> tuple[dt.date, dt.date]:
+    return START + dt.timedelta(days=first), START + dt.timedelta(days=last)
+
+
+class TestFareInventory:
+
+    def test_same_seed_gives_same_fares(self) -> None:
+        first, second = _inventory(), _inventory()
+        assert len(first) > 0
+        for name, column in first.columns.items():
+            assert (column == second.columns[name]).all(), name
+
+    def test_window_spans_prebuilt_and_on_demand_days(self) -> None:
+        inventory = _inventory()
+        fares, total = inventory.search("JFK", "LHR", *_days(8, 12), limit=10_000)
+        flights = inventory.to_flights(fares)
+        assert len(flights) == total
+        departures = [f["departure_time"] for f in flights]
+        assert departures == sorted(departures)
+        assert {d[:10] for d in departures} == {(START + dt.timedelta(days=i)).isoformat() for i in range(8, 13)}
+        # Off-network routes are generated on demand too
+        assert inventory.search("LON", "BER", *_days(0, 0))[1] > 0
+
+    def test_filters_and_pagination(self) -> None:
+        inventory = _inventory()
+        query = dict(cabin="economy", max_stops=1, min_price=200, max_price=900)
+        fares, total = inventory.search("JFK", "CDG", *_days(0, 6), **query, limit=10_000)
+        flights = inventory.to_flights(fares)
+        assert total == len(flights) > 0
+        assert all(f["cabin_class"] == "Economy" and f["stops"] <= 1 and 200 <= f["price_usd"] <= 900 for f in flights)
+        pages = [inventory.to_flights(inventory.search("JFK", "CDG", *_days(0, 6), **query, offset=o, limit=7)[0]) for o in range(0, total, 7)]
+        assert [f["id"] for page in pages for f in page] == [f["id"] for f in flights]
+
+    def test_fare_ids_are_stable_and_validated(self) -> None:
+        inventory = _inventory()
+        flight = inventory.to_flights(inventory.search("LHR", "JFK", *_days(3, 3), limit=5)[0])[4]
+        assert _inventory().fare(flight["id"]) == flight
+        assert inventory.fare(flight["id"].rsplit("-", 1)[0] + "-9999") is None
+        assert inventory.fare("not-a-fare") is None
+
+    def test_off_network_routes_keep_no_state(self) -> None:
+        inventory = _inventory()
+        core = list(inventory.routes)
+        flights = inventory.to_flights(inventory.search("lon", "ber", *_days(0, 0))[0])
+        assert {(f["origin"], f["destination"]) for f in flights} == {("LON", "BER")}
+        for index in range(100):
+            inventory.search("AAA", f"B{chr(65 + index % 10)}{chr(65 + index // 10)}", *_days(0, 0))
+        assert inventory.routes == core
+        assert _inventory().fare(flights[0]["id"]) == flights[0]
+        with pytest.raises(ValueError):
+            inventory.search("L0N", "BER", *_days(0, 0))
+        assert inventory.fare("L0NBER-20260301-0000") is None
+
+    def test_window_is_bounded(self) -> None:
+        with pytest.raises(ValueError):
+            _inventory().search("JFK", "LHR", *_days(0, 40))
+
+
+class TestFlightSearchApi:
+
+    @pytest.fixture
+    def client(self, monkeypatch) -> TestClient:
+        monkeypatch.setattr(fare_inventory, "_fare_inventory", _inventory())
+        app = FastAPI()
+        app.include_router(flight_router)
+        return TestClient(app)
+
+    def test_search_and_book_validates_fare(self, client: TestClient) -> None:
+        params = {"origin": "JFK", "destination": "LHR", "date_from": START.isoformat(), "limit": 3}
+        body = client.get("/flight-search", params=params).json()
+        assert len(body["results"]) == 3 and body["total"] > 3
+        flight = body["results"][0]
+        booking = {key: flight[key] for key in ("id", "airline", "flight_number", "origin", "destination")}
+        unknown = client.post("/book-flight", json={**booking, "flight_number": "XX000"}).json()
+        assert unknown["error_code"] == "ERR_FARE_NOT_FOUND"
+        booked = client.post("/book-flight", json=booking).json()
+        assert booked.get("error_code") != "ERR_FARE_NOT_FOUND"
+
+    def test_bad_window_is_rejected(self, client: TestClient) -> None:
+        params = {"origin": "JFK", "destination": "LHR", "date_from": "2026-03-05", "date_to": "2026-03-01"}
+        assert client.get("/flight-search", params=params).status_code == 422
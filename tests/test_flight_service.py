@@ -0,0 +1,104 @@
+import asyncio
+
+import httpx
+import pytest
+
+from backend.service.FlightService import FlightService
+from backend.service.models import FlightSearchRequest
+from backend.util.config_reader import get_flight_service_config
+
+FLIGHT = {
+    "id": "f-1",
+    "airline": "Lufthansa",
+    "flight_number": "LH400",
+    "origin": "JFK",
+    "destination": "LHR",
+    "departure_time": "2026-03-03T10:00:00",
+    "arrival_time": "2026-03-03T17:00:00",
+    "duration_hours": 7,
+    "cabin_class": "Economy",
+    "price_usd": 420.0,
+    "stops": 0,
+}
+PAYLOAD = FlightSearchRequest(origin="JFK", destination="LHR", number_of_travelers=2)
+
+
+def _service(handler, max_retries: int = 2) -> FlightService:
+    config = {
+        **get_flight_service_config(),
+        "max_retries": max_retries,
+        "retry_backoff_seconds": 0,
+        "search_cache": {"enabled": False},
+    }
+    service = FlightService(base_url="http://flights.test", config=config)
+    service._client = httpx.Client(base_url=service.base_url, transport=httpx.MockTransport(handler))
+    service._async_client = httpx.AsyncClient(base_url=service.base_url, transport=httpx.MockTransport(handler))
+    return service
+
+
+class TestFlightServiceRetries:
+
+    def test_inventory_error_is_retried(self) -> None:
+        responses = iter([
+            {"booking_status": False, "error_code": "ERR_INVENTORY", "error_message": "retry"},
+            {"booking_status": True, "confirmation_number": "BK-1"},
+        ])
+        service = _service(lambda request: httpx.Response(200, json=next(responses)))
+        assert service.book_flight({"id": "f-1"})["confirmation_number"] == "BK-1"
+
+    def test_permanent_booking_error_is_returned(self) -> None:
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"booking_status": False, "error_code": "ERR_PAYMENT_DECLINED"})
+
+        assert _service(handler).book_flight({"id": "f-1"})["error_code"] == "ERR_PAYMENT_DECLINED"
+        assert len(calls) == 1
+
+    def test_server_errors_exhaust_retries(self) -> None:
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            _service(handler, max_retries=2).search_flight(PAYLOAD)
+        assert len(calls) == 3
+
+    def test_booking_is_not_repeated_after_a_read_error(self) -> None:
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            raise httpx.ReadError("connection reset", request=request)
+
+        with pytest.raises(httpx.ReadError):
+            _service(handler).book_flight({"id": "f-1"})
+        assert len(calls) == 1
+
+    def test_async_search_retries_connect_errors(self) -> None:
+        attempts = []
+
+        def handler(request):
+            attempts.append(request)
+            if len(attempts) == 1:
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(200, json={"results": [FLIGHT]})
+
+        results = asyncio.run(_service(handler).asearch_flight(PAYLOAD))
+        assert [r.flight_number for r in results] == ["LH400"]
+        assert attempts[-1].url.params["passengers"] == "2"
+
+    def test_booking_with_idempotency_key_is_repeated_after_a_read_error(self) -> None:
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.ReadError("connection reset", request=request)
+            return httpx.Response(200, json={"booking_status": True, "confirmation_number": "BK-1"})
+
+        assert _service(handler).book_flight({"id": "f-1"}, idempotency_key="key-1")["confirmation_number"] == "BK-1"
+        assert [request.headers["Idempotency-Key"] for request in calls] == ["key-1", "key-1"]
@@ -0,0 +1,22 @@
+import os
+
+from benchmarks.bench_import_time import DEFERRED_FROM_MAIN, IMPORT_BUDGETS_MS, measure_import
+
+
+def _env_without_langfuse() -> dict:
+    return {key: value for key, value in os.environ.items() if not key.startswith("LANGFUSE_")}
+
+
+class TestImportTime:
+
+    def test_main_defers_agent_dependencies(self) -> None:
+        loaded = measure_import("backend.main", _env_without_langfuse())["modules"]
+        assert [name for name in DEFERRED_FROM_MAIN if name in loaded] == []
+
+    def test_langfuse_is_only_loaded_when_configured(self) -> None:
+        loaded = measure_import("backend.llm.client", _env_without_langfuse())["modules"]
+        assert "langfuse" not in loaded
+
+    def test_main_import_within_budget(self) -> None:
+        seconds = measure_import("backend.main", _env_without_langfuse())["seconds"]
+        assert seconds * 1000 <= IMPORT_BUDGETS_MS["backend.main"]
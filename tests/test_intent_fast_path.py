@@ -0,0 +1,58 @@
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+from backend.classifier.evaluate import evaluate
+from backend.classifier.model import IntentFastPath, LinearIntentModel
+from backend.classifier.train import DEFAULT_CORPUS_PATH, load_corpus
+from backend.nodes.user_intent_classifier import UserIntentClassifier
+from backend.schema.models import IntentType, State
+
+
+def _fast_path(threshold: float = 0.9) -> IntentFastPath:
+    return IntentFastPath(LinearIntentModel.load(), threshold)
+
+
+class _NoLLM(FakeListChatModel):
+    def with_structured_output(self, schema, **kwargs):
+        return self
+
+    def _call(self, *args, **kwargs):
+        raise AssertionError("LLM must not be called for high-confidence inputs")
+
+
+class TestIntentFastPath:
+
+    def test_obvious_flight_and_trip_requests(self) -> None:
+        fast_path = _fast_path()
+        flight = fast_path.classify("Book a flight from JFK to LHR for 2 on March 3")
+        trip = fast_path.classify("plan a 5-day trip to Tokyo")
+        assert flight.intent == IntentType.FLIGHT_BOOKING and flight.confidence >= 0.9
+        assert trip.intent == IntentType.TRAVEL_PLANNING and trip.confidence >= 0.9
+
+    def test_ambiguous_input_falls_back_to_llm(self) -> None:
+        fast_path = _fast_path()
+        assert fast_path.classify("hello") is None
+        assert fast_path.classify("I want to go somewhere warm") is None
+
+    def test_held_out_accuracy(self) -> None:
+        texts, labels = load_corpus(DEFAULT_CORPUS_PATH, split="test")
+        report = evaluate(_fast_path(), texts, labels)
+        assert report["coverage"] >= 0.7
+        assert report["accuracy"] >= 0.95
+
+
+class TestUserIntentClassifierFastPath:
+
+    def test_first_turn_skips_llm(self) -> None:
+        node = UserIntentClassifier(_NoLLM(responses=[]), fast_path=_fast_path())
+        result = node(State(messages=[HumanMessage(content="Flight from Mumbai to Delhi, 2 passengers, next Monday.")]))
+        assert result["intent"] == IntentType.FLIGHT_BOOKING
+
+    def test_returning_session_is_not_classified_locally(self) -> None:
+        node = UserIntentClassifier(_NoLLM(responses=[]), fast_path=_fast_path())
+        state = State(messages=[
+            HumanMessage(content="hello"),
+            AIMessage(content="Could you clarify your request?"),
+            HumanMessage(content="Book a flight from JFK to LHR for 2 on March 3"),
+        ])
+        assert node._classify_locally(state) is None
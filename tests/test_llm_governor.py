@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+import pytest
+
+from backend.instrumentation.metrics import registry
+from backend.llm.client import GovernedChatOpenAI
+from backend.llm.governor import LLMGovernor, _Waiter
+from backend.llm.stub_server import RateLimitedStub
+
+
+@pytest.fixture
+def stub():
+    stub = RateLimitedStub(requests_per_second=20, max_concurrency=6, burst_seconds=0.5, latency_seconds=0.05)
+    server, url = stub.serve_in_thread()
+    stub.url = url
+    yield stub
+    server.should_exit = True
+
+
+def _client(url: str, governor: LLMGovernor) -> GovernedChatOpenAI:
+    return GovernedChatOpenAI(base_url=url, api_key="test", model="stub", max_retries=0, governor=governor)
+
+
+async def _calls(client: GovernedChatOpenAI, count: int) -> float:
+    started = time.perf_counter()
+    replies = await asyncio.gather(*(client.ainvoke(f"question {i}") for i in range(count)))
+    assert all(reply.content == "ok" for reply in replies)
+    return time.perf_counter() - started
+
+
+class TestLLMGovernor:
+
+    def test_stays_under_provider_limits_without_429s(self, stub) -> None:
+        governor = LLMGovernor(requests_per_minute=18 * 60, tokens_per_minute=10**7, max_concurrency=6, burst_seconds=0.5)
+        seconds = asyncio.run(_calls(_client(stub.url, governor), 60))
+        assert stub.rejected == 0
+        assert stub.max_in_flight <= 6
+        # 9 calls of burst, the rest at 18/s: close to the provider's 20/s
+        assert 60 / seconds > 14
+
+    def test_backs_off_on_429_and_completes_every_call(self, stub) -> None:
+        before = registry.value("agent_llm_rate_limited_total")
+        governor = LLMGovernor(
+            requests_per_minute=60 * 60, tokens_per_minute=10**7, max_concurrency=6, burst_seconds=0.5, max_retries=8,
+            backoff_initial_seconds=0.05,
+        )
+        asyncio.run(_calls(_client(stub.url, governor), 60))
+        assert stub.served == 60
+        assert 0 < stub.rejected < 30
+        assert registry.value("agent_llm_rate_limited_total") - before == stub.rejected
+        assert governor._rate_factor < 1.0
+
+    def test_higher_lane_is_served_first(self) -> None:
+        governor = LLMGovernor(requests_per_minute=6000, tokens_per_minute=10**7, max_concurrency=1)
+        order = []
+
+        async def call(priority: int, name: str) -> None:
+            waiter = await governor.acquire(priority, 10)
+            order.append(name)
+            governor.release(waiter, succeeded=True)
+
+        async def scenario():
+            holder = await governor.acquire(1, 10)
+            waiting = [asyncio.create_task(call(2, "classification")), asyncio.create_task(call(0, "confirmation"))]
+            await asyncio.sleep(0.01)
+            governor.release(holder, succeeded=True)
+            await asyncio.gather(*waiting)
+
+        asyncio.run(scenario())
+        assert order == ["confirmation", "classification"]
+
+    def test_token_budget_holds_back_the_next_call(self) -> None:
+        now = [0.0]
+        governor = LLMGovernor(
+            requests_per_minute=6000, tokens_per_minute=600, max_concurrency=10, burst_seconds=10, clock=lambda: now[0]
+        )
+        first = governor.acquire_sync(1, 60)
+        governor.release(first, used_tokens=100, succeeded=True)
+        # 10 tokens/s and the 100-token burst is spent, with the estimate corrected from 60 to 100 used
+        waiter = _Waiter(1, 50, lambda: None, now[0])
+        assert governor._enqueue(waiter) == pytest.approx(5.0)
+        now[0] = 5.0
+        assert governor._retry(waiter) is None
+        assert waiter.granted
@@ -0,0 +1,69 @@
+import uuid
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from backend.app_workflow import IntentClassifierAgent
+from backend.checkpoint_manager import InMemoryCheckpointerManager
+from backend.llm.scripted import ScriptedChatModel
+from backend.schema.models import FlightBookingPreferences, State
+from backend.util.config_reader import get_checkpoint_config
+from backend.util.message_delta_checkpointer import DELTA_MARKER, MessageDeltaCheckpointSaver, compact_model_channels
+
+TURNS = ["Book a flight from JFK to LHR", "It's for 2 travellers", "Make it JFK to CDG instead"] * 3
+
+
+def _run(inner: InMemorySaver, message_deltas: bool, snapshot_every: int = 3) -> dict:
+    config = {**get_checkpoint_config(), "message_deltas": message_deltas, "snapshot_every": snapshot_every}
+    agent = IntentClassifierAgent(
+        llm_client=ScriptedChatModel(),
+        checkpointer_manager=InMemoryCheckpointerManager("exit", saver_factory=lambda: inner, config=config),
+    )
+    agent.build_workflow()
+    session = {"configurable": {"thread_id": str(uuid.uuid4())}}
+    for query in TURNS:
+        agent.invoke(query, session["configurable"]["thread_id"])
+    values = agent.workflow.get_state(session).values
+    agent.close()
+    return {"session": session, "values": values}
+
+
+def _stored_messages(inner: InMemorySaver, session: dict):
+    return inner.get_tuple(session).checkpoint["channel_values"]["messages"]
+
+
+class TestMessageDeltaCheckpointSaver:
+
+    def test_state_matches_full_history_storage(self) -> None:
+        full = _run(InMemorySaver(), message_deltas=False)["values"]
+        delta = _run(InMemorySaver(), message_deltas=True)["values"]
+        assert [m.content for m in delta["messages"]] == [m.content for m in full["messages"]]
+        assert delta["flight_booking_preferences"] == full["flight_booking_preferences"]
+
+    def test_stores_appended_messages_and_compact_preferences(self) -> None:
+        inner = InMemorySaver()
+        run = _run(inner, message_deltas=True, snapshot_every=100)
+        stored = _stored_messages(inner, run["session"])
+        assert stored[DELTA_MARKER] == 1
+        assert len(stored["appended"]) == len(run["values"]["messages"]) // len(TURNS)
+        preferences = inner.get_tuple(run["session"]).checkpoint["channel_values"]["flight_booking_preferences"]
+        assert isinstance(preferences, dict)
+        assert "sort_by" not in preferences
+
+    def test_cold_reader_resolves_delta_chain(self) -> None:
+        inner = InMemorySaver()
+        run = _run(inner, message_deltas=True, snapshot_every=3)
+        reader = MessageDeltaCheckpointSaver(inner, compact_model_channels(State), snapshot_every=3)
+        values = reader.get_tuple(run["session"]).checkpoint["channel_values"]
+        assert [m.id for m in values["messages"]] == [m.id for m in run["values"]["messages"]]
+        assert isinstance(values["flight_booking_preferences"], FlightBookingPreferences)
+
+    def test_snapshots_bound_the_chain(self) -> None:
+        inner = InMemorySaver()
+        run = _run(inner, message_deltas=True, snapshot_every=2)
+        hops, checkpoint_tuple = 0, inner.get_tuple(run["session"])
+        while isinstance(stored := checkpoint_tuple.checkpoint["channel_values"]["messages"], dict):
+            hops += 1
+            checkpoint_tuple = inner.get_tuple(
+                {"configurable": {**run["session"]["configurable"], "checkpoint_ns": "", "checkpoint_id": stored["base"]}}
+            )
+        assert hops <= 2
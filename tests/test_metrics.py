@@ -0,0 +1,26 @@
+import math
+
+from backend.instrumentation.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry:
+
+    def test_summary_quantiles_cover_recent_window(self) -> None:
+        registry = MetricsRegistry(window=100)
+        for value in range(1, 201):
+            registry.observe("agent_node_duration_seconds", value / 1000, node="search_flight")
+        quantiles = registry.quantiles("agent_node_duration_seconds", node="search_flight")
+        assert quantiles[0.5] == 0.151
+        assert quantiles[0.99] == 0.2
+        assert math.isnan(registry.quantiles("agent_node_duration_seconds", node="other")[0.5])
+
+    def test_render_prometheus_text(self) -> None:
+        registry = MetricsRegistry()
+        registry.describe("agent_llm_tokens_total", "counter", "LLM tokens")
+        registry.inc("agent_llm_tokens_total", 12, node="user_intent_classifier", type="input")
+        registry.observe("agent_turn_duration_seconds", 0.5)
+        text = registry.render()
+        assert "# TYPE agent_llm_tokens_total counter" in text
+        assert 'agent_llm_tokens_total{node="user_intent_classifier",type="input"} 12.0' in text
+        assert 'agent_turn_duration_seconds{quantile="0.95"} 0.5' in text
+        assert "agent_turn_duration_seconds_count 1" in text
@@ -0,0 +1,68 @@
+import time
+
+import pytest
+
+from backend.util.prompt_registry import PromptRegistry, get_prompt_registry
+
+
+def _write(path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestPromptRegistry:
+
+    def test_repository_prompts_load(self) -> None:
+        registry = get_prompt_registry()
+        for name in (
+            "understand_intent_system",
+            "classify_and_extract",
+            "flight_booking/extract_preferences",
+            "flight_booking/extract_confirmation",
+            "travel_planning/extract_preferences",
+        ):
+            prompt = registry.get(name)
+            assert prompt.system_message.content == prompt.text
+            assert len(prompt.version) == 12
+
+    def test_versions_follow_content(self, tmp_path) -> None:
+        _write(tmp_path / "a.txt", "first\n")
+        _write(tmp_path / "nested" / "b.txt", "second")
+        registry = PromptRegistry(tmp_path)
+        before = registry.versions()
+        assert set(before) == {"a", "nested/b"}
+
+        _write(tmp_path / "a.txt", "first, edited")
+        registry.reload()
+        assert registry.versions()["a"] != before["a"]
+        assert registry.versions()["nested/b"] == before["nested/b"]
+        with pytest.raises(FileNotFoundError):
+            registry.get("missing")
+
+    def test_invalid_prompt_is_rejected(self, tmp_path) -> None:
+        _write(tmp_path / "a.txt", "   \n")
+        with pytest.raises(ValueError):
+            PromptRegistry(tmp_path)
+
+    def test_hot_reload_swaps_valid_changes_only(self, tmp_path) -> None:
+        _write(tmp_path / "a.txt", "v1")
+        registry = PromptRegistry(tmp_path)
+        registry.start_watching(0.01)
+        try:
+            _write(tmp_path / "a.txt", "version two")
+            assert _wait_for(lambda: registry.get("a").text == "version two")
+
+            _write(tmp_path / "a.txt", "")
+            time.sleep(0.1)
+            assert registry.get("a").text == "version two"
+        finally:
+            registry.stop_watching()
@@ -0,0 +1,93 @@
+import asyncio
+
+import numpy as np
+
+from backend.app_workflow import IntentClassifierAgent
+from backend.checkpoint_manager import SqliteCheckpointerManager
+from backend.llm.scripted import ScriptedChatModel
+from backend.schema.models import FlightBookingPreferences, FlightSearchResults, State
+from backend.service.FlightService import aclose_flight_service, set_flight_service
+from backend.service.ranking import rank_fares, rank_flights, ranking_weights
+from backend.trajectory_eval import in_process_flight_service
+
+
+def _flight(flight_id: str, price: float, duration: int, stops: int) -> dict:
+    return {"id": flight_id, "price_usd": price, "duration_hours": duration, "stops": stops}
+
+
+FLIGHTS = [
+    _flight("slow-cheap", 200.0, 14, 2),
+    _flight("fast-pricey", 1200.0, 3, 0),
+    _flight("balanced", 450.0, 6, 0),
+]
+
+
+class TestRanking:
+
+    def test_sort_preference_changes_the_winner(self) -> None:
+        def best(sort_by):
+            return rank_flights(FLIGHTS, FlightBookingPreferences(sort_by=sort_by))[0]["id"]
+
+        assert best("price") == "slow-cheap"
+        assert best("duration") == "fast-pricey"
+        assert best(None) == "balanced"
+
+    def test_top_k_matches_full_sort(self) -> None:
+        rng = np.random.default_rng(7)
+        prices, durations, stops = rng.uniform(100, 2000, 5000), rng.integers(1, 20, 5000), rng.integers(0, 3, 5000)
+        weights = ranking_weights(None)
+        full = rank_fares(prices, durations, stops, weights)
+        assert list(rank_fares(prices, durations, stops, weights, k=25)) == list(full[:25])
+        assert sorted(full) == list(range(5000))
+
+    def test_ties_keep_input_order_and_empty_input(self) -> None:
+        same = [_flight(str(i), 300.0, 5, 1) for i in range(4)]
+        assert [f["id"] for f in rank_flights(same, None, k=3)] == ["0", "1", "2"]
+        assert rank_flights([], None) == []
+
+    def test_ties_at_the_cut_keep_input_order(self) -> None:
+        rng = np.random.default_rng(3)
+        # Few distinct values, so the k-th score is shared by many fares
+        prices, durations, stops = rng.integers(1, 4, 2000) * 100.0, rng.integers(2, 4, 2000), rng.integers(0, 2, 2000)
+        weights = ranking_weights(None)
+        full = rank_fares(prices, durations, stops, weights)
+        for k in (1, 7, 150, 1999):
+            assert list(rank_fares(prices, durations, stops, weights, k=k)) == list(full[:k])
+
+
+class TestSearchResultsInState:
+
+    def test_results_are_kept_as_columns(self) -> None:
+        flights = [{**f, "origin": "JFK", "destination": "LHR", "airline": "Delta Airlines", "flight_number": f"DL{i}",
+                    "departure_time": "2026-03-03T08:00:00", "arrival_time": "2026-03-03T15:00:00", "cabin_class": "Economy"}
+                   for i, f in enumerate(FLIGHTS)]
+        results = FlightSearchResults.from_flights(flights)
+        assert len(results) == 3 and results.price_usd == [200.0, 1200.0, 450.0]
+        assert [results.flight(i) for i in range(3)] == flights
+        # Checkpoints from before the compact form still load
+        assert State(flight_search_results=flights).flight_search_results == results
+
+    def test_paging_survives_a_checkpoint_round_trip(self, tmp_path) -> None:
+        path = str(tmp_path / "checkpoints.sqlite")
+        session = {"configurable": {"thread_id": "paging"}}
+
+        async def turns():
+            set_flight_service(in_process_flight_service())
+            agent = IntentClassifierAgent(ScriptedChatModel(), SqliteCheckpointerManager(path, "exit"))
+            await agent.abuild_workflow()
+            try:
+                await agent.ainvoke("Book a flight from JFK to LHR on Mar 3 for 2", "paging")
+                first = (await agent.async_workflow.aget_state(session)).values
+                await agent.ainvoke("Can you show me other options?", "paging")
+                second = (await agent.async_workflow.aget_state(session)).values
+            finally:
+                await agent.aclose()
+                await aclose_flight_service()
+            return first, second
+
+        first, second = asyncio.run(turns())
+        results = first["flight_search_results"]
+        assert isinstance(results, FlightSearchResults) and len(results) > 1
+        assert first["last_flight_search_result"] == results.flight(0)
+        assert second["flight_search_offset"] == 1
+        assert second["last_flight_search_result"] == second["flight_search_results"].flight(1)
@@ -0,0 +1,81 @@
+import time
+from pathlib import Path
+
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration
+from langchain_core.messages import AIMessage
+
+from backend.llm.response_cache import InMemoryTier, ResponseCache, SqliteTier
+from backend.util.config_reader import get_llm_cache_config
+
+
+def _generation(text: str) -> list[ChatGeneration]:
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+
+class TestResponseCacheTiers:
+
+    def test_memory_tier_evicts_least_recently_used(self) -> None:
+        tier = InMemoryTier(max_entries=2, ttl_seconds=60)
+        tier.put("a", _generation("a"))
+        tier.put("b", _generation("b"))
+        assert tier.get("a") is not None
+        tier.put("c", _generation("c"))
+        assert tier.get("b") is None
+        assert tier.get("a") is not None and tier.get("c") is not None
+
+    def test_memory_tier_expires_entries(self) -> None:
+        tier = InMemoryTier(max_entries=10, ttl_seconds=0.01)
+        tier.put("a", _generation("a"))
+        time.sleep(0.02)
+        assert tier.get("a") is None
+
+    def test_sqlite_tier_persists_across_instances(self, tmp_path: Path) -> None:
+        path = tmp_path / "cache.sqlite"
+        SqliteTier(path, max_entries=10, ttl_seconds=60).put("k", _generation("stored"))
+        value = SqliteTier(path, max_entries=10, ttl_seconds=60).get("k")
+        assert value[0].message.content == "stored"
+
+    def test_sqlite_tier_enforces_max_entries(self, tmp_path: Path) -> None:
+        tier = SqliteTier(tmp_path / "cache.sqlite", max_entries=3, ttl_seconds=60)
+        for i in range(5):
+            tier.put(str(i), _generation(str(i)))
+        assert tier.get("0") is None and tier.get("1") is None
+        assert tier.get("4") is not None
+
+
+class TestResponseCacheWithModel:
+
+    def test_repeated_prompt_is_served_from_cache(self, tmp_path: Path) -> None:
+        cache = ResponseCache([
+            InMemoryTier(max_entries=10, ttl_seconds=60),
+            SqliteTier(tmp_path / "cache.sqlite", max_entries=10, ttl_seconds=60),
+        ])
+        model = FakeListChatModel(responses=["first", "second"], cache=cache)
+        messages = [SystemMessage(content="system"), HumanMessage(content="Book a flight", id="one")]
+        assert model.invoke(messages).content == "first"
+        # Message ids differ between sessions but must not change the key
+        messages[1] = HumanMessage(content="Book a flight", id="two")
+        assert model.invoke(messages).content == "first"
+        assert model.invoke([HumanMessage(content="Plan a trip")]).content == "second"
+        assert cache.stats() == {"hits": {"memory": 1, "sqlite": 0}, "misses": 2}
+
+    def test_persistent_hit_is_promoted_to_memory(self, tmp_path: Path) -> None:
+        path = tmp_path / "cache.sqlite"
+        warm = ResponseCache([SqliteTier(path, max_entries=10, ttl_seconds=60)])
+        warm.update("prompt", "llm", _generation("cached"))
+        memory = InMemoryTier(max_entries=10, ttl_seconds=60)
+        cache = ResponseCache([memory, SqliteTier(path, max_entries=10, ttl_seconds=60)])
+        assert cache.lookup("prompt", "llm")[0].message.content == "cached"
+        assert len(memory) == 1
+        assert cache.stats()["hits"] == {"memory": 0, "sqlite": 1}
+
+
+class TestResponseCacheConfig:
+
+    def test_off_by_default_and_enabled_by_env(self, monkeypatch) -> None:
+        monkeypatch.delenv("LLM_CACHE_ENABLED", raising=False)
+        assert get_llm_cache_config()["enabled"] is False
+        monkeypatch.setenv("LLM_CACHE_ENABLED", "true")
+        assert get_llm_cache_config()["enabled"] is True
@@ -0,0 +1,59 @@
+import json
+import time
+from pathlib import Path
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from backend.llm.client import create_llm_client
+from backend.llm.scripted import ScriptedChatModel, load_fixtures
+from backend.schema.models import FlightBookingPreferences, IntentOutput, ItineraryPreferences, UserConfirmationOutput
+
+
+def _write_config(tmp_path: Path, provider: str, fixtures: list[dict] | None = None, latency: float = 0.0) -> Path:
+    scripted = {"latency_seconds": latency}
+    if fixtures is not None:
+        (tmp_path / "fixtures.jsonl").write_text("".join(json.dumps(f) + "\n" for f in fixtures))
+        scripted["fixtures_path"] = "fixtures.jsonl"
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"llm": {"model_name": "gpt-4o-mini", "provider": provider, "scripted": scripted}}))
+    return path
+
+
+class TestScriptedChatModel:
+
+    def test_rules_return_schema_valid_outputs(self) -> None:
+        model = ScriptedChatModel()
+        query = [HumanMessage(content="Book a flight from JFK to LHR on Mar 3 for 2")]
+        intent = model.with_structured_output(IntentOutput).invoke(query)
+        preferences = model.with_structured_output(FlightBookingPreferences).invoke(query)
+        itinerary = model.with_structured_output(ItineraryPreferences).invoke([HumanMessage(content="Plan a 5-day trip in April")])
+        confirmation = model.with_structured_output(UserConfirmationOutput).invoke([HumanMessage(content="yes book it")])
+        assert intent.intent.value == "flight_booking"
+        assert (preferences.origin, preferences.destination, preferences.number_of_travelers) == ("JFK", "LHR", "2")
+        assert itinerary.duration_days == 5
+        assert confirmation.action == "confirm"
+
+    def test_config_selects_scripted_provider_with_fixtures(self, tmp_path: Path) -> None:
+        fixtures = [{"schema": "UserConfirmationOutput", "user_query": "Sounds good", "output": {"action": "confirm"}}]
+        model = create_llm_client(_write_config(tmp_path, "scripted", fixtures, latency=0.05))
+        assert isinstance(model, ScriptedChatModel)
+        started = time.perf_counter()
+        # The rules alone would read "sounds good" as a cancel
+        result = model.with_structured_output(UserConfirmationOutput).invoke([HumanMessage(content="sounds good ")])
+        assert time.perf_counter() - started >= 0.05
+        assert result.action == "confirm"
+
+    def test_invalid_fixture_is_rejected(self, tmp_path: Path) -> None:
+        path = tmp_path / "fixtures.jsonl"
+        path.write_text(json.dumps({"schema": "UserConfirmationOutput", "user_query": "ok", "output": {"action": "maybe"}}) + "\n")
+        with pytest.raises(ValueError):
+            load_fixtures(path)
+
+    def test_unknown_provider_is_rejected(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError):
+            create_llm_client(_write_config(tmp_path, "local"))
+
+    def test_shipped_fixtures_load(self) -> None:
+        fixtures = load_fixtures(Path(__file__).resolve().parent.parent / "backend" / "llm" / "scripted_fixtures.jsonl")
+        assert {"IntentOutput", "FlightBookingPreferences", "ItineraryPreferences", "UserConfirmationOutput"} <= set(fixtures)
@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.instrumentation.timings import track_tool_call, track_turn
+from backend.service.models import FlightSearchRequest
+from backend.service.search_cache import FlightSearchCache
+
+REQUEST = FlightSearchRequest(origin="JFK", destination="LHR", number_of_travelers=2)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestFlightSearchCache:
+
+    def test_hit_then_stale_then_expired(self) -> None:
+        clock = _Clock()
+        cache = FlightSearchCache(ttl_seconds=10, stale_seconds=20, max_entries=8, clock=clock)
+        calls = []
+
+        def fetch():
+            calls.append(clock.now)
+            return [len(calls)]
+
+        assert cache.get_or_fetch(REQUEST, fetch) == [1]
+        assert cache.get_or_fetch(FlightSearchRequest(origin="jfk", destination="lhr", number_of_travelers=2), fetch) == [1]
+
+        clock.now = 15
+        assert cache.get_or_fetch(REQUEST, fetch) == [1]  # stale value served, refresh in background
+        deadline = time.time() + 2
+        while (len(calls) < 2 or cache._inflight) and time.time() < deadline:
+            time.sleep(0.01)
+        assert cache.get_or_fetch(REQUEST, fetch) == [2]
+
+        clock.now = 100
+        assert cache.get_or_fetch(REQUEST, fetch) == [3]
+        assert cache.stats()["stale"] == 1 and cache.stats()["miss"] == 2
+
+    def test_concurrent_sync_misses_share_one_call(self) -> None:
+        cache = FlightSearchCache(ttl_seconds=60, stale_seconds=0, max_entries=8)
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            release.wait(2)
+            return ["result"]
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch(REQUEST, fetch))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1 and results == [["result"]] * 5
+        assert cache.stats()["coalesced"] == 4
+
+    def test_concurrent_async_misses_share_one_call_and_failures_are_not_cached(self) -> None:
+        cache = FlightSearchCache(ttl_seconds=60, stale_seconds=0, max_entries=8)
+        calls = []
+
+        async def failing():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        async def ok():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return ["result"]
+
+        async def scenario():
+            failed = await asyncio.gather(*(cache.aget_or_fetch(REQUEST, failing) for _ in range(3)), return_exceptions=True)
+            assert all(isinstance(r, RuntimeError) for r in failed)
+            return await asyncio.gather(*(cache.aget_or_fetch(REQUEST, ok) for _ in range(3)))
+
+        assert asyncio.run(scenario()) == [["result"]] * 3
+        assert len(calls) == 2
+
+    def test_refresh_finishing_after_the_turn_leaves_its_timings_alone(self) -> None:
+        clock = _Clock()
+        cache = FlightSearchCache(ttl_seconds=10, stale_seconds=20, max_entries=8, clock=clock)
+        refreshed = asyncio.Event()
+
+        async def fetch():
+            with track_tool_call("search_flight"):
+                await asyncio.sleep(0.02)
+            refreshed.set()
+            return ["result"]
+
+        async def scenario():
+            await cache.aget_or_fetch(REQUEST, fetch)
+            clock.now = 15
+            with track_turn() as timings:
+                # Stale: served at once, refreshed in the background
+                assert await cache.aget_or_fetch(REQUEST, fetch) == ["result"]
+            await refreshed.wait()
+            return timings
+
+        timings = asyncio.run(scenario())
+        assert (timings.tool_calls, timings.tool_http_ms) == (0, 0.0)
+        assert cache.stats()["stale"] == 1
+
+    def test_lru_bound(self) -> None:
+        cache = FlightSearchCache(ttl_seconds=60, stale_seconds=0, max_entries=1)
+        other = FlightSearchRequest(origin="CDG", destination="LHR", number_of_travelers=2)
+        cache.get_or_fetch(REQUEST, lambda: ["a"])
+        cache.get_or_fetch(other, lambda: ["b"])
+        with pytest.raises(LookupError):
+            cache.get_or_fetch(REQUEST, lambda: (_ for _ in ()).throw(LookupError()))
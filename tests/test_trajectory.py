@@ -1,14 +1,15 @@
+import json
 import uuid
 
 import pytest
 import requests
 
-from tests.conftest import CHAT_API_BASE_URL
+from tests.conftest import CHAT_API_BASE_URL, combined_graph_only, default_graph_only
 
 
-def _chat(chat_api_url: str, user_query: str, session_id: str | None = None) -> requests.Response:
+def _chat(chat_api_url: str, user_query: str, session_id: str | None = None, **options) -> requests.Response:
     url = f"{chat_api_url.rstrip('/')}/chat"
-    payload = {"user_query": user_query, "session_id": session_id or str(uuid.uuid4())}
+    payload = {"user_query": user_query, "session_id": session_id or str(uuid.uuid4()), **options}
     return requests.post(url, json=payload, timeout=60)
 
 
@@ -33,6 +34,15 @@ class TestTrajectoryStructure:
         assert isinstance(data["trajectory"], list)
         assert all(isinstance(n, str) for n in data["trajectory"])
 
+    def test_timings_only_when_requested(self, chat_api_url: str) -> None:
+        plain = _chat(chat_api_url, "Hello")
+        assert plain.status_code == 200, plain.text
+        assert "timings" not in plain.json()
+        timed = _chat(chat_api_url, "Hello", include_timings=True)
+        assert timed.status_code == 200, timed.text
+        nodes = [node["node"] for node in timed.json()["timings"]["nodes"]]
+        assert nodes[0] == "returning_user_middleware"
+
     def test_trajectory_starts_with_middleware(self, chat_api_url: str) -> None:
         trajectory = _get_trajectory(chat_api_url, "Hello")
         assert len(trajectory) >= 1
@@ -42,17 +52,21 @@ class TestTrajectoryStructure:
         known_nodes = {
             "returning_user_middleware",
             "user_intent_classifier",
+            "classify_and_extract",
             "extract_flight_preferences",
             "extract_itinerary_preferences",
             "graceful_exit",
             "route_to_plan",
             "search_flight",
+            "extract_flight_booking_confirmation",
+            "show_more_flights",
         }
         trajectory = _get_trajectory(chat_api_url, "Plan a 3-day trip to Tokyo in summer.")
         for node in trajectory:
             assert node in known_nodes, f"Unknown node in trajectory: {node}"
 
 
+@default_graph_only
 class TestTrajectoryForUserQueries:
     """Compare trajectory for specific user queries to expected paths (LangGraph-style)."""
 
@@ -126,3 +140,77 @@ class TestTrajectoryForUserQueries:
             assert node in trajectory, f"Expected node {node} in trajectory: {trajectory}"
             if i > 0:
                 assert trajectory.index(node) > trajectory.index(expected_sequence[i - 1])
+
+
+class TestMoreFlightOptions:
+
+    def test_more_options_pages_stored_results_without_searching(self, chat_api_url: str) -> None:
+        session_id = str(uuid.uuid4())
+        first = _get_trajectory(chat_api_url, "Book a flight from London to Berlin on March 10 for 3 travelers.", session_id)
+        assert first[-1] == "search_flight"
+        trajectory = _get_trajectory(chat_api_url, "Can you show me other options?", session_id)
+        assert trajectory == [
+            "returning_user_middleware",
+            "extract_flight_booking_confirmation",
+            "show_more_flights",
+        ]
+
+
+@combined_graph_only
+class TestCombinedGraphTrajectory:
+    """Same queries as TestTrajectoryForUserQueries, with intent and preferences from one LLM call."""
+
+    def test_new_user_flight_query_skips_separate_extraction(self, chat_api_url: str) -> None:
+        trajectory = _get_trajectory(
+            chat_api_url,
+            "Book a flight from London to Berlin on March 10 for 3 travelers.",
+            session_id=str(uuid.uuid4()),
+        )
+        assert trajectory == ["returning_user_middleware", "classify_and_extract", "search_flight"]
+
+    def test_new_user_travel_planning_query_skips_separate_extraction(self, chat_api_url: str) -> None:
+        trajectory = _get_trajectory(
+            chat_api_url,
+            "Plan a 3-day summer trip to Paris for 2 adults, budget-friendly.",
+            session_id=str(uuid.uuid4()),
+        )
+        assert trajectory == ["returning_user_middleware", "classify_and_extract", "route_to_plan"]
+
+    def test_follow_up_turn_uses_single_purpose_extraction(self, chat_api_url: str) -> None:
+        session_id = str(uuid.uuid4())
+        _get_trajectory(chat_api_url, "Book a flight from London to Berlin for 3 travelers.", session_id)
+        trajectory = _get_trajectory(chat_api_url, "On March 10.", session_id)
+        assert "classify_and_extract" not in trajectory
+
+
+def _stream_events(chat_api_url: str, user_query: str, session_id: str | None = None) -> list[tuple[str, dict]]:
+    url = f"{chat_api_url.rstrip('/')}/chat/stream"
+    payload = {"user_query": user_query, "session_id": session_id or str(uuid.uuid4())}
+    events: list[tuple[str, dict]] = []
+    event = None
+    with requests.post(url, json=payload, stream=True, timeout=60) as resp:
+        resp.raise_for_status()
+        for line in resp.iter_lines(decode_unicode=True):
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                events.append((event, json.loads(line[len("data: "):])))
+    return events
+
+
+class TestStreamingTrajectory:
+
+    def test_stream_ends_with_chat_response(self, chat_api_url: str) -> None:
+        events = _stream_events(chat_api_url, "Book a flight from London to Berlin on March 10 for 3 travelers.")
+        assert events, "No events received from /chat/stream"
+        name, data = events[-1]
+        assert name == "response"
+        assert set(data) == {"response", "thinking", "trajectory"}
+
+    def test_node_events_match_trajectory(self, chat_api_url: str) -> None:
+        events = _stream_events(chat_api_url, "Plan a 3-day summer trip to Paris for 2 adults, budget-friendly.")
+        trajectory = events[-1][1]["trajectory"]
+        started = [data["node"] for name, data in events if name == "node_start"]
+        ended = [data["node"] for name, data in events if name == "node_end"]
+        assert events[0] == ("node_start", {"node": "returning_user_middleware"})
+        assert started == ended == trajectory
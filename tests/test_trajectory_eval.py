@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+import pytest
+
+from backend.app_workflow import IntentClassifierAgent
+from backend.checkpoint_manager import InMemoryCheckpointerManager
+from backend.service.FlightService import aclose_flight_service, set_flight_service
+from backend.trajectory_eval import (
+    DEFAULT_CASES_PATH,
+    TrajectoryEvaluator,
+    check_trajectory,
+    in_process_flight_service,
+    load_cases,
+    write_results,
+)
+from backend.llm.scripted import ScriptedChatModel
+
+FLIGHT = ["returning_user_middleware", "user_intent_classifier", "extract_flight_preferences", "search_flight"]
+
+
+def _evaluate(cases: list[dict], concurrency: int = 4) -> list:
+    async def scenario():
+        set_flight_service(in_process_flight_service())
+        agent = IntentClassifierAgent(ScriptedChatModel(), InMemoryCheckpointerManager())
+        await agent.abuild_workflow()
+        try:
+            return await TrajectoryEvaluator(agent, concurrency).run(cases)
+        finally:
+            await agent.aclose()
+            await aclose_flight_service()
+
+    return asyncio.run(scenario())
+
+
+class TestCheckTrajectory:
+
+    def test_expectations(self) -> None:
+        assert check_trajectory(FLIGHT, {"equals": FLIGHT, "starts_with": FLIGHT[:1], "in_order": [FLIGHT[0], FLIGHT[3]]}) == []
+        assert check_trajectory(FLIGHT, {"in_order": [FLIGHT[3], FLIGHT[0]]})
+        assert check_trajectory(FLIGHT, {"excludes": ["search_flight"]})
+        assert check_trajectory(FLIGHT, {"starts_with": ["user_intent_classifier"]})
+
+    def test_unknown_expectation_is_rejected(self, tmp_path) -> None:
+        path = tmp_path / "cases.jsonl"
+        path.write_text(json.dumps({"id": "x", "turns": [{"user_query": "hi", "expect": {"contains": []}}]}) + "\n")
+        with pytest.raises(ValueError):
+            load_cases(path)
+
+
+class TestTrajectoryEvaluator:
+
+    def test_shipped_cases_pass_in_process(self, tmp_path) -> None:
+        results = _evaluate(load_cases(DEFAULT_CASES_PATH))
+        assert [r for r in results if r.status in ("failed", "error")] == []
+        ran = [r for r in results if r.status == "passed"]
+        assert ran and all(r.input_tokens > 0 and r.latency_ms > 0 for r in ran)
+        path = tmp_path / "results.jsonl"
+        write_results(results, path)
+        assert [json.loads(line)["case_id"] for line in path.read_text().splitlines()] == [r.case_id for r in results]
+
+    def test_mismatched_trajectory_fails_the_case(self) -> None:
+        case = {"id": "wrong", "turns": [{"user_query": "Book a flight from JFK to LHR on Mar 3 for 2", "expect": {"excludes": ["search_flight"]}}]}
+        (result,) = _evaluate([case])
+        assert result.status == "failed"
+        assert result.trajectories[0][-1] == "search_flight"
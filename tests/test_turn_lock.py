@@ -0,0 +1,85 @@
+import asyncio
+import threading
+
+import pytest
+
+from backend.app_workflow import IntentClassifierAgent
+from backend.checkpoint_manager import InMemoryCheckpointerManager
+from backend.llm.scripted import ScriptedChatModel
+from backend.util.config_reader import get_checkpoint_config
+from backend.util.turn_lock import InProcessTurnLock, TurnInProgress
+
+QUERIES = [
+    "Book a flight from JFK to LHR on Mar 3 for 2",
+    "Can you show me other options?",
+    "Make it JFK to CDG instead",
+    "Show me another one",
+    "Plan a 5-day trip to Tokyo in April",
+    "It's for 3 travellers",
+]
+
+
+def _agent(policy: str = "wait") -> IntentClassifierAgent:
+    config = {**get_checkpoint_config(), "turn_lock": {"policy": policy, "wait_timeout_seconds": 30, "postgres_pool_size": 1}}
+    return IntentClassifierAgent(ScriptedChatModel(latency_seconds=0.01), InMemoryCheckpointerManager("exit", config=config))
+
+
+class TestTurnLock:
+
+    def test_concurrent_turns_on_one_session_stay_linear(self) -> None:
+        agent = _agent()
+
+        async def scenario():
+            await agent.abuild_workflow()
+            try:
+                await asyncio.gather(*(agent.ainvoke(query, "shared") for query in QUERIES))
+                config = {"configurable": {"thread_id": "shared"}}
+                state = await agent.async_workflow.aget_state(config)
+                history = [snapshot async for snapshot in agent.async_workflow.aget_state_history(config)]
+                return state, history
+            finally:
+                await agent.aclose()
+
+        state, history = asyncio.run(scenario())
+        user_messages = [m.content for m in state.values["messages"] if m.type == "human"]
+        assert sorted(user_messages) == sorted(QUERIES)
+        # One chain of checkpoints: every turn continued from the one before it
+        parents = [snapshot.parent_config["configurable"]["checkpoint_id"] for snapshot in history if snapshot.parent_config]
+        assert len(parents) == len(set(parents)) == len(history) - 1
+
+    def test_reject_policy_refuses_a_second_turn_only_on_the_same_session(self) -> None:
+        lock = InProcessTurnLock("reject")
+
+        async def scenario():
+            async with lock.ahold("a"):
+                with pytest.raises(TurnInProgress):
+                    async with lock.ahold("a"):
+                        pass
+                async with lock.ahold("b"):
+                    pass
+            async with lock.ahold("a"):
+                pass
+
+        asyncio.run(scenario())
+        assert lock._async_locks == {}
+
+    def test_wait_policy_times_out(self) -> None:
+        lock = InProcessTurnLock("wait", wait_timeout_seconds=0.05)
+        holding, release = threading.Event(), threading.Event()
+
+        def hold():
+            with lock.hold("a"):
+                holding.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        holding.wait()
+        with pytest.raises(TurnInProgress):
+            with lock.hold("a"):
+                pass
+        release.set()
+        thread.join()
+        with lock.hold("a"):
+            pass
+        assert lock._locks == {}